@@ -2,6 +2,8 @@
 from __future__ import absolute_import
 from abc import ABCMeta, abstractmethod
 from datetime import timedelta
+import hashlib
+import json
 import logging
 import re
 from six import add_metaclass
@@ -26,6 +28,10 @@ from xmodule.library_tools import normalize_key_for_search
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# The number of results fetched at once when listing the indexed items of a structure,
+# since the search engine only returns the first 10 results of a search by default
+SEARCH_PAGE_SIZE = 500
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -105,15 +111,47 @@ class SearchIndexerBase(object):
         remove any item that is present in the search index that is not present in updated list of indexed items
         as we find items we can shorten the set of items to keep
         """
-        response = searcher.search(
-            doc_type=cls.DOCUMENT_TYPE,
+        results = cls._search_all(
+            searcher,
             field_dictionary=cls._get_location_info(structure_key),
             exclude_dictionary={"id": list(exclude_items)}
         )
-        result_ids = [result["data"]["id"] for result in response["results"]]
+        result_ids = [result["data"]["id"] for result in results]
         for result_id in result_ids:
             searcher.remove(cls.DOCUMENT_TYPE, result_id)
 
+    @classmethod
+    def _fetch_content_hashes(cls, searcher, structure_key):
+        """
+        Returns a dict mapping the ids of the items of the structure present in the search index
+        to the hash of their indexed content
+        """
+        results = cls._search_all(searcher, field_dictionary=cls._get_location_info(structure_key))
+        return {
+            result["data"]["id"]: result["data"].get("content_hash")
+            for result in results
+        }
+
+    @classmethod
+    def _search_all(cls, searcher, **kwargs):
+        """
+        Returns all the results of the search of the documents of this indexer, fetching
+        them a page at a time
+        """
+        results = []
+        while True:
+            response = searcher.search(
+                doc_type=cls.DOCUMENT_TYPE, size=SEARCH_PAGE_SIZE, from_=len(results), **kwargs
+            )
+            results.extend(response["results"])
+            if not response["results"] or len(results) >= response["total"]:
+                return results
+
+    @staticmethod
+    def _content_hash(item_index):
+        """ Hash of the content to index for an item, used to skip indexing unchanged items """
+        return hashlib.md5(json.dumps(item_index, sort_keys=True, default=unicode)).hexdigest()
+
     @classmethod
     def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
         """
@@ -131,8 +169,14 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        Items are only sent to the search index when their content changed since
+        they were last indexed, as found by comparing the hash of their content
+        with the one stored in the index along with them. The items to index are
+        collected while walking the structure, and sent to the index afterwards.
+
         Returns:
-        Number of items that have been added to the index
+        Number of items that have been added to the index, including those which
+        were already indexed with the same content
         """
         error_list = []
         searcher = SearchEngine.get_search_engine(cls.INDEX_NAME)
@@ -144,7 +188,8 @@ class SearchIndexerBase(object):
 
         # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `index_item`
         indexed_count = {
-            "count": 0
+            "count": 0,
+            "unchanged": 0,
         }
 
         # indexed_items is a list of all the items that we wish to remain in the
@@ -153,6 +198,12 @@ class SearchIndexerBase(object):
         # list - those are ready to be destroyed
         indexed_items = set()
 
+        # items_to_index is a list of the (location, index document) of the items whose
+        # content changed since they were last indexed, to be sent to the index once
+        # the whole structure has been walked
+        items_to_index = []
+        content_hashes = {}
+
         def index_item(item, skip_index=False, groups_usage_info=None):
             """
             Add this item to the search index and indexed_items list
@@ -211,14 +262,32 @@ class SearchIndexerBase(object):
                     item_index['start_date'] = item.start
                 item_index['content_groups'] = item_content_groups if item_content_groups else None
                 item_index.update(cls.supplemental_fields(item))
-                searcher.index(cls.DOCUMENT_TYPE, item_index)
-                indexed_count["count"] += 1
+                item_index['content_hash'] = cls._content_hash(item_index)
+                if content_hashes.get(item_id) == item_index['content_hash']:
+                    # already indexed with the same content
+                    indexed_count["count"] += 1
+                    indexed_count["unchanged"] += 1
+                else:
+                    items_to_index.append((item.location, item_index))
                 return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
                 # broad exception so that index operation does not fail on one item of many
                 log.warning('Could not index item: %s - %r', item.location, err)
                 error_list.append(_('Could not index item: {}').format(item.location))
 
+        def submit_items():
+            """
+            Send the collected items to the search index
+            """
+            for item_location, item_index in items_to_index:
+                try:
+                    searcher.index(cls.DOCUMENT_TYPE, item_index)
+                    indexed_count["count"] += 1
+                except Exception as err:  # pylint: disable=broad-except
+                    # broad exception so that index operation does not fail on one item of many
+                    log.warning('Could not index item: %s - %r', item_location, err)
+                    error_list.append(_('Could not index item: {}').format(item_location))
+
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
                 structure = cls._fetch_top_level(modulestore, structure_key)
@@ -227,9 +296,15 @@ class SearchIndexerBase(object):
                 # First perform any additional indexing from the structure object
                 cls.supplemental_index_information(modulestore, structure)
 
-                # Now index the content
+                # Now index the content which changed
+                content_hashes.update(cls._fetch_content_hashes(searcher, structure_key))
                 for item in structure.get_children():
                     index_item(item, groups_usage_info=groups_usage_info)
+                submit_items()
+                log.info(
+                    "Indexed %d items of %s, %d of which were unchanged",
+                    indexed_count["count"], structure_key, indexed_count["unchanged"]
+                )
                 cls.remove_deleted_items(searcher, structure_key, indexed_items)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
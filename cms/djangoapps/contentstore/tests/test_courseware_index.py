@@ -306,6 +306,56 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         response = self.search()
         self.assertEqual(response["total"], 4)
 
+    def _test_unchanged_items_not_reindexed(self, store):
+        """ items whose content didn't change since they were indexed aren't sent again """
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.reindex_course(store), 4)
+
+        engine_class = type(self.searcher)
+        with patch.object(engine_class, 'index', autospec=True, side_effect=engine_class.index) as mock_index:
+            self.assertEqual(self.reindex_course(store), 4)
+            self.assertFalse(mock_index.called)
+
+            self.html_unit.display_name = "Changed Html Content"
+            self.update_item(store, self.html_unit)
+            self.publish_item(store, self.html_unit.location)
+            self.assertEqual(self.reindex_course(store), 4)
+            self.assertEqual(mock_index.call_count, 1)
+            self.assertEqual(mock_index.call_args[0][2]["id"], unicode(self.html_unit.location))
+
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+
+    def _test_unchanged_items_not_reindexed_in_large_course(self, store):
+        """ the hashes of all the indexed items are fetched, not only the first page of results """
+        for index in range(12):
+            ItemFactory.create(
+                parent_location=self.vertical.location,
+                category="html",
+                display_name="Html Content {}".format(index),
+                modulestore=store,
+                publish_item=False,
+            )
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.reindex_course(store), 16)
+
+        engine_class = type(self.searcher)
+        original_search = engine_class.search
+
+        def search_like_elasticsearch(searcher, *args, **kwargs):
+            """ Only returns the requested page of results, by default the first 10 """
+            size = kwargs.pop("size", 10)
+            from_ = kwargs.pop("from_", 0)
+            response = original_search(searcher, *args, **kwargs)
+            response["results"] = response["results"][from_:from_ + size]
+            return response
+
+        with patch('contentstore.courseware_index.SEARCH_PAGE_SIZE', 5):
+            with patch.object(engine_class, 'search', autospec=True, side_effect=search_like_elasticsearch):
+                with patch.object(engine_class, 'index', autospec=True, side_effect=engine_class.index) as mock_index:
+                    self.assertEqual(self.reindex_course(store), 16)
+        self.assertFalse(mock_index.called)
+
     def _test_not_indexing_unpublished_content(self, store):
         """ add a new one, only appers in index once added """
         # Publish the vertical to start with
@@ -554,6 +604,14 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_indexing_course(self, store_type):
         self._perform_test_using_store(store_type, self._test_indexing_course)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_unchanged_items_not_reindexed(self, store_type):
+        self._perform_test_using_store(store_type, self._test_unchanged_items_not_reindexed)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_unchanged_items_not_reindexed_in_large_course(self, store_type):
+        self._perform_test_using_store(store_type, self._test_unchanged_items_not_reindexed_in_large_course)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_not_indexing_unpublished_content(self, store_type):
         self._perform_test_using_store(store_type, self._test_not_indexing_unpublished_content)
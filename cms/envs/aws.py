@@ -255,6 +255,9 @@ DATABASES = AUTH_TOKENS['DATABASES']
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
+SPLIT_STRUCTURE_CACHE_SIZE = ENV_TOKENS.get('SPLIT_STRUCTURE_CACHE_SIZE', SPLIT_STRUCTURE_CACHE_SIZE)
+STATIC_CONTENT_DISK_CACHE_DIR = ENV_TOKENS.get('STATIC_CONTENT_DISK_CACHE_DIR', STATIC_CONTENT_DISK_CACHE_DIR)
+STATIC_CONTENT_DISK_CACHE_SIZE = ENV_TOKENS.get('STATIC_CONTENT_DISK_CACHE_SIZE', STATIC_CONTENT_DISK_CACHE_SIZE)
 # Datadog for events!
 DATADOG = AUTH_TOKENS.get("DATADOG", {})
 DATADOG.update(ENV_TOKENS.get("DATADOG", {}))
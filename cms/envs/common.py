@@ -366,6 +366,16 @@ MODULESTORE = {
     }
 }
 
+# Maximum size in bytes of the process-wide cache of split modulestore structures. Structures
+# are immutable, so this cache never needs invalidating. Set to 0 to disable it.
+SPLIT_STRUCTURE_CACHE_SIZE = 100 * 1024 * 1024
+
+# Directory in which the StaticContentServer caches assets too big for memcached (1MB and over),
+# so that they aren't read out of GridFS on every request, and the maximum total size in bytes of
+# the cached files. Set the directory to None to disable this cache.
+STATIC_CONTENT_DISK_CACHE_DIR = None
+STATIC_CONTENT_DISK_CACHE_SIZE = 5 * 1024 * 1024 * 1024
+
 ############################ DJANGO_BUILTINS ################################
 # Change DEBUG/TEMPLATE_DEBUG in your environment settings files, not here
 DEBUG = False
@@ -729,6 +739,7 @@ INSTALLED_APPS = (
     'edx_jsme',    # Molecular Structure
 
     'openedx.core.djangoapps.content.course_structures',
+    'openedx.core.djangoapps.content.course_overviews',
 
     # Credit courses
     'openedx.core.djangoapps.credit',
@@ -108,6 +108,9 @@ update_module_store_settings(
     },
 )
 
+# Keep mongo call counts in tests deterministic across test cases
+SPLIT_STRUCTURE_CACHE_SIZE = 0
+
 CONTENTSTORE = {
     'ENGINE': 'xmodule.contentstore.mongo.MongoContentStore',
     'DOC_STORE_CONFIG': {
@@ -0,0 +1,336 @@
+"""
+A local disk cache of course assets for the StaticContentServer.
+
+Assets too big to be cached in memcached (videos, PDFs, ...) would otherwise be read out of
+GridFS on every request. Instead, the first full request of such an asset copies it to a file
+on local disk while it streams it to the client, and later requests, including ranged ones,
+are served by memory-mapping that file. Ranged requests of an asset which isn't cached yet
+(browsers request videos and PDFs by range) are served from GridFS while a background thread
+copies the whole asset to disk. Only one request at a time copies any given asset.
+
+Files are named after a digest of the asset key and its last modified time, so an asset which
+gets replaced is simply cached under a new name; stale files are never served, and age out
+when the cache outgrows its maximum size.
+"""
+import errno
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+from xmodule.assetstore.assetmgr import AssetManager
+from xmodule.contentstore.content import StaticContent
+
+log = logging.getLogger(__name__)
+
+# The size of the chunks streamed out of the cached files
+DISK_CACHE_CHUNK_SIZE = 64 * 1024
+
+# The prefix of the files being written to the cache, which aren't complete yet
+TEMP_FILE_PREFIX = '.tmp'
+
+# The prefix of the files marking that an asset is being written to the cache
+LOCK_FILE_PREFIX = '.lock'
+
+# Lock files which weren't refreshed for this long (in seconds) were abandoned, e.g. by a
+# process which died
+ABANDONED_LOCK_AGE = 60
+
+# The file whose modification time is when files were last evicted from the cache
+EVICTION_MARKER = '.evicted'
+
+# The minimum time (in seconds) between two evictions, since they list every cached file
+EVICTION_INTERVAL = 60
+
+
+def content_digest(content):
+    """
+    Return a hex digest identifying this version of the asset `content`.
+
+    It's used both as the asset's ETag and as the name of its file in the disk cache.
+    """
+    last_modified_at = content.last_modified_at.isoformat() if content.last_modified_at else u''
+    key = u'{}@{}'.format(unicode(content.location), last_modified_at)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class MappedStaticContent(StaticContent):
+    """
+    An asset whose data is read from a file in the disk cache, via mmap.
+    """
+    def __init__(self, content, path):
+        super(MappedStaticContent, self).__init__(
+            content.location, content.name, content.content_type, None,
+            last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+            import_path=content.import_path, length=content.length, locked=content.locked
+        )
+        self.path = path
+
+    @property
+    def data(self):
+        with open(self.path, 'rb') as asset_file:
+            return asset_file.read()
+
+    def stream_data(self):
+        return self.stream_data_in_range(0, self.length - 1)
+
+    def stream_data_in_range(self, first_byte, last_byte):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        if self.length == 0:
+            # empty files can't be mapped
+            return
+        with open(self.path, 'rb') as asset_file:
+            data = mmap.mmap(asset_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            position = first_byte
+            while position <= last_byte:
+                end = min(position + DISK_CACHE_CHUNK_SIZE, last_byte + 1)
+                yield data[position:end]
+                position = end
+        finally:
+            data.close()
+
+
+class AssetDiskCache(object):
+    """
+    A directory of asset files, bounded by their total size in bytes.
+
+    Files are evicted least recently used first: serving a file refreshes its modification time.
+    """
+    def __init__(self, root, max_size):
+        self.root = root
+        self.max_size = max_size
+
+    def path(self, content):
+        """
+        Return the path of the file caching this version of the asset `content`.
+        """
+        digest = content_digest(content)
+        return os.path.join(self.root, digest[:2], digest)
+
+    def get(self, content):
+        """
+        Return a MappedStaticContent reading the cached data of the asset `content` (which only needs
+        to hold its metadata), or None if it isn't cached.
+        """
+        path = self.path(content)
+        try:
+            # mark the file as recently used
+            os.utime(path, None)
+        except OSError:
+            return None
+        return MappedStaticContent(content, path)
+
+    def stream_and_store(self, content):
+        """
+        Stream the data of the asset `content`, writing it to the cache along the way, unless
+        another request is already caching it.
+
+        The file only becomes visible once all the data has been written, so a client which
+        disconnects midway (or a failure writing to disk) leaves nothing behind.
+        """
+        lock_path = self._lock(content)
+        temp_file = None
+        if lock_path is not None:
+            try:
+                fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=TEMP_FILE_PREFIX)
+                temp_file = os.fdopen(fd, 'wb')
+            except (IOError, OSError):
+                log.exception(u"Could not create a file in the asset disk cache %s", self.root)
+
+        complete = False
+        try:
+            for chunk in content.stream_data():
+                if temp_file is not None:
+                    try:
+                        temp_file.write(chunk)
+                        # tell other requests this asset is still being cached
+                        os.utime(lock_path, None)
+                    except (IOError, OSError):
+                        log.exception(u"Could not write %s to the asset disk cache", unicode(content.location))
+                        temp_file.close()
+                        temp_file = None
+                        os.remove(temp_path)
+                yield chunk
+            complete = True
+        finally:
+            if temp_file is not None:
+                temp_file.close()
+                if complete:
+                    self._store(temp_path, self.path(content))
+                else:
+                    os.remove(temp_path)
+            if lock_path is not None:
+                self._unlock(lock_path)
+
+    def store(self, content):
+        """
+        Write all the data of the asset `content` to the cache right away, unless another request
+        is already caching it.
+
+        Returns a MappedStaticContent reading the cached data, or None if it isn't cached (yet).
+        """
+        if not self._is_being_stored(content):
+            for __ in self.stream_and_store(content):
+                pass
+        return self.get(content)
+
+    def store_in_background(self, content):
+        """
+        Cache the asset `content` (which only needs to hold its metadata) from a background thread
+        reading it from the contentstore, e.g. while a range of it is served.
+        """
+        if self._is_being_stored(content):
+            return
+
+        def store():
+            """
+            Read the asset from the contentstore into the cache.
+            """
+            try:
+                self.store(AssetManager.find(content.location, as_stream=True))
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u"Could not cache %s in the asset disk cache", unicode(content.location))
+
+        _run_in_background(store)
+
+    def _lock_path(self, content):
+        """
+        Return the path of the file marking that a request is writing the asset `content` to the cache.
+        """
+        return os.path.join(self.root, LOCK_FILE_PREFIX + content_digest(content))
+
+    def _is_being_stored(self, content):
+        """
+        Return whether a request is writing the asset `content` to the cache.
+        """
+        try:
+            return time.time() - os.path.getmtime(self._lock_path(content)) < ABANDONED_LOCK_AGE
+        except OSError:
+            return False
+
+    def _lock(self, content):
+        """
+        Mark that this request is writing the asset `content` to the cache, and return the path of
+        the lock file, or None if another request is writing it already.
+        """
+        lock_path = self._lock_path(content)
+        try:
+            if time.time() - os.path.getmtime(lock_path) >= ABANDONED_LOCK_AGE:
+                os.remove(lock_path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0644))
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                log.exception(u"Could not create a file in the asset disk cache %s", self.root)
+            return None
+        return lock_path
+
+    @staticmethod
+    def _unlock(lock_path):
+        """
+        Remove the lock file `lock_path`.
+        """
+        try:
+            os.remove(lock_path)
+        except OSError:
+            # removed by another request after it looked abandoned
+            pass
+
+    def _store(self, temp_path, path):
+        """
+        Move the fully written file `temp_path` to `path`, then evict files until the cache fits its maximum size.
+        """
+        try:
+            directory = os.path.dirname(path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            os.rename(temp_path, path)
+        except OSError:
+            # most likely another process just cached the same asset
+            log.info(u"Could not move %s to %s in the asset disk cache", temp_path, path, exc_info=True)
+            os.remove(temp_path)
+            return
+        self._evict_periodically()
+
+    def _evict_periodically(self):
+        """
+        Evict files if no process did in the last EVICTION_INTERVAL seconds.
+        """
+        marker_path = os.path.join(self.root, EVICTION_MARKER)
+        try:
+            if time.time() - os.path.getmtime(marker_path) < EVICTION_INTERVAL:
+                return
+        except OSError:
+            pass
+        try:
+            with open(marker_path, 'a'):
+                os.utime(marker_path, None)
+        except (IOError, OSError):
+            log.exception(u"Could not mark the eviction of files from the asset disk cache %s", self.root)
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used files until the cache fits within its maximum size.
+        """
+        entries = []
+        total_size = 0
+        for directory, __, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.startswith('.'):
+                    # files being written, lock files and the eviction marker
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        entries.sort()
+        for __, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # already removed by another process
+                pass
+            total_size -= size
+
+
+def _run_in_background(function):
+    """
+    Call `function` from a new daemon thread.
+    """
+    thread = threading.Thread(target=function, name='asset-disk-cache')
+    thread.daemon = True
+    thread.start()
+
+
+def get_asset_disk_cache():
+    """
+    Return the configured AssetDiskCache, or None if the disk cache isn't enabled.
+    """
+    root = getattr(settings, 'STATIC_CONTENT_DISK_CACHE_DIR', None)
+    if not root:
+        return None
+    if not os.path.isdir(root):
+        try:
+            os.makedirs(root)
+        except OSError:
+            if not os.path.isdir(root):
+                log.exception(u"Could not create the asset disk cache %s", root)
+                return None
+    return AssetDiskCache(root, settings.STATIC_CONTENT_DISK_CACHE_SIZE)
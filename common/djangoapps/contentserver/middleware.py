@@ -10,11 +10,12 @@ from django.http import (
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from cache_toolbox.core import get_cached_content, set_cached_content
+from contentserver.caching import content_digest, get_asset_disk_cache
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -23,6 +24,9 @@ from xmodule.exceptions import NotFoundError
 
 log = logging.getLogger(__name__)
 
+# Assets smaller than this (in bytes) are cached in memcached
+MAX_CACHED_CONTENT_SIZE = 1048576
+
 
 class StaticContentServer(object):
     def process_request(self, request):
@@ -43,6 +47,7 @@ class StaticContentServer(object):
 
             # first look in our cache so we don't have to round-trip to the DB
             content = get_cached_content(loc)
+            disk_cache = None
             if content is None:
                 # nope, not in cache, let's fetch from DB
                 try:
@@ -55,10 +60,16 @@ class StaticContentServer(object):
                 # since we fetched it from DB, let's cache it going forward, but only if it's < 1MB
                 # this is because I haven't been able to find a means to stream data out of memcached
                 if content.length is not None:
-                    if content.length < 1048576:
+                    if content.length < MAX_CACHED_CONTENT_SIZE:
                         # since we've queried as a stream, let's read in the stream into memory to set in cache
                         content = content.copy_to_in_mem()
                         set_cached_content(content)
+                    else:
+                        # bigger assets are cached on local disk instead, if it's enabled: serve the data from
+                        # there if it's already cached, otherwise it gets cached as it's streamed (see below)
+                        disk_cache = get_asset_disk_cache()
+                        if disk_cache is not None:
+                            content = disk_cache.get(content) or content
             else:
                 # NOP here, but we may wish to add a "cache-hit" counter in the future
                 pass
@@ -81,9 +92,16 @@ class StaticContentServer(object):
             # timestamp, so we can simply compare the strings
             last_modified_at_str = content.last_modified_at.strftime("%a, %d-%b-%Y %H:%M:%S GMT")
 
+            etag = '"{}"'.format(content_digest(content))
+
             # see if the client has cached this content, if so then compare the
-            # timestamps, if they are the same then just return a 304 (Not Modified)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            # ETags or timestamps, if they are the same then just return a 304 (Not Modified)
+            if 'HTTP_IF_NONE_MATCH' in request.META:
+                if etag_matches(etag, request.META['HTTP_IF_NONE_MATCH']):
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    return response
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
@@ -94,12 +112,11 @@ class StaticContentServer(object):
             # Request -> Range attribute structure: "Range: bytes=first-[last]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
+            # If an If-Range header doesn't match the current version of the content, the Range is ignored
+            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.27
             response = None
-            if request.META.get('HTTP_RANGE'):
-                # Data from cache (StaticContent) has no easy byte management, so we use the DB instead (StaticContentStream)
-                if type(content) == StaticContent:
-                    content = AssetManager.find(loc, as_stream=True)
-
+            if_range = request.META.get('HTTP_IF_RANGE')
+            if request.META.get('HTTP_RANGE') and (not if_range or if_range in (etag, last_modified_at_str)):
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -124,6 +141,10 @@ class StaticContentServer(object):
 
                         if 0 <= first <= last < content.length:
                             # If the byte range is satisfiable
+                            if disk_cache is not None and isinstance(content, StaticContentStream):
+                                # Ranged requests are how browsers fetch videos and PDFs, so
+                                # cache the whole asset for the next ones
+                                disk_cache.store_in_background(content)
                             response = HttpResponse(content.stream_data_in_range(first, last))
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
@@ -138,17 +159,31 @@ class StaticContentServer(object):
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if disk_cache is not None and isinstance(content, StaticContentStream):
+                    response = HttpResponse(disk_cache.stream_and_store(content))
+                else:
+                    response = HttpResponse(content.stream_data())
                 response['Content-Length'] = content.length
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
             response['Content-Type'] = content.content_type
             response['Last-Modified'] = last_modified_at_str
+            response['ETag'] = etag
 
             return response
 
 
+def etag_matches(etag, header_value):
+    """
+    Returns whether `etag` is one of the ETags listed in the If-None-Match header value `header_value`.
+
+    See spec for details: http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.26
+    """
+    etags = [value.strip() for value in header_value.split(',')]
+    return '*' in etags or etag in etags
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
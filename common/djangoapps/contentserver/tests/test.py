@@ -2,21 +2,32 @@
 Tests for StaticContentServer
 """
 import copy
+import datetime
 import ddt
 import logging
+import os
+import shutil
+import tempfile
 import unittest
+from StringIO import StringIO
 from uuid import uuid4
 
+from mock import patch
+from pytz import UTC
+
 from django.conf import settings
 from django.test.client import Client
 from django.test.utils import override_settings
 
+from xmodule.contentstore.content import StaticContentStream
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.xml_importer import import_course_from_xml
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
+from contentserver.caching import AssetDiskCache, MappedStaticContent
 from contentserver.middleware import parse_range_header
 from student.models import CourseEnrollment
 
@@ -192,6 +203,183 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         )
         self.assertEqual(resp.status_code, 416)
 
+    def test_etag(self):
+        """
+        Test that a request with the ETag of the content in If-None-Match outputs 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        etag = resp['ETag']
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"other", {}'.format(etag))
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_range_request_if_range(self):
+        """
+        Test that the Range is only honored if If-Range matches the current version of the content.
+        """
+        etag = self.client.get(self.url_unlocked)['ETag']
+
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-', HTTP_IF_RANGE=etag)
+        self.assertEqual(resp.status_code, 206)
+
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-', HTTP_IF_RANGE='"other"')
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn('Content-Range', resp)
+
+    @patch('contentserver.middleware.MAX_CACHED_CONTENT_SIZE', 0)
+    def test_disk_cache(self):
+        """
+        Test that assets too big for memcached are cached on disk, and served from there.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        data = self.contentstore.find(self.unlocked_asset).data
+
+        with override_settings(STATIC_CONTENT_DISK_CACHE_DIR=cache_dir):
+            resp = self.client.get(self.url_unlocked)
+            self.assertEqual(resp.content, data)
+            self.assertEqual(len(list(os.walk(cache_dir))), 2)
+
+            with patch('contentserver.caching.AssetDiskCache.stream_and_store') as mock_store:
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(resp.content, data)
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-3')
+                self.assertEqual(resp.status_code, 206)
+                self.assertEqual(resp.content, data[1:4])
+            self.assertFalse(mock_store.called)
+
+    @patch('contentserver.middleware.MAX_CACHED_CONTENT_SIZE', 0)
+    def test_disk_cache_filled_by_range_request(self):
+        """
+        Test that a ranged request of an asset which isn't cached on disk yet caches all of it.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        data = self.contentstore.find(self.unlocked_asset).data
+
+        with override_settings(STATIC_CONTENT_DISK_CACHE_DIR=cache_dir):
+            with patch('contentserver.caching._run_in_background', side_effect=lambda function: function()):
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-3')
+            self.assertEqual(resp.status_code, 206)
+            self.assertEqual(resp.content, data[1:4])
+
+            with patch('contentserver.caching.AssetDiskCache.stream_and_store') as mock_store:
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(resp.content, data)
+            self.assertFalse(mock_store.called)
+
+
+    @patch('contentserver.middleware.MAX_CACHED_CONTENT_SIZE', 0)
+    def test_range_request_not_delayed_by_disk_cache(self):
+        """
+        Test that a ranged request of an asset which isn't cached on disk yet is served before it's cached.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        data = self.contentstore.find(self.unlocked_asset).data
+
+        with override_settings(STATIC_CONTENT_DISK_CACHE_DIR=cache_dir):
+            with patch('contentserver.caching._run_in_background') as mock_run_in_background:
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-')
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp.content, data)
+        self.assertEqual(mock_run_in_background.call_count, 1)
+        self.assertEqual(len(list(os.walk(cache_dir))), 1)
+
+
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for the local disk cache of assets.
+    """
+
+    def setUp(self):
+        super(AssetDiskCacheTestCase, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.cache = AssetDiskCache(self.root, max_size=1000)
+        self.course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+
+    def content(self, name, data, last_modified_at=None):
+        """
+        Returns a StaticContentStream reading `data`.
+        """
+        return StaticContentStream(
+            self.course_key.make_asset_key('asset', name), name, 'application/octet-stream', StringIO(data),
+            last_modified_at=last_modified_at or datetime.datetime(2015, 1, 1, tzinfo=UTC), length=len(data)
+        )
+
+    def store(self, content):
+        """
+        Streams `content` through the cache and returns the streamed data.
+        """
+        return ''.join(self.cache.stream_and_store(content))
+
+    def test_miss_then_hit(self):
+        data = 'x' * 100
+        self.assertIsNone(self.cache.get(self.content('a', data)))
+        self.assertEqual(self.store(self.content('a', data)), data)
+
+        cached = self.cache.get(self.content('a', data))
+        self.assertIsInstance(cached, MappedStaticContent)
+        self.assertEqual(''.join(cached.stream_data()), data)
+        self.assertEqual(''.join(cached.stream_data_in_range(10, 19)), data[10:20])
+
+    def test_store(self):
+        data = 'x' * 100
+        cached = self.cache.store(self.content('a', data))
+        self.assertIsInstance(cached, MappedStaticContent)
+        self.assertEqual(''.join(cached.stream_data_in_range(10, 19)), data[10:20])
+
+    def test_keyed_by_last_modified(self):
+        self.store(self.content('a', 'x' * 100))
+        new_version = self.content('a', 'y' * 100, last_modified_at=datetime.datetime(2015, 2, 1, tzinfo=UTC))
+        self.assertIsNone(self.cache.get(new_version))
+
+    def test_interrupted_stream_not_stored(self):
+        stream = self.cache.stream_and_store(self.content('a', 'x' * 100))
+        next(stream)
+        stream.close()
+        self.assertIsNone(self.cache.get(self.content('a', '')))
+        self.assertEqual(os.listdir(self.root), [])
+
+    @patch('contentserver.caching.EVICTION_INTERVAL', 0)
+    def test_evicts_least_recently_used(self):
+        self.store(self.content('a', 'a' * 400))
+        self.store(self.content('b', 'b' * 400))
+        # make 'b' the least recently used
+        path_a = self.cache.path(self.content('a', ''))
+        os.utime(self.cache.path(self.content('b', '')), (0, 0))
+        self.store(self.content('c', 'c' * 400))
+
+        self.assertTrue(os.path.exists(path_a))
+        self.assertIsNone(self.cache.get(self.content('b', '')))
+        self.assertIsNotNone(self.cache.get(self.content('c', '')))
+
+    def test_eviction_throttled(self):
+        with patch('contentserver.caching.AssetDiskCache.evict') as mock_evict:
+            for name in ('a', 'b', 'c'):
+                self.store(self.content(name, name * 400))
+        self.assertEqual(mock_evict.call_count, 1)
+
+    def test_concurrent_stores_deduplicated(self):
+        data = 'x' * 100
+        first_stream = self.cache.stream_and_store(self.content('a', data))
+        next(first_stream)
+        # another request streams the asset without caching it
+        self.assertEqual(self.store(self.content('a', data)), data)
+        self.assertIsNone(self.cache.get(self.content('a', '')))
+        self.assertIsNone(self.cache.store(self.content('a', data)))
+
+        list(first_stream)
+        self.assertIsNotNone(self.cache.get(self.content('a', '')))
+
 
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
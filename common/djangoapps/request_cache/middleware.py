@@ -1,5 +1,7 @@
 import threading
 
+from celery.signals import task_postrun, task_prerun
+
 _request_cache_threadlocal = threading.local()
 _request_cache_threadlocal.data = {}
 _request_cache_threadlocal.request = None
@@ -30,3 +32,19 @@ class RequestCache(object):
     def process_response(self, request, response):
         self.clear_request_cache()
         return response
+
+
+def _clear_request_cache_for_task(task=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    The request cache is only cleared by the middleware, so clear it when each
+    celery task starts and finishes, rather than serving what was cached by one
+    task to the later tasks run by the same worker. Tasks run eagerly are part
+    of the request that started them, and leave its cache alone.
+    """
+    if task is not None and task.request.is_eager:
+        return
+    RequestCache().clear_request_cache()
+
+
+task_prerun.connect(_clear_request_cache_for_task)
+task_postrun.connect(_clear_request_cache_for_task)
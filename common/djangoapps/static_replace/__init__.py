@@ -30,11 +30,32 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _compiled_url_replace_regex(prefix):
+    """
+    Returns the compiled `_url_replace_regex` for the given prefix, compiling
+    it only the first time it's needed.
+    """
+    regex = _URL_REPLACE_REGEXES.get(prefix)
+    if regex is None:
+        regex = _URL_REPLACE_REGEXES[prefix] = re.compile(_url_replace_regex(prefix))
+    return regex
+
+
+_URL_REPLACE_REGEXES = {}
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
     a dead link instead of raising an exception.
+
+    Unless in debug mode, where static files may change at any time, the
+    urls are only looked up once per process.
     """
+    url = _STATICFILES_LOOKUPS.get(path)
+    if url is not None:
+        return url
+
     try:
         url = staticfiles_storage.url(path)
     except Exception as err:
@@ -42,9 +63,15 @@ def try_staticfiles_lookup(path):
             path, str(err)))
         # Just return the original path; don't kill everything.
         url = path
+
+    if not settings.DEBUG:
+        _STATICFILES_LOOKUPS[path] = url
     return url
 
 
+_STATICFILES_LOOKUPS = {}
+
+
 def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
     """
     This will replace a link to another piece of courseware to a 'jump_to'
@@ -71,7 +98,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -91,7 +118,7 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -110,13 +137,17 @@ def process_static_urls(text, replacement_function, data_dir=None):
         rest = match.group('rest')
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
+    return _compiled_url_replace_regex(_static_url_prefix(data_dir)).sub(wrap_part_extraction, text)
+
+
+def _static_url_prefix(data_dir):
+    """
+    Returns the regex matching the prefix of static urls not already pointing
+    to the `data_dir`.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
     )
 
 
@@ -149,6 +180,58 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     course_id: The course identifier used to distinguish static content for this course in studio
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
     """
+    replace_static_url = _static_url_replacer(data_directory, course_id, static_asset_path)
+    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+
+def replace_all_urls(text, course_id, jump_to_id_base_url, data_directory=None, static_asset_path=''):
+    """
+    Does the work of `replace_static_urls`, `replace_course_urls` and
+    `replace_jump_to_id_urls` at once, in a single pass over the text.
+
+    text: The source text to do the substitution in
+    course_id: The course in which this rewrite happens
+    jump_to_id_base_url: The base of the urls /jump_to_id/ links are replaced with
+    data_directory: The directory in which course data is stored
+    static_asset_path: Path for static assets, which overrides data_directory if nonempty
+    """
+    data_dir = static_asset_path or data_directory
+    replace_static_url = _static_url_replacer(data_directory, course_id, static_asset_path)
+    course_url = '/courses/' + course_id.to_deprecated_string() + '/'
+
+    def replace_url(match):
+        """
+        Replace a single matched url, depending on its prefix.
+        """
+        quote = match.group('quote')
+        rest = match.group('rest')
+        if match.group('course'):
+            return "".join([quote, course_url, rest, quote])
+        if match.group('jump_to_id'):
+            return "".join([quote, jump_to_id_base_url + rest, quote])
+        return replace_static_url(match.group(0), match.group('prefix'), quote, rest)
+
+    regex = _compiled_url_replace_regex(u'{static}|(?P<course>/course/)|(?P<jump_to_id>/jump_to_id/)'.format(
+        static=_static_url_prefix(data_dir)
+    ))
+    return regex.sub(replace_url, text)
+
+
+def _static_url_replacer(data_directory, course_id, static_asset_path):
+    """
+    Returns the function replacing a single matched static url for
+    `replace_static_urls`.
+    """
+    # The modulestore type of the course is only looked up once per text
+    modulestore_types = {}
+
+    def is_xml_course():
+        """
+        Whether the course is stored in the XML modulestore.
+        """
+        if course_id not in modulestore_types:
+            modulestore_types[course_id] = modulestore().get_modulestore_type(course_id)
+        return modulestore_types[course_id] == ModuleStoreEnum.Type.xml
 
     def replace_static_url(original, prefix, quote, rest):
         """
@@ -164,7 +247,7 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) \
                 and course_id \
-                and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
+                and not is_xml_course():
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
@@ -202,4 +285,4 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
 
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return replace_static_url
@@ -1,9 +1,13 @@
 import re
 
 from nose.tools import assert_equals, assert_true, assert_false  # pylint: disable=no-name-in-module
+import static_replace
 from static_replace import (
     replace_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_all_urls,
+    try_staticfiles_lookup,
     _url_replace_regex,
     process_static_urls,
     make_static_urls_absolute
@@ -143,6 +147,44 @@ def test_static_url_with_query(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+@patch('static_replace.staticfiles_storage')
+@patch('static_replace.modulestore')
+def test_replace_all_urls(mock_modulestore, mock_storage):
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+
+    text = (
+        '<img src="/static/file.png"/><a href="/course/info">info</a>'
+        '<a href=\'/jump_to_id/abc\'>link</a><img src="/static/data_dir/file.png"/>'
+        '<img src="/static/file.png?raw"/>'
+    )
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url
+    )
+    assert_equals(expected, replace_all_urls(text, COURSE_KEY, jump_to_id_base_url, DATA_DIRECTORY))
+    assert_true('"/c4x/org/course/asset/file.png"' in expected)
+    assert_true('"/courses/org/course/run/info"' in expected)
+    assert_true("'/courses/org/course/run/jump_to_id/abc'" in expected)
+
+    # The course's modulestore type is only looked up once
+    mock_modulestore.reset_mock()
+    replace_all_urls(text + text, COURSE_KEY, jump_to_id_base_url, DATA_DIRECTORY)
+    assert_equals(1, mock_modulestore.return_value.get_modulestore_type.call_count)
+
+
+@patch('static_replace.staticfiles_storage')
+@patch.dict(static_replace._STATICFILES_LOOKUPS, clear=True)  # pylint: disable=protected-access
+def test_staticfiles_lookup_cached(mock_storage):
+    mock_storage.url.return_value = '/static/file.abc123.png'
+
+    assert_equals('/static/file.abc123.png', try_staticfiles_lookup('file.png'))
+    assert_equals('/static/file.abc123.png', try_staticfiles_lookup('file.png'))
+    mock_storage.url.assert_called_once_with('file.png')
+
+
 def test_regex():
     yes = ('"/static/foo.png"',
            '"/static/foo.png"',
@@ -1183,6 +1183,24 @@ class CourseEnrollment(models.Model):
         except cls.DoesNotExist:
             return (None, None)
 
+    @classmethod
+    def enrollment_modes_for_users(cls, user_ids, course_id):
+        """
+        Returns the enrollment modes for the given users for the given course,
+        in a single query.
+
+        `user_ids` is a list of User ids
+        `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
+
+        Returns a dict mapping the id of each enrolled user to (mode, is_active),
+        as returned by `enrollment_mode_for_user`. Users who have no
+        courseenrollment record are left out.
+        """
+        records = CourseEnrollment.objects.filter(
+            user__id__in=user_ids, course_id=course_id
+        ).values_list('user_id', 'mode', 'is_active')
+        return {user_id: (mode, is_active) for user_id, mode, is_active in records}
+
     @classmethod
     def enrollments_for_user(cls, user):
         return CourseEnrollment.objects.filter(user=user, is_active=1)
@@ -402,6 +402,29 @@ class DashboardTest(ModuleStoreTestCase):
 
         self.assertFalse(enrollment.refundable())
 
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_notpassing_certificate_grade_required(self):
+        # The grade required for a certificate is shown to the students who didn't pass
+        self.client.login(username="jack", password="test")
+        CourseEnrollment.enroll(self.user, self.course.id, mode='honor')
+
+        self.course.start = datetime.now(pytz.UTC) - timedelta(days=2)
+        self.course.end = datetime.now(pytz.UTC) - timedelta(days=1)
+        self.course = self.update_course(self.course, self.user.id)
+
+        GeneratedCertificateFactory.create(
+            user=self.user,
+            course_id=self.course.id,
+            status=CertificateStatuses.notpassing,
+            mode='honor',
+            grade='0.3',
+        )
+        response = self.client.get(reverse('dashboard'))
+
+        self.assertEquals(response.status_code, 200)
+        self.assertContains(response, 'Grade required for a')
+        self.assertContains(response, '{0:.0f}%'.format(self.course.lowest_passing_grade * 100))
+
     @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
     def test_linked_in_add_to_profile_btn_not_appearing_without_config(self):
         # Without linked-in config don't show Add Certificate to LinkedIn button
@@ -734,6 +757,22 @@ class EnrollInCourseTest(EnrollmentEventTestMixin, TestCase):
         CourseEnrollment.enroll(user, course_id, "honor")
         self.assert_enrollment_mode_change_event_was_emitted(user, course_id, "honor")
 
+    def test_enrollment_modes_for_users(self):
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        honor_user = User.objects.create(username="justin", email="jh@fake.edx.org")
+        inactive_user = User.objects.create(username="jack", email="jack@fake.edx.org")
+        unenrolled_user = User.objects.create(username="joe", email="joe@fake.edx.org")
+        CourseEnrollment.enroll(honor_user, course_id, "honor")
+        CourseEnrollment.enroll(inactive_user, course_id, "verified")
+        CourseEnrollment.unenroll(inactive_user, course_id)
+
+        user_ids = [honor_user.id, inactive_user.id, unenrolled_user.id]
+        with self.assertNumQueries(1):
+            modes = CourseEnrollment.enrollment_modes_for_users(user_ids, course_id)
+        self.assertEqual(modes, {honor_user.id: ("honor", True), inactive_user.id: ("verified", False)})
+        for user in (honor_user, inactive_user):
+            self.assertEqual(modes[user.id], CourseEnrollment.enrollment_mode_for_user(user, course_id))
+
 
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
 class ChangeEnrollmentViewTest(ModuleStoreTestCase):
@@ -0,0 +1,178 @@
+"""
+Event tracker backend that sends events to another backend from a background thread.
+
+Example configuration, wrapping the MongoDB backend::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.asynchronous.AsyncBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {'database': 'track'},
+              },
+              'max_queue_size': 10000,
+              'batch_size': 100,
+              'flush_interval': 1,
+          }
+      }
+  }
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+
+class AsyncBackend(BaseBackend):
+    """
+    Event tracker backend queuing events for another backend, which receives them in batches.
+
+    Sending an event only appends it to a bounded in-process queue: a background thread takes
+    the queued events in batches of up to `batch_size` and passes them to the wrapped backend's
+    `send_batch`, whenever a batch is full or every `flush_interval` seconds.
+
+    The queue is a ring buffer holding up to `max_queue_size` events: if the wrapped backend
+    can't keep up, the oldest events are dropped rather than blocking the requests.  The queue
+    depth and the number of dropped events are reported to datadog after every batch, and
+    are available from `stats`.  Queued events are flushed when the process exits.
+    """
+
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, flush_interval=1.0, **kwargs):
+        """
+        :Parameters:
+
+          - `backend`: the configuration of the wrapped backend, as a dict with
+            an 'ENGINE' and optional 'OPTIONS', like in TRACKING_BACKENDS
+          - `max_queue_size`: the number of events queued before the oldest are dropped
+          - `batch_size`: the maximum number of events sent to the wrapped backend at once
+          - `flush_interval`: the maximum number of seconds an event stays in the queue
+
+        """
+        super(AsyncBackend, self).__init__(**kwargs)
+
+        # Imported here since the tracker module instantiates the backends when it's imported.
+        from track.tracker import _instantiate_backend_from_name
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+        self.backend_name = backend['ENGINE'].split('.')[-1]
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = deque(maxlen=max_queue_size)
+
+        self.dropped = 0
+        self.sent = 0
+        self._reported_dropped = 0
+
+        # Serializes the batches sent by the worker thread and by `flush`
+        self._send_lock = threading.Lock()
+        self._batch_ready = threading.Event()
+        self._worker = None
+        self._worker_pid = None
+
+        atexit.register(self.flush)
+
+    def send(self, event):
+        """Queue the event, to be sent to the wrapped backend by the worker thread."""
+        self._ensure_worker()
+
+        if len(self.queue) == self.queue.maxlen:
+            # Appending pushes the oldest event out of the queue
+            self.dropped += 1
+        self.queue.append(event)
+
+        if len(self.queue) >= self.batch_size:
+            self._batch_ready.set()
+
+    def send_batch(self, events):
+        """Queue the events."""
+        for event in events:
+            self.send(event)
+
+    def _ensure_worker(self):
+        """
+        Start the worker thread if it isn't running in this process yet.
+
+        Threads don't survive forking, so this is checked on every event rather than started
+        when the backend is created, which usually happens before web server workers are forked.
+
+        A forked process starts with a fresh queue and locks: the parent's queued events are
+        the parent's to send, and its worker may have been holding the locks at fork time.
+        """
+        pid = os.getpid()
+        if self._worker_pid == pid and self._worker.is_alive():
+            return
+        if self._worker_pid is not None and self._worker_pid != pid:
+            self.queue = deque(maxlen=self.queue.maxlen)
+            self._send_lock = threading.Lock()
+            self._batch_ready = threading.Event()
+        self._worker_pid = pid
+        self._worker = threading.Thread(target=self._run, name='track-async-{}'.format(self.backend_name))
+        self._worker.daemon = True
+        self._worker.start()
+
+    def _run(self):
+        """Send the queued events in batches, forever."""
+        while True:
+            self._batch_ready.wait(self.flush_interval)
+            self._batch_ready.clear()
+            try:
+                self._send_queued_events()
+            except Exception:  # pylint: disable=broad-except
+                # The worker must keep running whatever happens to the events
+                log.exception('Error sending events to the %s event tracker backend', self.backend_name)
+
+    def _send_queued_events(self):
+        """Send all the events currently queued to the wrapped backend, in batches."""
+        with self._send_lock:
+            while self.queue:
+                batch = []
+                try:
+                    while len(batch) < self.batch_size:
+                        batch.append(self.queue.popleft())
+                except IndexError:
+                    # the queue is empty
+                    pass
+
+                try:
+                    self.backend.send_batch(batch)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception(
+                        'Error sending %d events to the %s event tracker backend', len(batch), self.backend_name
+                    )
+                else:
+                    self.sent += len(batch)
+            self._report_stats()
+
+    def _report_stats(self):
+        """Report the queue depth and newly dropped events to datadog."""
+        tags = ['backend:{}'.format(self.backend_name)]
+        dog_stats_api.gauge('track.async.queue_depth', len(self.queue), tags=tags)
+        dropped = self.dropped
+        if dropped > self._reported_dropped:
+            dog_stats_api.increment('track.async.dropped', dropped - self._reported_dropped, tags=tags)
+            self._reported_dropped = dropped
+
+    def flush(self):
+        """Send all the queued events right away, from the current thread."""
+        self._send_queued_events()
+
+    def stats(self):
+        """Returns a dict of the current queue depth and the number of events sent and dropped so far."""
+        return {
+            'queue_depth': len(self.queue),
+            'sent': self.sent,
+            'dropped': self.dropped,
+        }
@@ -33,11 +33,23 @@ class LoggerBackend(BaseBackend):
         self.event_logger = logging.getLogger(name)
 
     def send(self, event):
+        self.event_logger.info(self._serialize(event))
+
+    def send_batch(self, events):
+        # Each event is still logged as its own record: the tracking log
+        # is read one event per line, and syslog handlers don't accept
+        # records spanning several lines.
+        if not self.event_logger.isEnabledFor(logging.INFO):
+            return
+        for event in events:
+            self.event_logger.info(self._serialize(event))
+
+    @staticmethod
+    def _serialize(event):
+        """Returns the event as a JSON string."""
         event_str = json.dumps(event, cls=DateTimeJSONEncoder)
 
         # TODO: remove trucation of the serialized event, either at a
         # higher level during the emittion of the event, or by
         # providing warnings when the events exceed certain size.
-        event_str = event_str[:settings.TRACK_MAX_EVENT]
-
-        self.event_logger.info(event_str)
+        return event_str[:settings.TRACK_MAX_EVENT]
@@ -97,3 +97,14 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection, all at once"""
+        if not events:
+            return
+        try:
+            # Keep inserting the other events if one of them can't be
+            self.collection.insert(events, manipulate=False, continue_on_error=True)
+        except (PyMongoError, BSONError):
+            msg = 'Error inserting %d events to MongoDB event tracker backend'
+            log.exception(msg, len(events))
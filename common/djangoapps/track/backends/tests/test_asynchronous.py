@@ -0,0 +1,116 @@
+from __future__ import absolute_import
+
+import time
+
+from mock import patch
+
+from django.test import TestCase
+
+from track.backends import BaseBackend
+from track.backends.asynchronous import AsyncBackend
+
+
+class RecordingBackend(BaseBackend):
+    """Backend recording the batches of events it receives."""
+    def __init__(self, **options):
+        super(RecordingBackend, self).__init__(**options)
+        self.batches = []
+
+    def send(self, event):
+        self.batches.append([event])
+
+    def send_batch(self, events):
+        self.batches.append(list(events))
+
+
+class FailingBackend(BaseBackend):
+    """Backend failing to send any event."""
+    def send(self, event):
+        raise Exception('Failing on purpose')
+
+
+WRAPPED_BACKEND = {'ENGINE': 'track.backends.tests.test_asynchronous.RecordingBackend'}
+
+
+class TestAsyncBackend(TestCase):
+    def setUp(self):
+        super(TestAsyncBackend, self).setUp()
+        atexit_patcher = patch('track.backends.asynchronous.atexit')
+        self.atexit = atexit_patcher.start()
+        self.addCleanup(atexit_patcher.stop)
+
+    def _create_backend(self, start_worker=False, **options):
+        """Create an AsyncBackend, with or without its worker thread."""
+        backend = AsyncBackend(backend=options.pop('backend', WRAPPED_BACKEND), **options)
+        if not start_worker:
+            backend._ensure_worker = lambda: None  # pylint: disable=protected-access
+        return backend
+
+    def test_events_sent_in_batches(self):
+        backend = self._create_backend(batch_size=2)
+        for index in xrange(5):
+            backend.send({'index': index})
+
+        # Nothing is sent on the calling thread
+        self.assertEqual(backend.backend.batches, [])
+        self.assertEqual(backend.stats(), {'queue_depth': 5, 'sent': 0, 'dropped': 0})
+
+        backend.flush()
+        self.assertEqual(
+            backend.backend.batches,
+            [[{'index': 0}, {'index': 1}], [{'index': 2}, {'index': 3}], [{'index': 4}]]
+        )
+        self.assertEqual(backend.stats(), {'queue_depth': 0, 'sent': 5, 'dropped': 0})
+
+    def test_oldest_events_dropped_when_full(self):
+        backend = self._create_backend(max_queue_size=3)
+        for index in xrange(5):
+            backend.send({'index': index})
+
+        with patch('track.backends.asynchronous.dog_stats_api') as dog_stats_api:
+            backend.flush()
+        dog_stats_api.increment.assert_called_once_with('track.async.dropped', 2, tags=['backend:RecordingBackend'])
+        self.assertEqual(backend.backend.batches, [[{'index': 2}, {'index': 3}, {'index': 4}]])
+        self.assertEqual(backend.stats()['dropped'], 2)
+
+    def test_flushed_at_exit(self):
+        backend = self._create_backend()
+        self.atexit.register.assert_called_once_with(backend.flush)
+
+    def test_backend_errors_logged(self):
+        backend = self._create_backend(backend={'ENGINE': 'track.backends.tests.test_asynchronous.FailingBackend'})
+        backend.send({})
+        with patch('track.backends.asynchronous.log') as log:
+            backend.flush()
+        self.assertTrue(log.exception.called)
+        self.assertEqual(backend.stats(), {'queue_depth': 0, 'sent': 0, 'dropped': 0})
+
+    def test_worker_thread(self):
+        backend = self._create_backend(start_worker=True, batch_size=2, flush_interval=60)
+        backend.send({'index': 0})
+        backend.send({'index': 1})
+
+        # A full batch wakes the worker up without waiting for the flush interval
+        deadline = time.time() + 10
+        while not backend.backend.batches and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(backend.backend.batches, [[{'index': 0}, {'index': 1}]])
+
+    def test_fresh_state_after_fork(self):
+        backend = self._create_backend(start_worker=True, flush_interval=60)
+        backend.send({'index': 0})
+        parent_send_lock = backend._send_lock  # pylint: disable=protected-access
+        # The worker of the parent is holding the lock when the process forks
+        parent_send_lock.acquire()
+        self.addCleanup(parent_send_lock.release)
+
+        with patch('track.backends.asynchronous.os.getpid', return_value=-1):
+            backend.send({'index': 1})
+            backend.flush()
+        # The parent's events are left to the parent
+        self.assertEqual(backend.backend.batches, [[{'index': 1}]])
+        self.assertIsNot(backend._send_lock, parent_send_lock)  # pylint: disable=protected-access
+
+    def test_invalid_wrapped_backend(self):
+        with self.assertRaises(ValueError):
+            self._create_backend(backend={'ENGINE': 'track.backends.logger.Foo'})
@@ -37,3 +37,12 @@ class TestMongoBackend(TestCase):
 
         self.assertEqual(events[0], first_argument(calls[0]))
         self.assertEqual(events[1], first_argument(calls[1]))
+
+    def test_mongo_backend_batch(self):
+        events = [{'test': 1}, {'test': 2}]
+
+        self.backend.send_batch(events)
+        self.backend.send_batch([])
+
+        # All the events are inserted at once
+        self.backend.collection.insert.assert_called_once_with(events, manipulate=False, continue_on_error=True)
@@ -4,9 +4,11 @@ Parser and evaluator for FormulaResponse and NumericalResponse
 Uses pyparsing to parse. Main function as of now is evaluator().
 """
 
+from collections import OrderedDict
 import math
 import operator
 import numbers
+import threading
 import numpy
 import scipy.constants
 import functions
@@ -72,6 +74,9 @@ SUFFIXES = {
     'c': 1e-2, 'm': 1e-3, 'u': 1e-6, 'n': 1e-9, 'p': 1e-12
 }
 
+# The maximum number of parsed expressions kept by `parse_expression`.
+PARSE_CACHE_SIZE = 1000
+
 
 class UndefinedVariable(Exception):
     """
@@ -115,6 +120,14 @@ def eval_number(parse_result):
     return super_float("".join(parse_result))
 
 
+def is_value(token):
+    """
+    Return whether `token` is a number, or an array of numbers (when evaluating
+    many samples at once), rather than an operator or a parenthesis.
+    """
+    return isinstance(token, (numbers.Number, numpy.ndarray))
+
+
 def eval_atom(parse_result):
     """
     Return the value wrapped by the atom.
@@ -122,7 +135,7 @@ def eval_atom(parse_result):
     In the case of parenthesis, ignore them.
     """
     # Find first number in the list
-    result = next(k for k in parse_result if isinstance(k, numbers.Number))
+    result = next(k for k in parse_result if is_value(k))
     return result
 
 
@@ -136,7 +149,7 @@ def eval_power(parse_result):
     # `reduce` will go from left to right; reverse the list.
     parse_result = reversed(
         [k for k in parse_result
-         if isinstance(k, numbers.Number)]  # Ignore the '^' marks.
+         if is_value(k)]  # Ignore the '^' marks.
     )
     # Having reversed it, raise `b` to the power of `a`.
     power = reduce(lambda a, b: b ** a, parse_result)
@@ -155,10 +168,16 @@ def eval_parallel(parse_result):
     """
     if len(parse_result) == 1:
         return parse_result[0]
-    if 0 in parse_result:
+    values = [e for e in parse_result if is_value(e)]
+    if any(isinstance(e, numpy.ndarray) for e in values):
+        # Evaluating many samples at once: NaN for the samples with a zero input
+        has_zero = reduce(numpy.logical_or, [numpy.equal(e, 0) for e in values])
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            result = 1. / sum(1. / e for e in values)
+        return numpy.where(has_zero, float('nan'), result)
+    if 0 in values:
         return float('nan')
-    reciprocals = [1. / e for e in parse_result
-                   if isinstance(e, numbers.Number)]
+    reciprocals = [1. / e for e in values]
     return 1. / sum(reciprocals)
 
 
@@ -173,12 +192,12 @@ def eval_sum(parse_result):
     total = 0.0
     current_op = operator.add
     for token in parse_result:
-        if token == '+':
+        if not isinstance(token, basestring):
+            total = current_op(total, token)
+        elif token == '+':
             current_op = operator.add
         elif token == '-':
             current_op = operator.sub
-        else:
-            total = current_op(total, token)
     return total
 
 
@@ -191,12 +210,12 @@ def eval_product(parse_result):
     prod = 1.0
     current_op = operator.mul
     for token in parse_result:
-        if token == '*':
+        if not isinstance(token, basestring):
+            prod = current_op(prod, token)
+        elif token == '*':
             current_op = operator.mul
         elif token == '/':
             current_op = operator.truediv
-        else:
-            prod = current_op(prod, token)
     return prod
 
 
@@ -216,6 +235,48 @@ def add_defaults(variables, functions, case_sensitive):
     return (all_variables, all_functions)
 
 
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def parse_expression(math_expr, case_sensitive=False):
+    """
+    Return a `ParseAugmenter` holding the parse tree of `math_expr`.
+
+    Parsing with pyparsing is by far the most expensive part of evaluating an
+    expression, and the same expressions are evaluated over and over (once per
+    sample when checking a formula, and again for every student), so the parsed
+    expressions are cached, keyed by (math_expr, case_sensitive). The returned
+    object is shared, and must not be modified.
+    """
+    key = (math_expr, case_sensitive)
+    with _PARSE_CACHE_LOCK:
+        math_interpreter = _PARSE_CACHE.pop(key, None)
+        if math_interpreter is not None:
+            # re-insert to mark this entry as the most recently used
+            _PARSE_CACHE[key] = math_interpreter
+            return math_interpreter
+
+    # Parse outside of the lock; this raises for unparseable expressions, which
+    # are therefore never cached.
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = math_interpreter
+        while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    return math_interpreter
+
+
+def clear_parse_cache():
+    """
+    Empty the cache of parsed expressions used by `parse_expression`.
+    """
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE.clear()
+
+
 def evaluator(variables, functions, math_expr, case_sensitive=False):
     """
     Evaluate an expression; that is, take a string of math and return a float.
@@ -229,8 +290,7 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
         return float('nan')
 
     # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
+    math_interpreter = parse_expression(math_expr, case_sensitive)
 
     # Get our variables together.
     all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
@@ -258,6 +318,31 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     return math_interpreter.reduce_tree(evaluate_actions)
 
 
+def evaluate_samples(variables, functions, math_expr, num_samples, case_sensitive=False):
+    """
+    Evaluate an expression for many samples of its variables at once.
+
+    -Variables are passed as a dictionary from string to a numpy array of
+     `num_samples` values (or to a single number, shared by every sample).
+    -Unary functions are passed as a dictionary from string to function. They
+     are called once, with an array of arguments, so they must accept arrays
+     like the numpy functions do.
+
+    Return a numpy array of the `num_samples` values of the expression.
+
+    The expression is parsed (at most) once and its tree reduced once, over
+    whole arrays, rather than once per sample. Beware that numpy reports errors
+    differently than python arithmetic: e.g. dividing by zero gives `inf`
+    rather than raising `ZeroDivisionError`, and a negative number raised to a
+    fractional power gives `nan`. Callers who care about those cases should
+    fall back to `evaluator` when the result isn't finite.
+    """
+    with numpy.errstate(all='ignore'):
+        result = evaluator(variables, functions, math_expr, case_sensitive)
+    # Expressions which don't depend on any variable evaluate to a single number.
+    return numpy.ones(num_samples) * result
+
+
 class ParseAugmenter(object):
     """
     Holds the data for a particular parse.
@@ -3,6 +3,7 @@ Unit tests for calc.py
 """
 
 import unittest
+import mock
 import numpy
 import calc
 from pyparsing import ParseException
@@ -559,3 +560,78 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class ParseCacheTest(unittest.TestCase):
+    """
+    Test that expressions are only parsed once by calc.evaluator
+    """
+    def setUp(self):
+        super(ParseCacheTest, self).setUp()
+        calc.clear_parse_cache()
+        self.addCleanup(calc.clear_parse_cache)
+
+    def test_expression_parsed_once(self):
+        with mock.patch.object(calc.ParseAugmenter, 'parse_algebra', autospec=True,
+                               side_effect=calc.ParseAugmenter.parse_algebra) as mock_parse:
+            self.assertEqual(calc.evaluator({'x': 1.0}, {}, 'x+1'), 2.0)
+            self.assertEqual(calc.evaluator({'x': 2.0}, {}, 'x+1'), 3.0)
+            self.assertEqual(mock_parse.call_count, 1)
+
+            # Case sensitivity is part of the key
+            calc.evaluator({'x': 2.0}, {}, 'x+1', case_sensitive=True)
+            self.assertEqual(mock_parse.call_count, 2)
+
+    def test_cache_is_bounded(self):
+        with mock.patch('calc.calc.PARSE_CACHE_SIZE', 2):
+            for expression in ('1+1', '2+2', '3+3'):
+                calc.parse_expression(expression)
+        self.assertEqual(len(calc.calc._PARSE_CACHE), 2)  # pylint: disable=protected-access
+        self.assertNotIn(('1+1', False), calc.calc._PARSE_CACHE)  # pylint: disable=protected-access
+
+    def test_parse_errors_not_cached(self):
+        with self.assertRaises(ParseException):
+            calc.evaluator({}, {}, '1+.')
+        self.assertEqual(len(calc.calc._PARSE_CACHE), 0)  # pylint: disable=protected-access
+
+
+class EvaluateSamplesTest(unittest.TestCase):
+    """
+    Test calc.evaluate_samples against calc.evaluator
+    """
+    def assert_samples_match(self, math_expr, samples):
+        """
+        Check that evaluating `math_expr` over all of `samples` at once gives
+        the same values as evaluating it for each sample.
+        """
+        variables = {
+            var: numpy.array([sample[var] for sample in samples])
+            for var in samples[0]
+        }
+        results = calc.evaluate_samples(variables, {}, math_expr, len(samples))
+        self.assertEqual(len(results), len(samples))
+        for sample, result in zip(samples, results):
+            self.assertAlmostEqual(calc.evaluator(sample, {}, math_expr), result, delta=1e-9)
+
+    def test_matches_evaluator(self):
+        samples = [{'x': x, 'y': y} for x, y in ((1.0, 2.0), (-3.5, 0.25), (10.0, -7.0))]
+        for math_expr in ('x+y', '-x*y/2', 'x^2-y^2', 'sin(x)*cos(y)', 'sqrt(x^2)+abs(y)', 'x||y', 'j*x+y', '2k*x'):
+            self.assert_samples_match(math_expr, samples)
+
+    def test_constant_expression(self):
+        results = calc.evaluate_samples({'x': numpy.array([1.0, 2.0, 3.0])}, {}, '2*pi', 3)
+        self.assertEqual(list(results), [2 * numpy.pi] * 3)
+
+    def test_parallel_resistors_with_zero(self):
+        results = calc.evaluate_samples({'x': numpy.array([0.0, 1.0])}, {}, 'x||1', 2)
+        self.assertTrue(numpy.isnan(results[0]))
+        self.assertEqual(results[1], 0.5)
+
+    def test_division_by_zero(self):
+        results = calc.evaluate_samples({'x': numpy.array([0.0, 2.0])}, {}, '1/x', 2)
+        self.assertFalse(numpy.isfinite(results[0]))
+        self.assertEqual(results[1], 0.5)
+
+    def test_undefined_vars(self):
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'y'):
+            calc.evaluate_samples({'x': numpy.array([0.0, 2.0])}, {}, 'x+y', 2)
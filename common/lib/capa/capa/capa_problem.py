@@ -13,11 +13,14 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
+import threading
 
 from lxml import etree
 from pytz import UTC
@@ -56,8 +59,57 @@ html_problem_semantics = [
     "openendedrubric",
 ]
 
+# The maximum number of parsed problems kept by `parse_problem_text`.
+PROBLEM_TREE_CACHE_SIZE = 500
+
 log = logging.getLogger(__name__)
 
+_PROBLEM_TREE_CACHE = OrderedDict()
+_PROBLEM_TREE_CACHE_LOCK = threading.Lock()
+
+
+def parse_problem_text(problem_text):
+    """
+    Return a (problem_text, tree) pair: the problem xml, with startouttext and
+    endouttext converted to proper <text></text>, and its parsed element tree.
+
+    The same problems are parsed over and over (every time a problem is loaded,
+    for every student), so the parsed trees are cached, keyed by the hash of
+    `problem_text`. The returned tree is a copy of the cached one, which the
+    caller is free to modify.
+    """
+    if isinstance(problem_text, unicode):
+        key = hashlib.md5(problem_text.encode('utf-8')).hexdigest()
+    else:
+        key = hashlib.md5(problem_text).hexdigest()
+
+    with _PROBLEM_TREE_CACHE_LOCK:
+        cached = _PROBLEM_TREE_CACHE.pop(key, None)
+        if cached is not None:
+            # re-insert to mark this entry as the most recently used
+            _PROBLEM_TREE_CACHE[key] = cached
+            return cached[0], deepcopy(cached[1])
+
+    # Parse outside of the lock; this raises for invalid xml, which is
+    # therefore never cached.
+    problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+    problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+    tree = etree.XML(problem_text)
+
+    with _PROBLEM_TREE_CACHE_LOCK:
+        _PROBLEM_TREE_CACHE[key] = (problem_text, deepcopy(tree))
+        while len(_PROBLEM_TREE_CACHE) > PROBLEM_TREE_CACHE_SIZE:
+            _PROBLEM_TREE_CACHE.popitem(last=False)
+    return problem_text, tree
+
+
+def clear_problem_tree_cache():
+    """
+    Empty the cache of parsed problems used by `parse_problem_text`.
+    """
+    with _PROBLEM_TREE_CACHE_LOCK:
+        _PROBLEM_TREE_CACHE.clear()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -155,15 +207,12 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
-        self.problem_text = problem_text
-
+        # Convert startouttext and endouttext to proper <text></text>, and
         # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
+        self.problem_text, self.tree = parse_problem_text(problem_text)
 
-        # handle any <include file="foo"> tags
+        # handle any <include file="foo"> tags (the included files are read from this
+        # problem's filestore, so they are never part of the cached tree)
         self._process_includes()
 
         # construct script processor context (eg for customresponse problems)
@@ -624,7 +673,6 @@ class LoncapaProblem(object):
         """
         context = {}
         context['seed'] = self.seed
-        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
         all_code = ''
 
         python_path = []
@@ -647,6 +695,12 @@ class LoncapaProblem(object):
             code = unescape(script.text, XMLESC)
             all_code += code
 
+        # The script results are cached by safe_exec, keyed by the code and its globals:
+        # only give the script the student's id when it uses it, so that the results are
+        # shared by all the students with the same seed.
+        if 'anonymous_student_id' in all_code:
+            context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+
         extra_files = []
         if all_code:
             # An asset named python_lib.zip can be imported by Python code.
@@ -671,6 +725,8 @@ class LoncapaProblem(object):
                 msg = "Error while executing script code: %s" % str(err).replace('<', '&lt;')
                 raise responsetypes.LoncapaProblemError(msg)
 
+        context.setdefault('anonymous_student_id', self.capa_system.anonymous_student_id)
+
         # Store code source in context, along with the Python path needed to run it correctly.
         context['script_code'] = all_code
         context['python_path'] = python_path
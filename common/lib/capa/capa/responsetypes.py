@@ -36,7 +36,7 @@ from shapely.geometry import Point, MultiPoint
 import dogstats_wrapper as dog_stats_api
 
 # specific library imports
-from calc import evaluator, UndefinedVariable
+from calc import evaluate_samples, evaluator, UndefinedVariable
 from . import correctmap
 from .registry import TagRegistry
 from datetime import datetime
@@ -2390,6 +2390,10 @@ class FormulaResponse(LoncapaResponse):
         """
         _ = self.capa_system.i18n.ugettext
 
+        out = self.evaluate_samples(answer, var_dict_list)
+        if out is not None:
+            return out
+
         out = []
         for var_dict in var_dict_list:
             try:
@@ -2441,6 +2445,38 @@ class FormulaResponse(LoncapaResponse):
                 )
         return out
 
+    def evaluate_samples(self, answer, var_dict_list):
+        """
+        Evaluates an answer for all of the test cases in var_dict_list at once,
+        over numpy arrays of the sampled values.
+
+        Returns a list of the results, or None if the answer could not be
+        evaluated that way, or if any of the results is not finite. In that case
+        the answer has to be evaluated one test case at a time, which reports
+        errors (e.g. division by zero) exactly as the student should see them.
+        """
+        if not var_dict_list:
+            return None
+
+        variables = {
+            var: numpy.array([var_dict[var] for var_dict in var_dict_list])
+            for var in var_dict_list[0]
+        }
+        try:
+            results = evaluate_samples(
+                variables,
+                dict(),
+                answer,
+                len(var_dict_list),
+                case_sensitive=self.case_sensitive,
+            )
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+        if not numpy.all(numpy.isfinite(results)):
+            return None
+        return list(results)
+
     def randomize_variables(self, samples):
         """
         Returns a list of dictionaries mapping variables to random values in range,
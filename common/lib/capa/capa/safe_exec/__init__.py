@@ -1,3 +1,3 @@
 """Capa's specialized use of codejail.safe_exec."""
 
-from .safe_exec import safe_exec, update_hash
+from .safe_exec import safe_exec, update_hash, LOCAL_CACHE
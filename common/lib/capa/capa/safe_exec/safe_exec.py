@@ -6,7 +6,10 @@ from codejail.safe_exec import json_safe, SafeExecException
 from . import lazymod
 from dogapi import dog_stats_api
 
+from collections import OrderedDict
 import hashlib
+import json
+import threading
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -46,6 +49,80 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# The number of results kept by the in-process cache of executions.
+LOCAL_CACHE_SIZE = 1000
+
+
+class LocalCache(object):
+    """
+    A thread-safe in-process LRU cache of safe_exec results, with the same
+    .get(key) and .set(key, value) interface as the `cache` passed to safe_exec.
+
+    Values are stored serialized to JSON, so that callers never share (and
+    mutate) the same globals.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the value cached under `key`, or None.
+        """
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is None:
+                self.misses += 1
+                return None
+            # re-insert to mark this entry as the most recently used
+            self._entries[key] = value
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key, value):
+        """
+        Cache `value`, which must be JSON-serializable, under `key`.
+        """
+        if self.max_entries <= 0:
+            return
+        value = json.dumps(value)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop every cached result and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return a dict describing the effectiveness and occupancy of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+
+# Backs up the cache passed to safe_exec: it serves results which that cache
+# doesn't have, which makes caching work even where no shared cache is configured.
+LOCAL_CACHE = LocalCache(LOCAL_CACHE_SIZE)
+
 
 def update_hash(hasher, obj):
     """
@@ -99,7 +176,11 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    the random seed and the extra files.  Results are also kept in the in-process
+    `LOCAL_CACHE`, which is consulted when `cache` doesn't have them, unless `cache`
+    has a false `stores_results` attribute (like the cache used by xmodule when none
+    is configured, e.g. in Studio previews).  If `cache` is None, the execution isn't
+    cached at all.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -108,13 +189,29 @@ def safe_exec(
 
     """
     # Check the cache for a previous result.
+    local_cache = LOCAL_CACHE if getattr(cache, 'stores_results', True) else None
     if cache:
         safe_globals = json_safe(globals_dict)
         md5er = hashlib.md5()
         md5er.update(repr(code))
-        update_hash(md5er, safe_globals)
+        # json_safe has already reduced the globals to JSON types, which dump
+        # canonically (and much faster than update_hash walks them) with sorted keys.
+        md5er.update(json.dumps(safe_globals, sort_keys=True))
+        # Courses can change the files (e.g. python_lib.zip) used by the code.
+        for filename, contents in extra_files or ():
+            md5er.update(filename)
+            md5er.update(contents)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
         cached = cache.get(key)
+        if cached is not None:
+            dog_stats_api.increment('capa.safe_exec.cache', tags=[u'result:hit'])
+        elif local_cache is not None:
+            cached = local_cache.get(key)
+            if cached is not None:
+                dog_stats_api.increment('capa.safe_exec.cache', tags=[u'result:local_hit'])
+                cache.set(key, cached)
+        if cached is None:
+            dog_stats_api.increment('capa.safe_exec.cache', tags=[u'result:miss'])
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -135,10 +232,11 @@ def safe_exec(
 
     # Run the code!  Results are side effects in globals_dict.
     try:
-        exec_fn(
-            code_prolog + LAZY_IMPORTS + code, globals_dict,
-            python_path=python_path, extra_files=extra_files, slug=slug,
-        )
+        with dog_stats_api.timer('capa.safe_exec.sandbox_time', tags=[u'unsafely:{}'.format(bool(unsafely))]):
+            exec_fn(
+                code_prolog + LAZY_IMPORTS + code, globals_dict,
+                python_path=python_path, extra_files=extra_files, slug=slug,
+            )
     except SafeExecException as e:
         emsg = e.message
     else:
@@ -149,6 +247,8 @@ def safe_exec(
     if cache:
         cleaned_results = json_safe(globals_dict)
         cache.set(key, (emsg, cleaned_results))
+        if local_cache is not None:
+            local_cache.set(key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
     if emsg:
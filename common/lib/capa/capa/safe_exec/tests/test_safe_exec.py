@@ -9,7 +9,8 @@ import unittest
 
 from nose.plugins.skip import SkipTest
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import safe_exec, update_hash, LOCAL_CACHE
+from capa.safe_exec.safe_exec import LocalCache
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -110,6 +111,11 @@ class DictCache(object):
 class TestSafeExecCaching(unittest.TestCase):
     """Test that caching works on safe_exec."""
 
+    def setUp(self):
+        super(TestSafeExecCaching, self).setUp()
+        LOCAL_CACHE.clear()
+        self.addCleanup(LOCAL_CACHE.clear)
+
     def test_cache_miss_then_hit(self):
         g = {}
         cache = {}
@@ -176,6 +182,86 @@ class TestSafeExecCaching(unittest.TestCase):
             except UnicodeEncodeError:
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
+    def test_local_cache_backs_up_cache(self):
+        # A cache which never has anything, like the one used where no cache is configured.
+        class NoCache(object):
+            def get(self, key):
+                return None
+
+            def set(self, key, value):
+                pass
+
+        g = {}
+        safe_exec("a = int(math.pi)", g, random_seed=17, cache=NoCache())
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(LOCAL_CACHE.stats()['entries'], 1)
+
+        # The result is served from the local cache, and copied into the given cache.
+        cache = {}
+        g = {}
+        safe_exec("a = int(math.pi)", g, random_seed=17, cache=DictCache(cache))
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(LOCAL_CACHE.stats()['hits'], 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_no_cache(self):
+        safe_exec("a = int(math.pi)", {})
+        self.assertEqual(LOCAL_CACHE.stats()['entries'], 0)
+
+    def test_local_cache_bypassed_for_disabled_cache(self):
+        # Like the cache used by xmodule when no cache is configured, e.g. for Studio previews.
+        class DisabledCache(object):
+            stores_results = False
+
+            def get(self, key):
+                return None
+
+            def set(self, key, value):
+                pass
+
+        safe_exec("a = int(math.pi)", {}, cache=DisabledCache())
+        stats = LOCAL_CACHE.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (0, 0, 0))
+
+    def test_extra_files_in_key(self):
+        cache = {}
+        for version in (1, 2):
+            safe_exec("a = 17", {}, extra_files=[("python_lib.zip", "version %d" % version)], cache=DictCache(cache))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(LOCAL_CACHE.stats()['entries'], 2)
+
+
+class TestLocalCache(unittest.TestCase):
+    """Test the in-process cache of safe_exec results."""
+
+    def test_values_are_not_shared(self):
+        cache = LocalCache(10)
+        cache.set('a', [None, {'l': [1, 2]}])
+        cache.get('a')[1]['l'].append(3)
+        self.assertEqual(cache.get('a'), [None, {'l': [1, 2]}])
+
+    def test_evicts_least_recently_used(self):
+        cache = LocalCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_stats(self):
+        cache = LocalCache(2)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 1, 'max_entries': 2})
+
+    def test_disabled(self):
+        cache = LocalCache(0)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
 
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
@@ -0,0 +1,93 @@
+"""
+Tests for the caching done when constructing a LoncapaProblem.
+"""
+import textwrap
+import unittest
+
+import mock
+
+from capa import capa_problem
+from . import new_loncapa_problem, test_capa_system
+
+
+class ProblemTreeCacheTest(unittest.TestCase):
+    """
+    Tests for the cache of parsed problems.
+    """
+    def setUp(self):
+        super(ProblemTreeCacheTest, self).setUp()
+        capa_problem.clear_problem_tree_cache()
+        self.addCleanup(capa_problem.clear_problem_tree_cache)
+
+    def test_problem_parsed_once(self):
+        xml_str = "<problem><p>startouttext/What is 1 + 1?endouttext/</p></problem>"
+        with mock.patch('capa.capa_problem.etree.XML', wraps=capa_problem.etree.XML) as parse_xml:
+            first_problem = new_loncapa_problem(xml_str)
+            second_problem = new_loncapa_problem(xml_str)
+        self.assertEqual(parse_xml.call_count, 1)
+        self.assertEqual(first_problem.problem_text, second_problem.problem_text)
+        self.assertIn("<text>What is 1 + 1?</text>", second_problem.problem_text)
+
+        # Each problem gets its own copy of the tree
+        self.assertIsNot(first_problem.tree, second_problem.tree)
+        first_problem.tree.find('p').text = 'Changed'
+        self.assertNotEqual(new_loncapa_problem(xml_str).tree.find('p').text, 'Changed')
+
+    def test_invalid_problem_not_cached(self):
+        for __ in range(2):
+            with self.assertRaises(Exception):
+                new_loncapa_problem("<problem><p></problem>")
+        self.assertEqual(len(capa_problem._PROBLEM_TREE_CACHE), 0)  # pylint: disable=protected-access
+
+    def test_cache_size_bounded(self):
+        with mock.patch('capa.capa_problem.PROBLEM_TREE_CACHE_SIZE', 2):
+            for index in range(3):
+                new_loncapa_problem("<problem><p>{}</p></problem>".format(index))
+        self.assertEqual(len(capa_problem._PROBLEM_TREE_CACHE), 2)  # pylint: disable=protected-access
+
+
+class ScriptContextTest(unittest.TestCase):
+    """
+    Tests for the context extracted from the problem scripts.
+    """
+    def _problem_xml(self, script):
+        """
+        Return the xml of a problem running the given script.
+        """
+        return textwrap.dedent("""
+            <problem>
+                <script type="loncapa/python">
+            {}
+                </script>
+            </problem>
+        """).format(script)
+
+    def _extract_context(self, script, anonymous_student_id):
+        """
+        Construct a problem with the given script for a student, and return the globals
+        given to safe_exec and the problem's context.
+        """
+        capa_system = test_capa_system()
+        capa_system.anonymous_student_id = anonymous_student_id
+        script_globals = {}
+
+        def record_globals(code, globals_dict, **kwargs):  # pylint: disable=unused-argument
+            """
+            Record a copy of the globals given to safe_exec.
+            """
+            script_globals.update(globals_dict)
+
+        with mock.patch('capa.capa_problem.safe_exec', side_effect=record_globals):
+            problem = new_loncapa_problem(self._problem_xml(script), capa_system=capa_system)
+        return script_globals, problem.context
+
+    def test_student_id_not_given_to_unrelated_scripts(self):
+        script_globals, context = self._extract_context("answer = 42", 'student_1')
+        self.assertNotIn('anonymous_student_id', script_globals)
+        self.assertEqual(context['anonymous_student_id'], 'student_1')
+        self.assertEqual(context['seed'], 723)
+
+    def test_student_id_given_to_scripts_using_it(self):
+        script_globals, context = self._extract_context("answer = anonymous_student_id", 'student_1')
+        self.assertEqual(script_globals['anonymous_student_id'], 'student_1')
+        self.assertEqual(context['anonymous_student_id'], 'student_1')
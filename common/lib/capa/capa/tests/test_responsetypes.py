@@ -529,6 +529,33 @@ class FormulaResponseTest(ResponseTest):
         self.assertTrue(problem.responders.values()[0].validate_answer('14*x'))
         self.assertFalse(problem.responders.values()[0].validate_answer('3*y+2*x'))
 
+    def test_samples_evaluated_at_once(self):
+        """
+        Test that the formulae are evaluated over all the samples at once.
+        """
+        sample_dict = {'x': (-10, 10), 'y': (-10, 10)}
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=10,
+                                     tolerance=0.01,
+                                     answer="x+2*y")
+        with mock.patch('capa.responsetypes.evaluator') as mock_evaluator:
+            self.assert_grade(problem, "2*x - x + y + y", "correct")
+            self.assert_grade(problem, "x + y", "incorrect")
+        self.assertFalse(mock_evaluator.called)
+
+    def test_zero_division_in_sample_raises_error(self):
+        """
+        Test that division by zero for some of the samples is reported as it is
+        when the samples are evaluated one at a time.
+        """
+        sample_dict = {'x': (1, 2)}
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=10,
+                                     tolerance="1%",
+                                     answer="x")
+        input_dict = {'1_2_1': '1/(x-x)'}
+        self.assertRaises(StudentInputError, problem.grade_answers, input_dict)
+
 
 class StringResponseTest(ResponseTest):
     xml_factory_class = StringResponseXMLFactory
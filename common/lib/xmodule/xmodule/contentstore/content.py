@@ -157,6 +157,12 @@ class StaticContent(object):
     def stream_data(self):
         yield self._data
 
+    def stream_data_in_range(self, first_byte, last_byte):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        yield self._data[first_byte:last_byte + 1]
+
     @staticmethod
     def serialize_asset_key_with_slash(asset_key):
         """
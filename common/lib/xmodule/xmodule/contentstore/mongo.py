@@ -1,3 +1,7 @@
+import errno
+import hashlib
+from multiprocessing.pool import ThreadPool
+
 import pymongo
 import gridfs
 from gridfs.errors import NoFile
@@ -131,44 +135,90 @@ class MongoContentStore(ContentStore):
             output_directory = output_directory + '/' + os.path.dirname(content.import_path)
 
         if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
+            try:
+                os.makedirs(output_directory)
+            except OSError as exc:
+                # Another thread exporting assets to the same directory may have created it
+                if exc.errno != errno.EEXIST:
+                    raise
 
         disk_fs = OSFS(output_directory)
 
         with disk_fs.open(content.name, 'wb') as asset_file:
             asset_file.write(content.data)
 
-    def export_all_for_course(self, course_key, output_directory, assets_policy_file):
+    def export_all_for_course(self, course_key, output_directory, assets_policy_file, workers=1):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
         attributes to the policy file.
 
+        Assets already exported to the output_directory with the same content, as found by
+        comparing their md5, are left untouched rather than being read from the database again.
+
         Args:
             course_key (CourseKey): the :class:`CourseKey` identifying the course
             output_directory: the directory under which to put all the asset files
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
+            workers: the number of assets written at the same time
         """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
+        assets_to_export = []
         for asset in assets:
-            # TODO: On 6/19/14, I had to put a try/except around this
-            # to export a course. The course failed on JSON files in
-            # the /static/ directory placed in it with an import.
-            #
-            # If this hasn't been looked at in a while, remove this comment.
-            #
-            # When debugging course exports, this might be a good place
-            # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
+            if not self._is_exported(asset, output_directory):
+                assets_to_export.append(asset['asset_key'])
             for attr, value in asset.iteritems():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].name, {})[attr] = value
 
+        # TODO: On 6/19/14, I had to put a try/except around this
+        # to export a course. The course failed on JSON files in
+        # the /static/ directory placed in it with an import.
+        #
+        # If this hasn't been looked at in a while, remove this comment.
+        #
+        # When debugging course exports, this might be a good place
+        # to look. -- pmitros
+        if workers > 1 and len(assets_to_export) > 1:
+            pool = ThreadPool(min(workers, len(assets_to_export)))
+            try:
+                results = [
+                    pool.apply_async(self.export, (asset_key, output_directory))
+                    for asset_key in assets_to_export
+                ]
+                for result in results:
+                    # Re-raises any exception raised while exporting the asset
+                    result.get()
+            finally:
+                pool.terminate()
+        else:
+            for asset_key in assets_to_export:
+                self.export(asset_key, output_directory)
+
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
+    @staticmethod
+    def _is_exported(asset, output_directory):
+        """
+        Returns whether the file `export` would write for the asset, described by its asset
+        data dictionary, already exists in the output_directory with the same content.
+        """
+        import_path = asset.get('import_path')
+        if import_path is not None:
+            output_directory = output_directory + '/' + os.path.dirname(import_path)
+        filepath = os.path.join(output_directory, asset.get('displayname', asset['asset_key'].name))
+
+        if 'md5' not in asset or not os.path.isfile(filepath):
+            return False
+        file_md5 = hashlib.md5()
+        with open(filepath, 'rb') as exported_file:
+            for chunk in iter(lambda: exported_file.read(1024 * 1024), b''):
+                file_md5.update(chunk)
+        return file_md5.hexdigest() == asset['md5']
+
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
@@ -23,6 +23,7 @@ import django.utils
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.draft_and_published import BranchSettingMixin
 from xmodule.modulestore.mixed import MixedModuleStore
+from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.util.django import get_current_request_hostname
 import xblock.reference.plugins
 
@@ -80,10 +81,12 @@ class SignalHandler(object):
 
     """
     course_published = django.dispatch.Signal(providing_args=["course_key"])
+    course_deleted = django.dispatch.Signal(providing_args=["course_key"])
     library_updated = django.dispatch.Signal(providing_args=["library_key"])
 
     _mapping = {
         "course_published": course_published,
+        "course_deleted": course_deleted,
         "library_updated": library_updated
     }
 
@@ -151,6 +154,9 @@ def create_modulestore_instance(
     if issubclass(class_, BranchSettingMixin):
         _options['branch_setting_func'] = _get_modulestore_branch_setting
 
+    if issubclass(class_, SplitMongoModuleStore):
+        _options.setdefault('structure_cache_size', getattr(settings, 'SPLIT_STRUCTURE_CACHE_SIZE', None))
+
     if HAS_USER_SERVICE and not user_service:
         xb_user_service = DjangoXBlockUserService(get_current_user())
     else:
@@ -241,7 +241,11 @@ class InheritingFieldData(KvsFieldData):
         """
         The default for an inheritable name is found on a parent.
         """
-        if name in self.inheritable_names:
+        if name in self.inheritable_names and getattr(self._kvs, 'inherited_settings_computed', False):
+            # The kvs already knows the value set by the nearest ancestor which sets this field
+            if name in self._kvs.inherited_settings:
+                return self._kvs.inherited_settings[name]
+        elif name in self.inheritable_names:
             # Walk up the content tree to find the first ancestor
             # that this field is set on. Use the field from the current
             # block so that if it has a different default than the root
@@ -368,7 +368,11 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         """
         assert isinstance(course_key, CourseKey)
         store = self._get_modulestore_for_courselike(course_key)
-        return store.delete_course(course_key, user_id)
+        result = store.delete_course(course_key, user_id)
+        signal_handler = getattr(store, 'signal_handler', None)
+        if signal_handler:
+            signal_handler.send("course_deleted", course_key=course_key)
+        return result
 
     @contract(asset_metadata='AssetMetadata', user_id='int|long', import_only=bool)
     def save_asset_metadata(self, asset_metadata, user_id, import_only=False):
@@ -1,6 +1,7 @@
 ''' useful functions for finding content and its position '''
 from logging import getLogger
 
+from xmodule.modulestore import ModuleStoreEnum
 from .exceptions import (ItemNotFoundError, NoPathToItem)
 
 LOGGER = getLogger(__name__)
@@ -112,6 +113,71 @@ def path_to_location(modulestore, usage_key):
         return (course_id, chapter, section, position)
 
 
+def build_path_index(modulestore, course_key):
+    '''
+    Find the path_to_location of every block in the course at once, walking
+    the course tree down from the course rather than up from each block.
+
+    Only the published blocks are walked, whatever the branch setting of the
+    store, so the positions are those seen by students even when the index is
+    built in Studio.
+
+    Args:
+        modulestore: which store holds the course
+        course_key: :class:`CourseKey` the id of the course
+
+    Raises
+        ItemNotFoundError if the course doesn't exist.
+
+    Returns:
+        a dict mapping the `path_index_key` of the usage key of every block in
+        the course to a (chapter, section, position) tuple, as returned by
+        path_to_location.
+    '''
+    with modulestore.bulk_operations(course_key), \
+            modulestore.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+        course = modulestore.get_course(course_key, depth=None)
+        if course is None:
+            raise ItemNotFoundError(course_key)
+
+        path_index = {}
+        # The stack holds tuples (block, path, position_list), where path is
+        # the list of the names of the blocks from the chapter to the block.
+        stack = [(course, [], [])]
+        while stack:
+            block, path, position_list = stack.pop()
+            key = path_index_key(block.location)
+            if key in path_index:
+                # Already found through another parent
+                continue
+
+            n = len(path) + 1
+            chapter = path[0] if n > 1 else None
+            section = path[1] if n > 2 else None
+            position = "_".join(position_list) if n > 3 else None
+            path_index[key] = (chapter, section, position)
+
+            if block.has_children:
+                children = block.get_children()
+                is_positional = n > 2 and block.location.block_type in ('sequential', 'videosequence')
+                # Push the children in reverse, so that the first parent of a
+                # block found by the walk is the first one in course order.
+                for index in reversed(xrange(len(children))):
+                    child = children[index]
+                    child_positions = position_list + [str(index + 1)] if is_positional else position_list
+                    stack.append((child, path + [child.location.name], child_positions))
+
+    return path_index
+
+
+def path_index_key(usage_key):
+    '''
+    Returns the key of the `usage_key` in the dicts returned by
+    build_path_index, without branch or version information.
+    '''
+    return unicode(usage_key.for_branch(None).version_agnostic())
+
+
 def navigation_index(position):
     """
     Get the navigation index from the position argument (where the position argument was recieved from a call to
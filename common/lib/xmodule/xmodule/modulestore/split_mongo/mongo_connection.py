@@ -12,6 +12,7 @@ from contracts import check, new_contract
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_cache import get_structure_cache, structure_size
 import datetime
 import pytz
 
@@ -76,10 +77,14 @@ class MongoConnection(object):
     """
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
-        asset_collection=None, retry_wait_time=0.1, **kwargs
+        asset_collection=None, retry_wait_time=0.1, structure_cache_size=None, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        Arguments:
+            structure_cache_size (int): if not None, the maximum size in bytes of the process-wide
+                cache of decoded structures (0 disables it).
         """
         self.database = MongoProxy(
             pymongo.database.Database(
@@ -109,6 +114,8 @@ class MongoConnection(object):
         self.structures.write_concern = {'w': 1}
         self.definitions.write_concern = {'w': 1}
 
+        self.structure_cache = get_structure_cache(structure_cache_size)
+
     def heartbeat(self):
         """
         Check that the db is reachable.
@@ -118,11 +125,36 @@ class MongoConnection(object):
         else:
             raise HeartbeatFailure("Can't connect to {}".format(self.database.name))
 
+    def _structure_from_mongo(self, structure, check_cache=True):
+        """
+        Convert the raw ``structure`` document read from mongo, reusing the already converted
+        copy from the structure cache if there is one, and caching the converted structure otherwise.
+
+        Arguments:
+            check_cache (bool): False if the caller has already looked this structure up in the cache
+        """
+        if not self.structure_cache.enabled:
+            return structure_from_mongo(structure)
+
+        if check_cache:
+            cached = self.structure_cache.get(structure['_id'])
+            if cached is not None:
+                return cached
+
+        size = structure_size(structure)
+        structure = structure_from_mongo(structure)
+        self.structure_cache.set(structure['_id'], structure, size)
+        return structure
+
     def get_structure(self, key):
         """
         Get the structure from the persistence mechanism whose id is the given key
         """
-        return structure_from_mongo(self.structures.find_one({'_id': key}))
+        if self.structure_cache.enabled:
+            structure = self.structure_cache.get(key)
+            if structure is not None:
+                return structure
+        return self._structure_from_mongo(self.structures.find_one({'_id': key}), check_cache=False)
 
     @autoretry_read()
     def find_structures_by_id(self, ids):
@@ -132,7 +164,24 @@ class MongoConnection(object):
         Arguments:
             ids (list): A list of structure ids
         """
-        return [structure_from_mongo(structure) for structure in self.structures.find({'_id': {'$in': ids}})]
+        structures = []
+        if self.structure_cache.enabled:
+            missing_ids = []
+            for structure_id in ids:
+                structure = self.structure_cache.get(structure_id)
+                if structure is None:
+                    missing_ids.append(structure_id)
+                else:
+                    structures.append(structure)
+            ids = missing_ids
+            if not ids:
+                return structures
+
+        structures.extend(
+            self._structure_from_mongo(structure, check_cache=False)
+            for structure in self.structures.find({'_id': {'$in': ids}})
+        )
+        return structures
 
     @autoretry_read()
     def find_structures_derived_from(self, ids):
@@ -142,7 +191,10 @@ class MongoConnection(object):
         Arguments:
             ids (list): A list of structure ids
         """
-        return [structure_from_mongo(structure) for structure in self.structures.find({'previous_version': {'$in': ids}})]
+        return [
+            self._structure_from_mongo(structure)
+            for structure in self.structures.find({'previous_version': {'$in': ids}})
+        ]
 
     @autoretry_read()
     def find_ancestor_structures(self, original_version, block_key):
@@ -154,7 +206,7 @@ class MongoConnection(object):
             block_key (BlockKey): The id of the block in question
         """
         return [
-            structure_from_mongo(structure)
+            self._structure_from_mongo(structure)
             for structure in self.structures.find({
                 'original_version': original_version,
                 'blocks': {
@@ -636,14 +636,16 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, structure_cache_size=None, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param structure_cache_size: the maximum size in bytes of the process-wide cache of structures
+            shared by all split modulestores (0 disables it; None leaves it unchanged).
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
 
-        self.db_connection = MongoConnection(**doc_store_config)
+        self.db_connection = MongoConnection(structure_cache_size=structure_cache_size, **doc_store_config)
         self.db = self.db_connection.database
 
         if default_class is not None:
@@ -728,12 +730,18 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 definitions = {definition['_id']: definition
                                for definition in descendent_definitions}
 
-                for block in new_module_data.itervalues():
+                for block_key, block in new_module_data.items():
                     if block.definition in definitions:
                         definition = definitions[block.definition]
+                        # The block belongs to the structure, which may be shared through the
+                        # structure cache: merge the definition fields into a copy of it, so that
+                        # they don't end up in the structure (and in any new version of it).
+                        block = copy.copy(block)
                         # convert_fields gets done later in the runtime's xblock_from_json
+                        block.fields = dict(block.fields)
                         block.fields.update(definition.get('fields'))
                         block.definition_loaded = True
+                        new_module_data[block_key] = block
 
             system.module_data.update(new_module_data)
             return system.module_data
@@ -2429,7 +2437,33 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         # in case the course is later restored.
         # super(SplitMongoModuleStore, self).delete_course(course_key, user_id)
 
-    @contract(block_map="dict(BlockKey: dict)", block_key=BlockKey)
+    def get_inherited_settings_map(self, course_key, structure):
+        """
+        Return a dict mapping each block in `structure` to the inheritable settings it gets from
+        its ancestors (i.e., the value set by the nearest ancestor which sets each one), or None if
+        `structure` may still change because it's being edited in the current bulk operation.
+
+        Persisted structures never change, so the map is cached in the metadata inheritance cache
+        keyed by the structure's version guid. That saves every block loaded from the structure
+        from walking up its parent chain to find each inherited value.
+        """
+        structure_id = structure['_id']
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if bulk_write_record.active and structure_id not in bulk_write_record.structures_in_db:
+            return None
+
+        cache = self.metadata_inheritance_cache_subsystem
+        cache_key = u'split_inheritance.{}'.format(structure_id)
+        inherited_settings_map = cache.get(cache_key) if cache is not None else None
+        if inherited_settings_map is None:
+            inherited_settings_map = {}
+            if structure.get('root') is not None:
+                self.inherit_settings(structure['blocks'], BlockKey(*structure['root']), inherited_settings_map)
+            if cache is not None:
+                cache.set(cache_key, inherited_settings_map)
+        return inherited_settings_map
+
+    @contract(block_map="dict(BlockKey: BlockData)", block_key=BlockKey)
     def inherit_settings(
         self, block_map, block_key, inherited_settings_map, inheriting_settings=None, inherited_from=None
     ):
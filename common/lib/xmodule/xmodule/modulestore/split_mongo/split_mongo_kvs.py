@@ -21,16 +21,22 @@ class SplitMongoKVS(InheritanceKeyValueStore):
     VALID_SCOPES = (Scope.parent, Scope.children, Scope.settings, Scope.content)
 
     @contract(parent="BlockUsageLocator | None")
-    def __init__(self, definition, initial_values, default_values, parent, field_decorator=None):
+    def __init__(
+            self, definition, initial_values, default_values, parent, field_decorator=None, inherited_settings=None
+    ):
         """
 
         :param definition: either a lazyloader or definition id for the definition
         :param initial_values: a dictionary of the locally set values
         :param default_values: any Scope.settings field defaults that are set locally
             (copied from a template block with copy_from_template)
+        :param inherited_settings: the inheritable settings set by this block's ancestors,
+            if precomputed for the whole structure; otherwise, they're found by walking up the parents
         """
         # deepcopy so that manipulations of fields does not pollute the source
-        super(SplitMongoKVS, self).__init__(copy.deepcopy(initial_values))
+        super(SplitMongoKVS, self).__init__(copy.deepcopy(initial_values), inherited_settings)
+        # whether inherited_settings holds every value inherited from the ancestors
+        self.inherited_settings_computed = inherited_settings is not None
         self._definition = definition  # either a DefinitionLazyLoader or the db id of the definition.
         # if the db id, then the definition is presumed to be loaded into _fields
 
@@ -0,0 +1,138 @@
+"""
+A process-wide cache of decoded split modulestore structures.
+
+Structure documents are immutable once they have been written: every change to a
+course produces a new structure with a new version guid. That makes the version guid
+a safe cache key for the lifetime of the process, so the (potentially multi-megabyte)
+BSON decode and ``structure_from_mongo`` conversion only needs to happen once per
+structure per process rather than once per request.
+
+The cache is bounded by the approximate size (in bytes) of the cached documents rather
+than by the number of entries, since structures vary in size by orders of magnitude
+between a small library and a large course.
+
+N.B. Structures handed out by this cache are shared between callers. Like the structures
+cached in the request cache, they must never be edited in place; code which modifies a
+structure must first copy it via ``SplitMongoModuleStore.version_structure``.
+"""
+from collections import OrderedDict
+import threading
+
+from bson import BSON
+
+
+class StructureCache(object):
+    """
+    A thread-safe LRU cache of structures keyed by version guid, bounded by total size in bytes.
+
+    A ``max_size`` of 0 disables the cache: nothing is ever stored and every lookup is a miss.
+    """
+    def __init__(self, max_size=0):
+        self.max_size = max_size
+        self.current_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # version_guid -> (structure, size)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """
+        Whether this cache stores anything at all.
+        """
+        return self.max_size > 0
+
+    def get(self, version_guid):
+        """
+        Return the cached structure for ``version_guid``, or None if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.pop(version_guid, None)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            # re-insert to mark this entry as the most recently used
+            self._entries[version_guid] = entry
+            self.hits += 1
+            return entry[0]
+
+    def set(self, version_guid, structure, size):
+        """
+        Cache ``structure`` under ``version_guid``, evicting least recently used entries
+        until the cache fits within ``max_size`` bytes.
+
+        Structures larger than the whole cache are not stored.
+        """
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(version_guid, None)
+            if previous is not None:
+                self.current_size -= previous[1]
+
+            while self._entries and self.current_size + size > self.max_size:
+                __, (__, evicted_size) = self._entries.popitem(last=False)
+                self.current_size -= evicted_size
+                self.evictions += 1
+
+            self._entries[version_guid] = (structure, size)
+            self.current_size += size
+
+    def clear(self):
+        """
+        Drop every cached structure and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __contains__(self, version_guid):
+        return version_guid in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Return a dict describing the effectiveness and current occupancy of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'size': self.current_size,
+                'max_size': self.max_size,
+            }
+
+
+def structure_size(structure):
+    """
+    Return the size in bytes of the raw (not yet decoded) structure document ``structure``.
+    """
+    return len(BSON.encode(structure))
+
+
+# The single cache shared by every MongoConnection in this process
+_STRUCTURE_CACHE = StructureCache()
+
+
+def get_structure_cache(max_size=None):
+    """
+    Return the process-wide structure cache.
+
+    If ``max_size`` is given, it (re)configures the maximum size of the cache in bytes. Shrinking
+    the cache evicts entries lazily, on the next insertion.
+    """
+    if max_size is not None:
+        _STRUCTURE_CACHE.max_size = max_size
+    return _STRUCTURE_CACHE
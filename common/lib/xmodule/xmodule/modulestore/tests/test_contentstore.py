@@ -16,6 +16,7 @@ from xmodule.contentstore.mongo import MongoContentStore
 from xmodule.contentstore.content import StaticContent
 from xmodule.exceptions import NotFoundError
 import ddt
+from mock import patch
 from __builtin__ import delattr
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 
@@ -146,6 +147,41 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_export_unchanged_assets_skipped(self, deprecated):
+        """
+        Test that exporting again only rewrites the assets which changed
+        """
+        self.set_up_assets(deprecated)
+        root_dir = path.path(mkdtemp())
+        self.addCleanup(shutil.rmtree, root_dir)
+        self.contentstore.export_all_for_course(self.course1_key, root_dir, root_dir / "policy.json", workers=2)
+
+        # Alter one of the exported files
+        changed_file = path.path(root_dir / self.course1_files[0])
+        changed_file.write_bytes('changed')
+
+        with patch.object(self.contentstore, 'export', wraps=self.contentstore.export) as export:
+            self.contentstore.export_all_for_course(self.course1_key, root_dir, root_dir / "policy.json", workers=2)
+        export.assert_called_once_with(
+            self.course1_key.make_asset_key('asset', self.course1_files[0]), root_dir
+        )
+        with open("{}/static/{}".format(DATA_DIR, self.course1_files[0]), "rb") as original_file:
+            self.assertEqual(changed_file.bytes(), original_file.read())
+
+    @ddt.data(True, False)
+    def test_export_to_concurrently_created_directory(self, deprecated):
+        """
+        Test that export doesn't fail when another thread creates the asset's directory first
+        """
+        self.set_up_assets(deprecated)
+        root_dir = path.path(mkdtemp())
+        self.addCleanup(shutil.rmtree, root_dir)
+        asset_key = self.course1_key.make_asset_key('asset', self.course1_files[0])
+        with patch('xmodule.contentstore.mongo.os.path.exists', return_value=False):
+            self.contentstore.export(asset_key, root_dir)
+        self.assertTrue(path.path(root_dir / self.course1_files[0]).isfile())
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
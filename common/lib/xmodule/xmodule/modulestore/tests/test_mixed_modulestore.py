@@ -44,7 +44,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.draft_and_published import UnsupportedRevisionError, DIRECT_ONLY_CATEGORIES
 from xmodule.modulestore.exceptions import ItemNotFoundError, DuplicateCourseError, ReferentialIntegrityError, NoPathToItem
 from xmodule.modulestore.mixed import MixedModuleStore
-from xmodule.modulestore.search import path_to_location, navigation_index
+from xmodule.modulestore.search import path_to_location, navigation_index, build_path_index, path_index_key
 from xmodule.modulestore.tests.factories import check_mongo_calls, check_exact_number_of_calls, \
     mongo_uses_error_check
 from xmodule.modulestore.tests.utils import create_modulestore_instance, LocationMixin
@@ -1139,6 +1139,34 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
         with self.assertRaises(NoPathToItem):
             path_to_location(self.store, orphan)
 
+    @ddt.data('draft', 'split')
+    def test_build_path_index(self, default_ms):
+        """
+        Make sure that build_path_index finds the same paths as path_to_location
+        """
+        self.initdb(default_ms)
+
+        course_key = self.course_locations[self.MONGO_COURSEID].course_key
+        with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+            self._create_block_hierarchy()
+            path_index = build_path_index(self.store, course_key)
+
+            self.assertEqual(
+                path_index[path_index_key(self.problem_x1a_2)],
+                (u"Chapter_x", u"Sequential_x1", '1')
+            )
+            self.assertEqual(path_index[path_index_key(self.chapter_x)], ("Chapter_x", None, None))
+            for item in self.store.get_items(course_key):
+                # Blocks not in the course tree, like static tabs, have no path
+                if path_index_key(item.location) in path_index:
+                    self.assertEqual(
+                        (course_key,) + path_index[path_index_key(item.location)],
+                        path_to_location(self.store, item.location)
+                    )
+
+        with self.assertRaises(ItemNotFoundError):
+            build_path_index(self.store, course_key.replace(course='NotHome'))
+
     def test_xml_path_to_location(self):
         """
         Make sure that path_to_location works: should be passed a modulestore
@@ -0,0 +1,121 @@
+"""
+Tests for the split modulestore's cache of inherited settings.
+"""
+import unittest
+
+from bson.objectid import ObjectId
+from mock import Mock
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.inheritance import InheritingFieldData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS
+from xmodule.modulestore.tests.test_cross_modulestore_import_export import MemoryCache
+
+COURSE = BlockKey('course', 'course')
+CHAPTER = BlockKey('chapter', 'chapter')
+SEQUENTIAL = BlockKey('sequential', 'sequential')
+PROBLEM = BlockKey('problem', 'problem')
+
+
+def make_structure():
+    """
+    Return a course -> chapter -> sequential -> problem structure with inheritable settings at two levels.
+    """
+    return {
+        '_id': ObjectId(),
+        'root': COURSE,
+        'blocks': {
+            COURSE: BlockData(block_type='course', fields={'children': [CHAPTER], 'graceperiod': '1 day'}),
+            CHAPTER: BlockData(block_type='chapter', fields={'children': [SEQUENTIAL], 'due': '2015-01-01T00:00'}),
+            SEQUENTIAL: BlockData(
+                block_type='sequential', fields={'children': [PROBLEM], 'due': '2015-02-01T00:00'}
+            ),
+            PROBLEM: BlockData(block_type='problem', fields={}),
+        },
+    }
+
+
+class TestInheritedSettingsMap(unittest.TestCase):
+    """
+    Tests of SplitMongoModuleStore.get_inherited_settings_map.
+    """
+    def setUp(self):
+        super(TestInheritedSettingsMap, self).setUp()
+        # Bypass __init__ so that no real mongo connection is needed
+        self.store = SplitMongoModuleStore.__new__(SplitMongoModuleStore)
+        self.store.metadata_inheritance_cache_subsystem = MemoryCache()
+        self.bulk_write_record = Mock(active=False, structures_in_db=set())
+        self.store._get_bulk_ops_record = Mock(return_value=self.bulk_write_record)  # pylint: disable=protected-access
+        self.course_key = Mock()
+        self.structure = make_structure()
+
+    def test_nearest_ancestor_wins(self):
+        inherited_settings_map = self.store.get_inherited_settings_map(self.course_key, self.structure)
+        self.assertEqual(inherited_settings_map[COURSE], {})
+        self.assertEqual(inherited_settings_map[CHAPTER], {'graceperiod': '1 day'})
+        self.assertEqual(
+            inherited_settings_map[PROBLEM],
+            {'graceperiod': '1 day', 'due': '2015-02-01T00:00'},
+        )
+
+    def test_cached_by_version_guid(self):
+        first = self.store.get_inherited_settings_map(self.course_key, self.structure)
+        # Were the tree computed again, the changed field would show up
+        self.structure['blocks'][COURSE].fields['graceperiod'] = '2 days'
+        second = self.store.get_inherited_settings_map(self.course_key, self.structure)
+        self.assertEqual(first, second)
+
+        other_version = make_structure()
+        other_version['blocks'][COURSE].fields['graceperiod'] = '2 days'
+        third = self.store.get_inherited_settings_map(self.course_key, other_version)
+        self.assertEqual(third[PROBLEM]['graceperiod'], '2 days')
+
+    def test_no_cache_configured(self):
+        self.store.metadata_inheritance_cache_subsystem = None
+        inherited_settings_map = self.store.get_inherited_settings_map(self.course_key, self.structure)
+        self.assertEqual(inherited_settings_map[SEQUENTIAL]['due'], '2015-01-01T00:00')
+
+    def test_structure_being_edited(self):
+        self.bulk_write_record.active = True
+        self.assertIsNone(self.store.get_inherited_settings_map(self.course_key, self.structure))
+
+        # a structure read from the db during the bulk operation doesn't change
+        self.bulk_write_record.structures_in_db.add(self.structure['_id'])
+        self.assertIsNotNone(self.store.get_inherited_settings_map(self.course_key, self.structure))
+
+
+class TestInheritingFieldDataWithComputedSettings(unittest.TestCase):
+    """
+    Tests that InheritingFieldData uses precomputed inherited settings rather than walking up the parents.
+    """
+    def setUp(self):
+        super(TestInheritingFieldDataWithComputedSettings, self).setUp()
+        self.block = Mock()
+        self.block.get_parent.side_effect = AssertionError('the parents should not be walked')
+
+    def field_data(self, inherited_settings, default_values=None):
+        """
+        Return an InheritingFieldData over a SplitMongoKVS with the given precomputed inherited settings.
+        """
+        kvs = SplitMongoKVS(None, {}, default_values or {}, parent=None, inherited_settings=inherited_settings)
+        return InheritingFieldData(inheritable_names=['due', 'graceperiod'], kvs=kvs)
+
+    def test_inherited_value(self):
+        field_data = self.field_data({'due': '2015-01-01T00:00'})
+        self.assertEqual(field_data.default(self.block, 'due'), '2015-01-01T00:00')
+
+    def test_not_inherited(self):
+        field_data = self.field_data({}, default_values={'graceperiod': '1 day'})
+        self.assertEqual(field_data.default(self.block, 'graceperiod'), '1 day')
+        with self.assertRaises(KeyError):
+            field_data.default(self.block, 'due')
+
+    def test_not_computed(self):
+        self.block.get_parent.side_effect = None
+        self.block.get_parent.return_value = None
+        field_data = self.field_data(None)
+        with self.assertRaises(KeyError):
+            field_data.default(self.block, 'due')
+        self.block.get_parent.assert_called_once_with()
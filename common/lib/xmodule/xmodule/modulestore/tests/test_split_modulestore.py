@@ -730,6 +730,25 @@ class SplitModuleCourseTests(SplitModuleTest):
         self.assertIn(BlockKey('chapter', 'chapter1'), block_map)
         self.assertIn(BlockKey('problem', 'problem3_2'), block_map)
 
+    def test_cache_definitions_not_merged_into_structure(self):
+        """
+        Test that loading the definitions eagerly leaves the (possibly shared) structure alone.
+        """
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        course = modulestore().get_course(locator)
+        structure_blocks = course.system.course_entry.structure['blocks']
+        problem_key = BlockKey('problem', 'problem3_2')
+        structure_fields = dict(structure_blocks[problem_key].fields)
+
+        block_map = modulestore().cache_items(
+            course.system, [BlockKey.from_usage_key(child) for child in course.children], course.id,
+            depth=None, lazy=False
+        )
+        self.assertTrue(block_map[problem_key].definition_loaded)
+        self.assertIsNot(block_map[problem_key], structure_blocks[problem_key])
+        self.assertFalse(structure_blocks[problem_key].definition_loaded)
+        self.assertEqual(structure_blocks[problem_key].fields, structure_fields)
+
     def test_course_successors(self):
         """
         get_course_successors(course_locator, version_history_depth=1)
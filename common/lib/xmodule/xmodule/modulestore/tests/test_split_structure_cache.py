@@ -0,0 +1,126 @@
+"""
+Tests for the process-wide split modulestore structure cache.
+"""
+import unittest
+
+from bson.objectid import ObjectId
+from mock import Mock
+
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore.split_mongo.structure_cache import StructureCache, structure_size
+
+
+def raw_structure(structure_id):
+    """
+    Return a minimal structure document, as it would be read from mongo.
+    """
+    return {
+        '_id': structure_id,
+        'root': ['course', 'course'],
+        'blocks': [
+            {'block_type': 'course', 'block_id': 'course', 'fields': {'children': []}, 'edit_info': {}},
+        ],
+    }
+
+
+class TestStructureCache(unittest.TestCase):
+    """
+    Tests of the size-bounded LRU behavior of StructureCache.
+    """
+    def test_disabled(self):
+        cache = StructureCache(max_size=0)
+        cache.set('a', {}, 10)
+        self.assertFalse(cache.enabled)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_hit_and_miss(self):
+        cache = StructureCache(max_size=100)
+        structure = {'_id': 'a'}
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', structure, 10)
+        self.assertIs(cache.get('a'), structure)
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+        self.assertEqual(stats['size'], 10)
+        self.assertEqual(stats['entries'], 1)
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = StructureCache(max_size=100)
+        cache.set('a', {}, 40)
+        cache.set('b', {}, 40)
+        # touch 'a' so that 'b' is the least recently used
+        cache.get('a')
+        cache.set('c', {}, 40)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.current_size, 80)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_oversized_structure_not_cached(self):
+        cache = StructureCache(max_size=100)
+        cache.set('a', {}, 40)
+        cache.set('big', {}, 101)
+        self.assertNotIn('big', cache)
+        self.assertIn('a', cache)
+
+    def test_replace_entry(self):
+        cache = StructureCache(max_size=100)
+        cache.set('a', {}, 40)
+        cache.set('a', {}, 60)
+        self.assertEqual(cache.current_size, 60)
+        self.assertEqual(len(cache), 1)
+
+    def test_clear(self):
+        cache = StructureCache(max_size=100)
+        cache.set('a', {}, 40)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(cache.stats(), {
+            'hits': 0, 'misses': 0, 'evictions': 0, 'hit_rate': 0.0, 'entries': 0, 'size': 0, 'max_size': 100,
+        })
+
+    def test_structure_size(self):
+        self.assertGreater(structure_size(raw_structure(ObjectId())), 0)
+
+
+class TestMongoConnectionStructureCache(unittest.TestCase):
+    """
+    Tests that MongoConnection only reads and decodes structures missing from the cache.
+    """
+    def setUp(self):
+        super(TestMongoConnectionStructureCache, self).setUp()
+        # Bypass __init__ so that no real mongo connection is needed
+        self.connection = MongoConnection.__new__(MongoConnection)
+        self.connection.structures = Mock()
+        self.connection.structure_cache = StructureCache(max_size=1024 * 1024)
+
+    def test_get_structure(self):
+        structure_id = ObjectId()
+        self.connection.structures.find_one.return_value = raw_structure(structure_id)
+
+        first = self.connection.get_structure(structure_id)
+        second = self.connection.get_structure(structure_id)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.connection.structures.find_one.call_count, 1)
+
+    def test_find_structures_by_id(self):
+        cached_id, uncached_id = ObjectId(), ObjectId()
+        self.connection.structures.find_one.return_value = raw_structure(cached_id)
+        self.connection.get_structure(cached_id)
+
+        self.connection.structures.find.return_value = [raw_structure(uncached_id)]
+        structures = self.connection.find_structures_by_id([cached_id, uncached_id])
+
+        self.assertEqual(set(structure['_id'] for structure in structures), {cached_id, uncached_id})
+        self.connection.structures.find.assert_called_once_with({'_id': {'$in': [uncached_id]}})
+
+        # Everything is cached now, so no further query is made
+        self.connection.find_structures_by_id([cached_id, uncached_id])
+        self.assertEqual(self.connection.structures.find.call_count, 1)
@@ -29,6 +29,9 @@ EXPORT_VERSION_KEY = "export_format"
 
 DEFAULT_CONTENT_FIELDS = ['metadata', 'data']
 
+# The number of static assets written to the export directory at the same time
+ASSET_EXPORT_WORKERS = 4
+
 
 def _export_drafts(modulestore, course_key, export_fs, xml_centric_course_key):
     """
@@ -223,6 +226,7 @@ class CourseExportManager(ExportManager):
                 self.courselike_key,
                 root_courselike_dir + '/static/',
                 root_courselike_dir + '/policies/assets.json',
+                workers=ASSET_EXPORT_WORKERS,
             )
 
             # If we are using the default course image, export it to the
@@ -327,6 +331,7 @@ class LibraryExportManager(ExportManager):
                 self.courselike_key,
                 self.root_dir + '/' + self.target_dir + '/static/',
                 self.root_dir + '/' + self.target_dir + '/policies/assets.json',
+                workers=ASSET_EXPORT_WORKERS,
             )
 
     def post_process(self, root, export_fs):
@@ -22,6 +22,7 @@ Modulestore virtual   |          XML physical (draft, published)
 """
 import logging
 from abc import abstractmethod
+from multiprocessing.pool import ThreadPool
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
@@ -53,10 +54,23 @@ from xmodule.modulestore.tests.utils import LocationMixin
 log = logging.getLogger(__name__)
 
 
+# The number of static assets saved to the contentstore concurrently during imports
+STATIC_CONTENT_IMPORT_WORKERS = 4
+
+# How often, in number of items, the progress of imports is logged
+IMPORT_PROGRESS_INTERVAL = 100
+
+
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
+        target_id, subpath='static', verbose=False, workers=1):
+    """
+    Import the static assets found in the `subpath` directory of the course
+    into the `static_content_store`, with up to `workers` assets being saved
+    at the same time.
 
+    Returns a dict mapping the path of every imported asset to its asset key.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -75,68 +89,108 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
+    def import_static_file(content_path, filename):
+        """
+        Save a single static asset to the contentstore, and record its
+        remapping information.
+        """
+        if verbose:
+            log.debug('importing static content %s...', content_path)
+
+        try:
+            with open(content_path, 'rb') as f:
+                data = f.read()
+        except IOError:
+            if filename.startswith('._'):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                return
+            # Not a 'hidden file', then re-raise exception
+            raise
+
+        # strip away leading path from the name
+        fullname_with_subpath = content_path.replace(static_dir, '')
+        if fullname_with_subpath.startswith('/'):
+            fullname_with_subpath = fullname_with_subpath[1:]
+        asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+        policy_ele = policy.get(asset_key.path, {})
+        displayname = policy_ele.get('displayname', filename)
+        locked = policy_ele.get('locked', False)
+        mime_type = policy_ele.get('contentType')
+
+        # Check extracted contentType in list of all valid mimetypes
+        if not mime_type or mime_type not in mimetypes_list:
+            mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+        content = StaticContent(
+            asset_key, displayname, mime_type, data,
+            import_path=fullname_with_subpath, locked=locked
+        )
+
+        # first let's save a thumbnail so we can get back a thumbnail location
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
+
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:
+            log.exception(u'Error importing {0}, error={1}'.format(
+                fullname_with_subpath, err
+            ))
+
+        # store the remapping information which will be needed
+        # to subsitute in the module data
+        remap_dict[fullname_with_subpath] = asset_key
+
+    static_files = []
     for dirname, _, filenames in os.walk(static_dir):
         for filename in filenames:
-
             content_path = os.path.join(dirname, filename)
-
             if re.match(ASSET_IGNORE_REGEX, filename):
                 if verbose:
                     log.debug('skipping static content %s...', content_path)
                 continue
+            static_files.append((content_path, filename))
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
-
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
-
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
-
-            policy_ele = policy.get(asset_key.path, {})
-            displayname = policy_ele.get('displayname', filename)
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+    progress = _ImportProgress(u'static assets from {}'.format(static_dir), len(static_files))
+    if workers > 1 and len(static_files) > 1:
+        pool = ThreadPool(min(workers, len(static_files)))
+        try:
+            results = [pool.apply_async(import_static_file, static_file) for static_file in static_files]
+            for result in results:
+                # Re-raises any exception raised while importing the file
+                result.get()
+                progress.increment()
+        finally:
+            pool.terminate()
+    else:
+        for static_file in static_files:
+            import_static_file(*static_file)
+            progress.increment()
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+    return remap_dict
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
-
-            # store the remapping information which will be needed
-            # to subsitute in the module data
-            remap_dict[fullname_with_subpath] = asset_key
+class _ImportProgress(object):
+    """
+    Logs the progress of importing `total` items, every
+    IMPORT_PROGRESS_INTERVAL items and once all of them are imported.
+    """
+    def __init__(self, description, total):
+        self.description = description
+        self.total = total
+        self.done = 0
 
-    return remap_dict
+    def increment(self):
+        """
+        Record that one more item was imported.
+        """
+        self.done += 1
+        if self.done % IMPORT_PROGRESS_INTERVAL == 0 or self.done == self.total:
+            log.info(u'Imported %d of %d %s', self.done, self.total, self.description)
 
 
 class ImportManager(object):
@@ -170,6 +224,9 @@ class ImportManager(object):
         create_if_not_present: If True, then a new courselike is created if it doesn't already exist.
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
+        static_content_workers: the number of static assets saved to static_content_store at the
+            same time. The static assets are imported while the blocks are written to the store.
+
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
     """
     store_class = XMLModuleStore
@@ -180,7 +237,7 @@ class ImportManager(object):
             load_error_modules=True, static_content_store=None,
             target_id=None, verbose=False,
             do_import_static=True, create_if_not_present=False,
-            raise_on_failure=False
+            raise_on_failure=False, static_content_workers=STATIC_CONTENT_IMPORT_WORKERS
     ):
         self.store = store
         self.user_id = user_id
@@ -193,6 +250,7 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_content_workers = static_content_workers
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -221,7 +279,8 @@ class ImportManager(object):
             # first pass to find everything in /static/
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath='static', verbose=self.verbose
+                dest_id, subpath='static', verbose=self.verbose,
+                workers=self.static_content_workers
             )
 
         elif self.verbose and not self.do_import_static:
@@ -244,7 +303,8 @@ class ImportManager(object):
         if os.path.exists(data_path / simport):
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath=simport, verbose=self.verbose
+                dest_id, subpath=simport, verbose=self.verbose,
+                workers=self.static_content_workers
             )
 
     def import_asset_metadata(self, data_dir, course_id):
@@ -372,6 +432,7 @@ class ImportManager(object):
         """
         all_locs = set(self.xml_module_store.modules[courselike_key].keys())
         all_locs.remove(source_courselike.location)
+        progress = _ImportProgress(u'blocks of {}'.format(courselike_key), len(all_locs))
 
         def depth_first(subtree):
             """
@@ -397,6 +458,7 @@ class ImportManager(object):
                         do_import_static=self.do_import_static,
                         runtime=courselike.runtime,
                     )
+                    progress.increment()
 
                     depth_first(child)
 
@@ -415,6 +477,7 @@ class ImportManager(object):
                 do_import_static=self.do_import_static,
                 runtime=courselike.runtime,
             )
+            progress.increment()
 
     def run_imports(self):
         """
@@ -432,14 +495,22 @@ class ImportManager(object):
                 # Retrieve the course itself.
                 source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
-                # Import all static pieces.
-                self.import_static(data_path, dest_id)
+                # Import all static pieces in the background, as they go to the contentstore
+                # rather than to the modulestore.
+                static_pool = ThreadPool(1)
+                try:
+                    static_import = static_pool.apply_async(self.import_static, (data_path, dest_id))
+
+                    # Import asset metadata stored in XML.
+                    self.import_asset_metadata(data_path, dest_id)
 
-                # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
+                    # Import all children
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
 
-                # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                    # Wait for the static pieces, re-raising any error raised while importing them.
+                    static_import.get()
+                finally:
+                    static_pool.terminate()
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
@@ -39,3 +39,25 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+
+class ConcurrentImportTestCase(unittest.TestCase):
+    "Tests for importing static files concurrently"
+    def _import(self, workers):
+        """
+        Import the static files of a course with the given number of workers, and
+        return the remapping information and the saved contents.
+        """
+        course_dir = DATA_DIR / "dot-underscore"
+        course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
+        content_store = Mock()
+        content_store.generate_thumbnail.return_value = ("content", "location")
+        remap_dict = import_static_content(course_dir, content_store, course_id, workers=workers)
+        saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
+        return remap_dict, {sc.name: sc.data for sc in saved_static_content}
+
+    def test_same_content_imported(self):
+        remap_dict, name_val = self._import(workers=4)
+        self.assertEqual((remap_dict, name_val), self._import(workers=1))
+        self.assertIn("GREEN", name_val["example.txt"])
+        self.assertIn("BLUE", name_val[".example.txt"])
@@ -1799,6 +1799,9 @@ class CombinedSystem(object):
 
 class DoNothingCache(object):
     """A duck-compatible object to use in ModuleSystem when there's no cache."""
+    # Tells users of the cache (e.g. capa's safe_exec) not to cache anything elsewhere either
+    stores_results = False
+
     def get(self, _key):
         return None
 
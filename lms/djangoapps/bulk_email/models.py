@@ -12,6 +12,9 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import re
+from string import Formatter
+
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -150,6 +153,9 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# The keys of the email context which change from one recipient to the next.
+RECIPIENT_CONTEXT_KEYS = frozenset(['name', 'email', 'user_id'])
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -228,6 +234,87 @@ class CourseEmailTemplate(models.Model):
         """
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile_plaintext(self, plaintext, context):
+        """
+        Compile the plain text body (`plaintext`) and the stored plain template
+        for rendering to many recipients.  See CompiledEmailTemplate.
+        """
+        return CompiledEmailTemplate(self.plain_template, plaintext, context)
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Compile the HTML text body (`htmltext`) and the stored HTML template
+        for rendering to many recipients.  See CompiledEmailTemplate.
+        """
+        return CompiledEmailTemplate(self.html_template, htmltext, context)
+
+
+class CompiledEmailTemplate(object):
+    """
+    An email template and message body, prepared for rendering the same email to many recipients.
+
+    The template is parsed once, and all its fields except those in RECIPIENT_CONTEXT_KEYS are
+    formatted with the `context` given at compile time.  Rendering an email then only joins the
+    resulting text with the recipient's fields and message body, which is the same as calling
+    CourseEmailTemplate._render with the full context.
+    """
+    # The kinds of pieces a compiled template is made of
+    TEXT, FIELD, BODY = range(3)
+
+    def __init__(self, format_string, message_body, context):
+        self.message_body = message_body
+        # Only bodies containing %%-encoded keywords need substitutions for each recipient
+        self.body_has_keywords = '%%' in message_body
+        self.pieces = []
+
+        text = []
+        for literal_text, field_name, format_spec, conversion in Formatter().parse(format_string):
+            text.append(literal_text)
+            if field_name is None:
+                continue
+            field = u'{{{}{}{}}}'.format(
+                field_name,
+                u'!' + conversion if conversion else u'',
+                u':' + format_spec if format_spec else u'',
+            )
+            if re.match(r'[^.[]*', field_name).group() in RECIPIENT_CONTEXT_KEYS or '{' in format_spec:
+                self._add_text(u''.join(text))
+                self.pieces.append((self.FIELD, field))
+                text = []
+            else:
+                text.append(field.format(**context))
+        self._add_text(u''.join(text))
+
+    def _add_text(self, text):
+        """
+        Append the formatted `text` to the pieces, inserting the message body at the first body tag.
+        """
+        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        if message_body_tag in text and not any(kind == self.BODY for kind, __ in self.pieces):
+            before, after = text.split(message_body_tag, 1)
+            self.pieces.extend([(self.TEXT, before), (self.BODY, None), (self.TEXT, after)])
+        else:
+            self.pieces.append((self.TEXT, text))
+
+    def render(self, context):
+        """
+        Render the email for the recipient in `context`, which holds the recipient keys
+        as well as those used to compile this template.
+        """
+        message_body = self.message_body
+        if self.body_has_keywords and 'user_id' in context and 'course_id' in context:
+            message_body = substitute_keywords_with_data(message_body, context)
+
+        result = []
+        for kind, value in self.pieces:
+            if kind == self.TEXT:
+                result.append(value)
+            elif kind == self.FIELD:
+                result.append(value.format(**context))
+            else:
+                result.append(message_body)
+        return wrap_message(u''.join(result))
+
 
 class CourseAuthorization(models.Model):
     """
@@ -6,7 +6,9 @@ to a course.
 import re
 import random
 import json
-from time import sleep
+import socket
+import threading
+from time import sleep, time
 from collections import Counter
 import logging
 
@@ -95,6 +97,63 @@ BULK_EMAIL_FAILURE_ERRORS = (
 )
 
 
+# The email connection left open by the last subtask run by this thread, for the next one to reuse.
+_CONNECTION_POOL = threading.local()
+
+
+def _get_pooled_connection():
+    """
+    Return an open email connection.
+
+    Opening a connection (including the TLS handshake and authentication) costs about as much
+    as sending a few messages, so rather than opening one per subtask, a worker keeps its
+    connection open between the subtasks it runs, for up to BULK_EMAIL_CONNECTION_MAX_IDLE seconds.
+    Since mail servers may drop idle connections sooner, the kept connection is only reused if
+    it's still alive.
+    """
+    pooled = getattr(_CONNECTION_POOL, 'connection', None)
+    _CONNECTION_POOL.connection = None
+    if pooled is not None:
+        connection, released_at = pooled
+        if time() - released_at <= settings.BULK_EMAIL_CONNECTION_MAX_IDLE and _is_connection_alive(connection):
+            return connection
+        try:
+            connection.close()
+        except Exception:  # pylint: disable=broad-except
+            log.info("Error closing a stale bulk email connection", exc_info=True)
+
+    connection = get_connection()
+    connection.open()
+    return connection
+
+
+def _is_connection_alive(connection):
+    """
+    Return whether the server is still at the other end of the open email `connection`.
+
+    This is checked with a NOOP for SMTP connections; other backends (e.g. over HTTP)
+    are assumed to be alive.
+    """
+    noop = getattr(getattr(connection, 'connection', None), 'noop', None)
+    if noop is None:
+        return True
+    try:
+        return noop()[0] == 250
+    except (SMTPException, socket.error):
+        return False
+
+
+def _release_pooled_connection(connection, reusable):
+    """
+    Keep the `connection` open for the next subtask if it's `reusable` and pooling is enabled,
+    otherwise close it.
+    """
+    if reusable and settings.BULK_EMAIL_CONNECTION_MAX_IDLE > 0:
+        _CONNECTION_POOL.connection = (connection, time())
+    else:
+        connection.close()
+
+
 def _get_recipient_querysets(user_id, to_option, course_id):
     """
     Returns a list of query sets of email recipients corresponding to the
@@ -229,6 +288,13 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
     log.info(u"Task %s: Preparing to queue subtasks for sending emails for course %s, email %s, to_option %s",
              task_id, course_id, email_id, to_option)
 
+    # Recipients who opted out are left out of the subtasks by the database, and counted as skipped.
+    num_optouts = sum([
+        recipient_queryset.filter(optout__course_id=course_id).count() for recipient_queryset in recipient_qsets
+    ])
+    recipient_qsets = [
+        recipient_queryset.exclude(optout__course_id=course_id) for recipient_queryset in recipient_qsets
+    ]
     total_recipients = sum([recipient_queryset.count() for recipient_queryset in recipient_qsets])
 
     routing_key = settings.BULK_EMAIL_ROUTING_KEY
@@ -261,6 +327,8 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
         recipient_fields,
         settings.BULK_EMAIL_EMAILS_PER_TASK,
         total_recipients,
+        num_skipped_items=num_optouts,
+        items_per_query=settings.BULK_EMAIL_EMAILS_PER_QUERY,
     )
 
     # We want to return progress here, as this is what will be stored in the
@@ -370,20 +438,29 @@ def _filter_optouts_from_recipients(to_list, course_id):
     """
     Filters a recipient list based on student opt-outs for a given course.
 
+    Students who had opted out when the subtasks were queued are already left out of
+    the recipient lists, so this only catches those who opted out since.  Rather than
+    sending every recipient's id to the database, it reads the course's opt-outs between
+    the lowest and highest recipient ids: recipients are queued by increasing id, so each
+    subtask's recipients cover a narrow range of ids.
+
     Returns the filtered recipient list, as well as the number of optouts
     removed from the list.
     """
-    optouts = Optout.objects.filter(
+    if not to_list:
+        return to_list, 0
+    recipient_ids = [recipient['pk'] for recipient in to_list]
+    optouts = set(Optout.objects.filter(
         course_id=course_id,
-        user__in=[i['pk'] for i in to_list]
-    ).values_list('user__email', flat=True)
-    optouts = set(optouts)
+        user__gte=min(recipient_ids),
+        user__lte=max(recipient_ids),
+    ).values_list('user', flat=True))
     # Only count the num_optout for the first time the optouts are calculated.
     # We assume that the number will not change on retries, and so we don't need
     # to calculate it each time.
-    num_optout = len(optouts)
-    to_list = [recipient for recipient in to_list if recipient['email'] not in optouts]
-    return to_list, num_optout
+    filtered_to_list = [recipient for recipient in to_list if recipient['pk'] not in optouts]
+    num_optout = len(to_list) - len(filtered_to_list)
+    return filtered_to_list, num_optout
 
 
 def _get_source_address(course_id, course_title):
@@ -483,13 +560,19 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    connection = None
+    connection_reusable = False
     try:
-        connection = get_connection()
-        connection.open()
+        connection = _get_pooled_connection()
 
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
+        email_context['course_id'] = course_email.course_id
+
+        # Prepare the templates once, rather than for every recipient:
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
 
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
@@ -503,11 +586,10 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             email_context['email'] = email
             email_context['name'] = current_recipient['profile__name']
             email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
 
             # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
+            plaintext_msg = plaintext_template.render(email_context)
+            html_msg = html_template.render(email_context)
 
             # Create email:
             email_msg = EmailMultiAlternatives(
@@ -689,11 +771,14 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         # All went well.  Update counters with progress to date,
         # and set the state to SUCCESS:
         subtask_status.increment(state=SUCCESS)
+        # Only a connection which didn't run into any error is worth keeping open.
+        connection_reusable = True
         # Successful completion is marked by an exception value of None.
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        if connection is not None:
+            _release_pooled_connection(connection, connection_reusable)
 
 
 def _get_current_task():
@@ -0,0 +1,74 @@
+"""
+An email backend standing in for an SMTP server in bulk email tests.
+"""
+from smtplib import SMTPDataError, SMTPServerDisconnected
+
+from django.core.mail.backends.base import BaseEmailBackend
+
+
+class FakeSMTPBackend(BaseEmailBackend):
+    """
+    Records the connections opened and the messages sent through them, like an SMTP
+    server would, in class attributes which tests can inspect after calling `reset`.
+
+    Messages to the addresses in `rejected_addresses` fail with a permanent SMTPDataError.
+    If `server_disconnected` is set, the server dropped the open connections.
+    """
+    connections_opened = 0
+    connections_closed = 0
+    sent_messages = []
+    rejected_addresses = set()
+    server_disconnected = False
+
+    def __init__(self, *args, **kwargs):
+        super(FakeSMTPBackend, self).__init__(*args, **kwargs)
+        self.is_open = False
+        # Stands in for the smtplib.SMTP connection of the SMTP backend
+        self.connection = None
+
+    @classmethod
+    def reset(cls):
+        """
+        Forget about all the connections and messages so far.
+        """
+        cls.connections_opened = 0
+        cls.connections_closed = 0
+        cls.sent_messages = []
+        cls.rejected_addresses = set()
+        cls.server_disconnected = False
+
+    def open(self):
+        if self.is_open:
+            return False
+        self.is_open = True
+        self.connection = self
+        FakeSMTPBackend.connections_opened += 1
+        return True
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self.connection = None
+            FakeSMTPBackend.connections_closed += 1
+
+    def noop(self):
+        """
+        Like smtplib.SMTP.noop, check that the server is still connected.
+        """
+        if FakeSMTPBackend.server_disconnected:
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        return 250, "OK"
+
+    def send_messages(self, email_messages):
+        new_connection = self.open()
+        try:
+            for message in email_messages:
+                if set(message.recipients()) & self.rejected_addresses:
+                    raise SMTPDataError(554, "Email address is blacklisted")
+                # Like the SMTP backend, build the MIME message to be sent
+                message.message()
+                FakeSMTPBackend.sent_messages.append(message)
+        finally:
+            if new_connection:
+                self.close()
+        return len(email_messages)
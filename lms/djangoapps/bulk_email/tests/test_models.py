@@ -137,6 +137,31 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def test_compiled_templates_render_like_templates(self):
+        context = self._get_sample_html_context()
+        context['course_id'] = SlashSeparatedCourseKey('abc', '123', 'doremi')
+        for name in (None, "branded.template"):
+            template = CourseEmailTemplate.get_template(name=name)
+            plaintext = template.compile_plaintext(u"Plain text for %%USER_FULLNAME%%.", context)
+            htmltext = template.compile_htmltext(u"<p>HTML text for %%USER_FULLNAME%%.</p>", context)
+            for user in (UserFactory.create(), UserFactory.create(profile__name=u"Ünicode {message_body}")):
+                context.update({'name': user.profile.name, 'email': user.email, 'user_id': user.id})
+                self.assertEqual(
+                    plaintext.render(context),
+                    template.render_plaintext(u"Plain text for %%USER_FULLNAME%%.", context)
+                )
+                self.assertEqual(
+                    htmltext.render(context),
+                    template.render_htmltext(u"<p>HTML text for %%USER_FULLNAME%%.</p>", context)
+                )
+                self.assertIn(user.email, plaintext.render(context))
+
+    def test_compiled_template_without_recipient(self):
+        template = CourseEmailTemplate.get_template()
+        compiled = template.compile_plaintext("My new plain text.", self._get_sample_plain_context())
+        with self.assertRaises(KeyError):
+            compiled.render({})
+
 
 @attr('shard_1')
 class CourseAuthorizationTest(TestCase):
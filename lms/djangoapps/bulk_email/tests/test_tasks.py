@@ -29,10 +29,13 @@ from celery.states import SUCCESS, FAILURE
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from bulk_email import tasks as bulk_email_tasks
 from bulk_email.models import CourseEmail, Optout, SEND_TO_ALL
+from bulk_email.tests.fake_smtp_backend import FakeSMTPBackend
 
 from instructor_task.tasks import send_bulk_course_email
 from instructor_task.subtasks import update_subtask_status, SubtaskStatus
@@ -163,8 +166,13 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         self.assertEquals(subtask_status.get('retried_withmax'), retried_withmax)
         self.assertEquals(subtask_status.get('state'), SUCCESS if succeeded > 0 else FAILURE)
 
-    def _test_run_with_task(self, task_class, action_name, total, succeeded, failed=0, skipped=0, retried_nomax=0, retried_withmax=0):
-        """Run a task and check the number of emails processed."""
+    def _test_run_with_task(self, task_class, action_name, total, succeeded, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, subtask_skipped=0):
+        """
+        Run a task and check the number of emails processed.
+
+        `skipped` recipients include those left out before queuing the subtask, while
+        `subtask_skipped` only counts those skipped by the subtask itself.
+        """
         task_entry = self._create_input_entry()
         parent_status = self._run_task_with_mock_celery(task_class, task_entry.id, task_entry.task_id)
 
@@ -183,7 +191,7 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         self.assertEquals(status.get('action_name'), action_name)
         self.assertGreater(status.get('duration_ms'), 0)
         self.assertEquals(entry.task_state, SUCCESS)
-        self._assert_single_subtask_status(entry, succeeded, failed, skipped, retried_nomax, retried_withmax)
+        self._assert_single_subtask_status(entry, succeeded, failed, subtask_skipped, retried_nomax, retried_withmax)
         return entry
 
     def test_successful(self):
@@ -239,6 +247,22 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, expected_succeeds, skipped=expected_skipped)
+            # opted out students are not even passed to the subtask
+            for call in get_conn.return_value.send_messages.call_args_list:
+                self.assertNotIn(students[0].email, call[0][0][0].to)
+
+    def test_skipped_after_queuing(self):
+        students = self._create_students(4)
+        to_list = [{'pk': student.id, 'email': student.email, 'profile__name': ''} for student in students]
+        Optout.objects.create(user=students[1], course_id=self.course.id)
+        # opting out of another course doesn't count
+        Optout.objects.create(user=students[2], course_id=SlashSeparatedCourseKey("other", "course", "id"))
+
+        filtered_to_list, num_optout = bulk_email_tasks._filter_optouts_from_recipients(  # pylint: disable=protected-access
+            to_list, self.course.id
+        )
+        self.assertEquals(num_optout, 1)
+        self.assertEquals([recipient['pk'] for recipient in filtered_to_list], [students[0].id] + [s.id for s in students[2:]])
 
     def _test_email_address_failures(self, exception):
         """Test that celery handles bad address errors by failing and not retrying."""
@@ -419,3 +443,55 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+
+    @override_settings(
+        EMAIL_BACKEND='bulk_email.tests.fake_smtp_backend.FakeSMTPBackend',
+        BULK_EMAIL_EMAILS_PER_TASK=5,
+        BULK_EMAIL_CONNECTION_MAX_IDLE=30,
+    )
+    def test_connection_reused_between_subtasks(self):
+        FakeSMTPBackend.reset()
+        self.addCleanup(setattr, bulk_email_tasks._CONNECTION_POOL, 'connection', None)  # pylint: disable=protected-access
+        students = self._create_students(9)
+        FakeSMTPBackend.rejected_addresses.add(students[0].email)
+
+        task_entry = self._create_input_entry()
+        parent_status = self._run_task_with_mock_celery(send_bulk_course_email, task_entry.id, task_entry.task_id)
+
+        # 10 recipients including the instructor, in two subtasks
+        self.assertEquals(parent_status.get('total'), 10)
+        self.assertEquals(parent_status.get('succeeded'), 9)
+        self.assertEquals(parent_status.get('failed'), 1)
+        self.assertEquals(FakeSMTPBackend.connections_opened, 1)
+        self.assertEquals(FakeSMTPBackend.connections_closed, 0)
+
+        # each message is rendered for its own recipient
+        self.assertEquals(len(FakeSMTPBackend.sent_messages), 9)
+        for message in FakeSMTPBackend.sent_messages:
+            self.assertIn(message.to[0], message.body)
+            self.assertIn(u"This is a test message", message.alternatives[0][0])
+
+    @override_settings(
+        EMAIL_BACKEND='bulk_email.tests.fake_smtp_backend.FakeSMTPBackend',
+        BULK_EMAIL_CONNECTION_MAX_IDLE=30,
+    )
+    def test_dropped_connection_not_reused(self):
+        FakeSMTPBackend.reset()
+        self.addCleanup(setattr, bulk_email_tasks._CONNECTION_POOL, 'connection', None)  # pylint: disable=protected-access
+        connection = bulk_email_tasks._get_pooled_connection()  # pylint: disable=protected-access
+        bulk_email_tasks._release_pooled_connection(connection, True)  # pylint: disable=protected-access
+
+        # The server dropped the idle connection: a new one is opened
+        FakeSMTPBackend.server_disconnected = True
+        new_connection = bulk_email_tasks._get_pooled_connection()  # pylint: disable=protected-access
+        self.assertIsNot(new_connection, connection)
+        self.assertEquals(FakeSMTPBackend.connections_opened, 2)
+        self.assertEquals(FakeSMTPBackend.connections_closed, 1)
+
+    @override_settings(EMAIL_BACKEND='bulk_email.tests.fake_smtp_backend.FakeSMTPBackend')
+    def test_connection_closed_when_not_pooled(self):
+        FakeSMTPBackend.reset()
+        self._create_students(2)
+        self._test_run_with_task(send_bulk_course_email, 'emailed', 3, 3)
+        self.assertEquals(FakeSMTPBackend.connections_opened, 1)
+        self.assertEquals(FakeSMTPBackend.connections_closed, 1)
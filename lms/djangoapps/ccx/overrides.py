@@ -9,12 +9,17 @@ from contextlib import contextmanager
 
 from django.db import transaction, IntegrityError
 
-from courseware.field_overrides import FieldOverrideProvider  # pylint: disable=import-error
+from request_cache.middleware import RequestCache
+from courseware.field_overrides import FieldOverrideProvider, clear_override_cache  # pylint: disable=import-error
 from ccx import ACTIVE_CCX_KEY  # pylint: disable=import-error
 
 from .models import CcxMembership, CcxFieldOverride
 
 
+# The request cache key of the overrides of the CCXs used during the request
+OVERRIDES_CACHE_KEY = u"ccx.overrides"
+
+
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
     A concrete implementation of
@@ -53,8 +58,10 @@ def ccx_context(ccx):
     """
     prev = _CCX_CONTEXT.ccx
     _CCX_CONTEXT.ccx = ccx
+    clear_override_cache()
     yield
     _CCX_CONTEXT.ccx = prev
+    clear_override_cache()
 
 
 def get_current_ccx():
@@ -94,17 +101,54 @@ def _get_overrides_for_ccx(ccx, block):
     overrides set on this block for this CCX.
     """
     overrides = {}
-    query = CcxFieldOverride.objects.filter(
-        ccx=ccx,
-        location=block.location
-    )
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    serialized_overrides = _get_serialized_overrides_for_ccx(ccx).get(_location_key(block.location), {})
+    for field_name, value in serialized_overrides.iteritems():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _get_serialized_overrides_for_ccx(ccx):
+    """
+    Returns a dictionary mapping the location of every block with overrides
+    in this CCX to a dictionary of its overridden field names and JSON values.
+
+    All the overrides of the CCX are loaded in a single query, the first time
+    they are needed during a request, rather than one query per block.
+    """
+    ccx_overrides = RequestCache.get_request_cache().data.setdefault(OVERRIDES_CACHE_KEY, {})
+
+    if ccx.id not in ccx_overrides:
+        serialized_overrides = {}
+        for override in CcxFieldOverride.objects.filter(ccx=ccx):
+            location_overrides = serialized_overrides.setdefault(_location_key(override.location), {})
+            location_overrides[override.field] = override.value
+        ccx_overrides[ccx.id] = serialized_overrides
+
+    return ccx_overrides[ccx.id]
+
+
+def _location_key(location):
+    """
+    Returns the `location` without any branch or version information, the way
+    it's stored in the database.
+    """
+    if hasattr(location, 'version_agnostic') and hasattr(location, 'for_branch'):
+        return location.for_branch(None).version_agnostic()
+    return location
+
+
+def _clear_cached_overrides(ccx, block):
+    """
+    Forgets about the overrides of the `ccx` loaded so far, after one of them
+    has changed.
+    """
+    RequestCache.get_request_cache().data.get(OVERRIDES_CACHE_KEY, {}).pop(ccx.id, None)
+    if hasattr(block, '_ccx_overrides'):
+        block._ccx_overrides.pop(ccx.id, None)  # pylint: disable=protected-access
+    clear_override_cache()
+
+
 @transaction.commit_on_success
 def override_field_for_ccx(ccx, block, name, value):
     """
@@ -128,8 +172,7 @@ def override_field_for_ccx(ccx, block, name, value):
             field=name)
         override.value = value
     override.save()
-    if hasattr(block, '_ccx_overrides'):
-        del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+    _clear_cached_overrides(ccx, block)
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -145,8 +188,7 @@ def clear_override_for_ccx(ccx, block, name):
             location=block.location,
             field=name).delete()
 
-        if hasattr(block, '_ccx_overrides'):
-            del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+        _clear_cached_overrides(ccx, block)
 
     except CcxFieldOverride.DoesNotExist:
         pass
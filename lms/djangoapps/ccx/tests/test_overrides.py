@@ -4,16 +4,24 @@ tests for overrides
 import datetime
 import mock
 import pytz
+from celery.signals import task_postrun
 from nose.plugins.attrib import attr
 
 from courseware.field_overrides import OverrideFieldData  # pylint: disable=import-error
 from django.test.utils import override_settings
+from request_cache.middleware import RequestCache
 from student.tests.factories import AdminFactory  # pylint: disable=import-error
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
-from ..models import CustomCourseForEdX
-from ..overrides import override_field_for_ccx
+from ..models import CcxFieldOverride, CustomCourseForEdX
+from ..overrides import (
+    CustomCoursesForEdxOverrideProvider,
+    _get_serialized_overrides_for_ccx,
+    clear_override_for_ccx,
+    get_override_for_ccx,
+    override_field_for_ccx,
+)
 
 from .test_views import flatten, iter_blocks
 
@@ -64,9 +72,10 @@ class TestFieldOverrides(ModuleStoreTestCase):
         # sure if there's a way to poke the test harness to do so.  So, we'll
         # just inject the override field storage in this brute force manner.
         OverrideFieldData.provider_classes = None
+        user = AdminFactory.create()
         for block in iter_blocks(course):
             block._field_data = OverrideFieldData.wrap(   # pylint: disable=protected-access
-                AdminFactory.create(), block._field_data)   # pylint: disable=protected-access
+                user, block._field_data)   # pylint: disable=protected-access
 
         def cleanup_provider_classes():
             """
@@ -107,6 +116,53 @@ class TestFieldOverrides(ModuleStoreTestCase):
             dummy2 = chapter.start
             dummy3 = chapter.start
 
+    def test_overrides_loaded_in_one_query(self):
+        """
+        Test that the overrides of all the blocks are loaded with a single query.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.course.get_children()
+        for chapter in chapters:
+            override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+        RequestCache().clear_request_cache()
+
+        with self.assertNumQueries(1):
+            for chapter in chapters:
+                self.assertEquals(chapter.start, ccx_start)
+                for sequential in chapter.get_children():
+                    self.assertEquals(sequential.start, ccx_start)
+
+    def test_overrides_reloaded_by_celery_tasks(self):
+        """
+        Test that the overrides loaded by a celery task aren't used by the next tasks,
+        which must see the changes made in the meantime.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        override_field_for_ccx(self.ccx, self.course.get_children()[0], 'start', ccx_start)
+        overrides = _get_serialized_overrides_for_ccx(self.ccx)
+        self.assertNotEqual(overrides, {})
+
+        # The coach clears the overrides from another process
+        CcxFieldOverride.objects.filter(ccx=self.ccx).delete()
+        self.assertEqual(_get_serialized_overrides_for_ccx(self.ccx), overrides)
+        task_postrun.send(sender=None)
+        self.assertEqual(_get_serialized_overrides_for_ccx(self.ccx), {})
+
+    def test_loaded_overrides_updated(self):
+        """
+        Test that changing an override after the overrides were loaded is
+        taken into account.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 1, 1, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+        self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+        override_field_for_ccx(self.ccx, chapter, 'start', new_ccx_start)
+        self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), new_ccx_start)
+        clear_override_for_ccx(self.ccx, chapter, 'start')
+        self.assertIsNone(get_override_for_ccx(self.ccx, chapter, 'start'))
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
@@ -129,3 +185,30 @@ class TestFieldOverrides(ModuleStoreTestCase):
         override_field_for_ccx(self.ccx, chapter, 'due', ccx_due)
         vertical = chapter.get_children()[0].get_children()[0]
         self.assertEqual(vertical.due, ccx_due)
+
+    def test_inherited_overrides_resolved_once(self):
+        """
+        Test that the override provider is asked about the field of each block
+        only once, however deep the block is in the course.
+        """
+        ccx_due = datetime.datetime(2015, 1, 1, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'due', ccx_due)
+        blocks = list(iter_blocks(self.course))
+
+        asked_locations = []
+        provider_get = CustomCoursesForEdxOverrideProvider.get
+
+        def get(provider, block, name, default):
+            """
+            Record the blocks the provider is asked about.
+            """
+            if name == 'due':
+                asked_locations.append(block.location)
+            return provider_get(provider, block, name, default)
+
+        with mock.patch.object(CustomCoursesForEdxOverrideProvider, 'get', get):
+            for block in blocks:
+                dummy = block.due
+
+        self.assertEqual(sorted(asked_locations), sorted(block.location for block in blocks))
@@ -187,9 +187,35 @@ def certificate_status_for_student(student, course_id):
     return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
 
 
-def certificate_info_for_user(user, course_id, grade, user_is_whitelisted=None):
+def certificate_statuses_for_students(student_ids, course_id):
+    """
+    Returns the certificate statuses of several students, in a single query.
+
+    This is the bulk equivalent of `certificate_status_for_student`: it returns
+    a dict mapping each of `student_ids` to the dictionary that
+    `certificate_status_for_student` would return for that student.
+    """
+    statuses = {
+        student_id: {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+        for student_id in student_ids
+    }
+    for generated_certificate in GeneratedCertificate.objects.filter(user__id__in=student_ids, course_id=course_id):
+        d = {'status': generated_certificate.status,
+             'mode': generated_certificate.mode}
+        if generated_certificate.grade:
+            d['grade'] = generated_certificate.grade
+        if generated_certificate.status == CertificateStatuses.downloadable:
+            d['download_url'] = generated_certificate.download_url
+        statuses[generated_certificate.user_id] = d
+    return statuses
+
+
+def certificate_info_for_user(user, course_id, grade, user_is_whitelisted=None, certificate_status=None):
     """
     Returns the certificate info for a user for grade report.
+
+    `user_is_whitelisted` and `certificate_status` (as returned by
+    `certificate_status_for_student`) are looked up if they are not given.
     """
     if user_is_whitelisted is None:
         user_is_whitelisted = CertificateWhitelist.objects.filter(
@@ -201,7 +227,8 @@ def certificate_info_for_user(user, course_id, grade, user_is_whitelisted=None):
     if eligible_for_certificate:
         user_is_eligible = 'Y'
 
-        certificate_status = certificate_status_for_student(user, course_id)
+        if certificate_status is None:
+            certificate_status = certificate_status_for_student(user, course_id)
         certificate_generated = certificate_status['status'] == CertificateStatuses.downloadable
         certificate_is_delivered = 'Y' if certificate_generated else 'N'
 
@@ -14,6 +14,7 @@ from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate,
     certificate_status_for_student,
+    certificate_statuses_for_students,
     certificate_info_for_user
 )
 from certificates.tests.factories import GeneratedCertificateFactory
@@ -40,6 +41,28 @@ class CertificatesModelTest(ModuleStoreTestCase):
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
 
+    def test_certificate_statuses_for_students(self):
+        course = CourseFactory.create(org='edx', number='verified', display_name='Verified Course')
+        students = [UserFactory() for __ in range(3)]
+        GeneratedCertificateFactory.create(
+            user=students[0],
+            course_id=course.id,
+            status=CertificateStatuses.downloadable,
+            mode='verified',
+            download_url='http://www.example.com/cert.pdf',
+        )
+        GeneratedCertificateFactory.create(
+            user=students[1],
+            course_id=course.id,
+            status=CertificateStatuses.notpassing,
+            grade='0.2',
+        )
+
+        with self.assertNumQueries(1):
+            certificate_statuses = certificate_statuses_for_students([student.id for student in students], course.id)
+        for student in students:
+            self.assertEqual(certificate_statuses[student.id], certificate_status_for_student(student, course.id))
+
     @unpack
     @data(
         {'allow_certificate': False, 'whitelisted': False, 'grade': None, 'output': ['N', 'N', 'N/A']},
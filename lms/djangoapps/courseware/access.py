@@ -26,6 +26,7 @@ from xmodule.util.django import get_current_request_hostname
 
 from external_auth.models import ExternalAuthMap
 from courseware.masquerade import get_masquerade_role, is_masquerading_as_student
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from student import auth
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from student.roles import (
@@ -86,7 +87,7 @@ def has_access(user, action, obj, course_key=None):
 
     # delegate the work to type-specific functions.
     # (start with more specific types, then get more general)
-    if isinstance(obj, CourseDescriptor):
+    if isinstance(obj, (CourseDescriptor, CourseOverview)):
         return _has_access_course_desc(user, action, obj)
 
     if isinstance(obj, ErrorDescriptor):
@@ -117,7 +118,7 @@ def has_access(user, action, obj, course_key=None):
 # ================ Implementation helpers ================================
 def _has_access_course_desc(user, action, course):
     """
-    Check if user has access to a course descriptor.
+    Check if user has access to a course descriptor (or to the CourseOverview of a course).
 
     Valid actions:
 
@@ -138,6 +139,8 @@ def _has_access_course_desc(user, action, course):
 
         NOTE: this is not checking whether user is actually enrolled in the course.
         """
+        if isinstance(course, CourseOverview):
+            return _can_load_course_overview(user, course)
         # delegate to generic descriptor check to check start dates
         return _has_access_descriptor(user, 'load', course, course.id)
 
@@ -465,6 +468,34 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
     return _dispatch(checkers, action, user, descriptor)
 
 
+def _can_load_course_overview(user, course_overview):
+    """
+    Implements the 'load' check of _has_access_descriptor for the CourseOverview of a course.
+
+    NOTE: Unlike the descriptor check, this doesn't enforce group access restrictions on
+    the course itself; those are only set on blocks within courses.
+    """
+    course_key = course_overview.id
+    if course_overview.visible_to_staff_only and not _has_staff_access_to_descriptor(user, course_overview, course_key):
+        return False
+
+    # If start dates are off, can always load
+    if settings.FEATURES['DISABLE_START_DATES'] and not is_masquerading_as_student(user, course_key):
+        debug("Allow: DISABLE_START_DATES")
+        return True
+
+    if course_overview.start is not None:
+        now = datetime.now(UTC())
+        effective_start = _adjust_start_date_for_beta_testers(user, course_overview, course_key=course_key)
+        if in_preview_mode() or now > effective_start:
+            debug("Allow: now > effective start date")
+            return True
+        return _has_staff_access_to_descriptor(user, course_overview, course_key)
+
+    debug("Allow: no start date")
+    return True
+
+
 def _has_access_xmodule(user, action, xmodule, course_key):
     """
     Check if user has access to this xmodule.
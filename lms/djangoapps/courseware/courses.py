@@ -11,7 +11,6 @@ from edxmako.shortcuts import render_to_string
 from xmodule.modulestore import ModuleStoreEnum
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
-from xmodule.contentstore.content import StaticContent
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from static_replace import replace_static_urls
 from xmodule.modulestore import ModuleStoreEnum
@@ -19,6 +18,8 @@ from xmodule.x_module import STUDENT_VIEW
 from microsite_configuration import microsite
 
 from courseware.access import has_access
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.lib.courses import course_image_url as core_course_image_url
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module
 from student.models import CourseEnrollment
@@ -120,26 +121,12 @@ def get_opt_course_with_access(user, action, course_key):
 
 
 def course_image_url(course):
-    """Try to look up the image url for the course.  If it's not found,
+    """Try to look up the image url for the course (or course overview).  If it's not found,
     log an error and return the dead link"""
-    if course.static_asset_path or modulestore().get_modulestore_type(course.id) == ModuleStoreEnum.Type.xml:
-        # If we are a static course with the course_image attribute
-        # set different than the default, return that path so that
-        # courses can use custom course image paths, otherwise just
-        # return the default static path.
-        url = '/static/' + (course.static_asset_path or getattr(course, 'data_dir', ''))
-        if hasattr(course, 'course_image') and course.course_image != course.fields['course_image'].default:
-            url += '/' + course.course_image
-        else:
-            url += '/images/course_image.jpg'
-    elif course.course_image == '':
-        # if course_image is empty the url will be blank as location
-        # of the course_image does not exist
-        url = ''
-    else:
-        loc = StaticContent.compute_location(course.id, course.course_image)
-        url = StaticContent.serialize_asset_key_with_slash(loc)
-    return url
+    if isinstance(course, CourseOverview):
+        # computed when the overview was created
+        return course.course_image_url
+    return core_course_image_url(course)
 
 
 def find_file(filesystem, dirs, filename):
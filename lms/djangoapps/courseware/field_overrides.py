@@ -19,11 +19,13 @@ import threading
 from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 from django.conf import settings
+from request_cache.middleware import RequestCache
 from xblock.field_data import FieldData
 from xmodule.modulestore.inheritance import InheritanceMixin
 
 
 NOTSET = object()
+INHERITABLE_FIELDS = frozenset(InheritanceMixin.fields.keys())
 
 
 def resolve_dotted(name):
@@ -82,20 +84,64 @@ class OverrideFieldData(FieldData):
 
     def __init__(self, user, fallback):
         self.fallback = fallback
+        self.user = user
         self.providers = tuple((cls(user) for cls in self.provider_classes))
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
+
+        The overrides are resolved once per block and field during a request.
+        """
+        if overrides_disabled():
+            return NOTSET
+
+        cache = _get_override_cache()
+        key = (self.user, _block_key(block), name)
+        if key in cache['resolved']:
+            cache['stats']['cache_hits'] += 1
+        else:
+            cache['resolved'][key] = self._get_provider_override(block, name, cache['stats'])
+        return cache['resolved'][key]
+
+    def _get_provider_override(self, block, name, stats):
+        """
+        Asks the providers for an override of the field identified by `name`
+        in `block`.  Returns the first override found, or `NOTSET`.
         """
-        if not overrides_disabled():
-            for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
-                if value is not NOTSET:
-                    return value
+        for provider in self.providers:
+            stats['provider_calls'] += 1
+            value = provider.get(block, name, NOTSET)
+            if value is not NOTSET:
+                return value
         return NOTSET
 
+    def get_inherited_override(self, block, name):
+        """
+        Returns the override of the inheritable field identified by `name` in
+        the closest ancestor of `block` overriding it, or `NOTSET` if none of
+        them do.
+
+        This is resolved once per block and field during a request, each block
+        reusing the result of its parent, rather than walking up the whole
+        lineage of every block.
+        """
+        if overrides_disabled():
+            return NOTSET
+
+        cache = _get_override_cache()
+        key = (self.user, _block_key(block), name)
+        if key not in cache['inherited']:
+            value = NOTSET
+            parent = block.get_parent()
+            if parent:
+                value = self.get_override(parent, name)
+                if value is NOTSET:
+                    value = self.get_inherited_override(parent, name)
+            cache['inherited'][key] = value
+        return cache['inherited'][key]
+
     def get(self, block, name):
         value = self.get_override(block, name)
         if value is not NOTSET:
@@ -114,11 +160,9 @@ class OverrideFieldData(FieldData):
             # If this is an inheritable field and an override is set above,
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if name in INHERITABLE_FIELDS:
+                if self.get_inherited_override(block, name) is not NOTSET:
+                    return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -128,16 +172,57 @@ class OverrideFieldData(FieldData):
     def default(self, block, name):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
-        if not overrides_disabled():
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+        if name in INHERITABLE_FIELDS:
+            value = self.get_inherited_override(block, name)
+            if value is not NOTSET:
+                return value
         return self.fallback.default(block, name)
 
 
+def _block_key(block):
+    """
+    Returns the key identifying `block` in the override cache.
+    """
+    return getattr(block, 'location', block)
+
+
+def _get_override_cache():
+    """
+    Returns the override resolution cache of the current request, as a dict
+    of the resolved overrides, of the resolved inherited overrides, and of
+    the number of provider calls and cache hits so far.
+    """
+    request_cache = RequestCache.get_request_cache()
+    cache = request_cache.data.get('field_overrides')
+    if cache is None:
+        cache = request_cache.data['field_overrides'] = {
+            'resolved': {},
+            'inherited': {},
+            'stats': {'provider_calls': 0, 'cache_hits': 0},
+        }
+    return cache
+
+
+def clear_override_cache():
+    """
+    Forgets about the overrides resolved so far during the current request.
+    Override providers must call this whenever the overrides they provide
+    change during a request.  Code handling many users outside of requests
+    (e.g. grading a course) should call it between users, since the
+    resolved overrides are cached per user.
+    """
+    RequestCache.get_request_cache().data.pop('field_overrides', None)
+
+
+def get_override_stats():
+    """
+    Returns a dict of the number of calls made to override providers, and of
+    the number of overrides found in the cache instead, during the current
+    request.
+    """
+    return dict(_get_override_cache()['stats'])
+
+
 class _OverridesDisabled(threading.local):
     """
     A thread local used to manage state of overrides being disabled or not.
@@ -192,13 +277,3 @@ class FieldOverrideProvider(object):
         """
         raise NotImplementedError
 
-
-def _lineage(block):
-    """
-    Returns an iterator over all ancestors of the given block, starting with
-    its immediate parent and ending at the root of the block tree.
-    """
-    parent = block.get_parent()
-    while parent:
-        yield parent
-        parent = parent.get_parent()
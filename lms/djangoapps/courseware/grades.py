@@ -1,6 +1,8 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
 from collections import defaultdict
+import hashlib
+from itertools import islice
 import json
 import random
 import logging
@@ -13,22 +15,26 @@ from django.test.client import RequestFactory
 import dogstats_wrapper as dog_stats_api
 
 from courseware import courses
-from courseware.model_data import FieldDataCache
+from courseware.field_overrides import clear_override_cache
+from courseware.model_data import FieldDataCache, MultiUserFieldDataCache
 from student.models import anonymous_id_for_user
 from util.module_utils import yield_dynamic_descriptor_descendents
 from xmodule import graders
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from .models import StudentModule
+from .models import StudentModule, PersistentCourseGrade, PersistentSubsectionGrade, SubsectionGradeProblem
 from .module_render import get_module_for_descriptor
 from submissions import api as sub_api  # installed from the edx-submissions repository
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 
 
 log = logging.getLogger("edx.courseware")
 
+# The number of students whose StudentModules are loaded together by iterate_grades_for
+GRADING_BATCH_SIZE = 100
+
 
 def answer_distributions(course_key):
     """
@@ -122,16 +128,86 @@ def answer_distributions(course_key):
 
 
 @transaction.commit_manually
-def grade(student, request, course, keep_raw_scores=False):
+def grade(student, request, course, keep_raw_scores=False, multi_user_cache=None):
     """
     Wraps "_grade" with the manual_transaction context manager just in case
     there are unanticipated errors.
     """
     with manual_transaction():
-        return _grade(student, request, course, keep_raw_scores)
+        return _grade(student, request, course, keep_raw_scores, multi_user_cache)
+
+
+def _persistent_grades_enabled():
+    """
+    Returns whether computed grades should be persisted and reused.
+    """
+    return settings.FEATURES.get('ENABLE_PERSISTENT_GRADES', False) and not settings.GENERATE_PROFILE_SCORES
+
+
+def _course_version(course):
+    """
+    Returns a string which changes whenever the content of `course` changes, or
+    None if there is no way to tell (in which case grades are not persisted).
+    """
+    edited_on = course.subtree_edited_on
+    return edited_on.isoformat() if edited_on is not None else None
+
+
+def _grading_policy_hash(course):
+    """
+    Returns a hash of the grading policy and grade cutoffs of `course`.
+    """
+    return hashlib.md5(json.dumps(course.grading_policy, sort_keys=True)).hexdigest()
+
+
+def _scores_to_json(scores):
+    """
+    Serializes a list of Score namedtuples to a JSON string.
+    """
+    return json.dumps([
+        [
+            score.earned, score.possible, score.graded, score.section,
+            unicode(score.module_id) if score.module_id else None,
+        ]
+        for score in scores
+    ])
 
 
-def _grade(student, request, course, keep_raw_scores):
+def _scores_from_json(scores_json):
+    """
+    Deserializes a list of Score namedtuples serialized by `_scores_to_json`.
+    """
+    return [
+        Score(earned, possible, graded, section, UsageKey.from_string(module_id) if module_id else None)
+        for earned, possible, graded, section, module_id in json.loads(scores_json)
+    ]
+
+
+def _grade_summary_to_json(grade_summary):
+    """
+    Serializes the grade summary computed by `_grade` (without raw scores) to a JSON string.
+    """
+    summary = {key: value for key, value in grade_summary.iteritems() if key not in ('totaled_scores', 'raw_scores')}
+    summary['totaled_scores'] = {
+        section_format: _scores_to_json(scores)
+        for section_format, scores in grade_summary['totaled_scores'].iteritems()
+    }
+    return json.dumps(summary)
+
+
+def _grade_summary_from_json(summary_json):
+    """
+    Deserializes a grade summary serialized by `_grade_summary_to_json`.
+    """
+    grade_summary = json.loads(summary_json)
+    grade_summary['totaled_scores'] = {
+        section_format: _scores_from_json(scores_json)
+        for section_format, scores_json in grade_summary['totaled_scores'].iteritems()
+    }
+    return grade_summary
+
+
+def _grade(student, request, course, keep_raw_scores, multi_user_cache=None):
     """
     Unwrapped version of "grade"
 
@@ -151,6 +227,13 @@ def _grade(student, request, course, keep_raw_scores):
       for every graded module
 
     More information on the format is in the docstring for CourseGrader.
+
+    If the ENABLE_PERSISTENT_GRADES feature is on, the computed subsection and
+    course grades are stored, and reused until either one of the student's
+    scores in them changes, or the course content or grading policy changes.
+
+    If `multi_user_cache` is a MultiUserFieldDataCache holding the student's
+    StudentModules, they are read from it rather than from the database.
     """
     grading_context = course.grading_context
     raw_scores = []
@@ -162,6 +245,51 @@ def _grade(student, request, course, keep_raw_scores):
         course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id)
     )
 
+    # some problems have state that is updated independently of interaction
+    # with the LMS, so they need to always be scored. (E.g. foldit.,
+    # combinedopenended). Scores registered with the submissions API can also
+    # change without the LMS knowing. Grades for sections containing either are
+    # never persisted.
+    def is_volatile(section):
+        """
+        Returns whether the grade of `section` has to be recomputed every time.
+        """
+        return any(
+            descriptor.always_recalculate_grades or descriptor.location.to_deprecated_string() in submissions_scores
+            for descriptor in section['xmoduledescriptors']
+        )
+
+    course_version = _course_version(course) if _persistent_grades_enabled() else None
+    persistent_grades = course_version is not None
+    if persistent_grades:
+        grading_policy_hash = _grading_policy_hash(course)
+        if not keep_raw_scores and not any(
+                is_volatile(section)
+                for sections in grading_context['graded_sections'].itervalues()
+                for section in sections
+        ):
+            try:
+                with manual_transaction():
+                    persisted_course_grade = PersistentCourseGrade.objects.get(
+                        user=student,
+                        course_id=course.id,
+                        course_version=course_version,
+                        grading_policy_hash=grading_policy_hash,
+                    )
+                return _grade_summary_from_json(persisted_course_grade.grade_summary)
+            except PersistentCourseGrade.DoesNotExist:
+                pass
+
+        with manual_transaction():
+            persisted_subsection_grades = {
+                subsection_grade.usage_key.map_into_course(course.id): subsection_grade
+                for subsection_grade in PersistentSubsectionGrade.objects.filter(
+                    user=student,
+                    course_id=course.id,
+                    course_version=course_version,
+                )
+            }
+
     totaled_scores = {}
     # This next complicated loop is just to collect the totaled_scores, which is
     # passed to the grader
@@ -171,34 +299,36 @@ def _grade(student, request, course, keep_raw_scores):
             section_descriptor = section['section_descriptor']
             section_name = section_descriptor.display_name_with_default
 
-            # some problems have state that is updated independently of interaction
-            # with the LMS, so they need to always be scored. (E.g. foldit.,
-            # combinedopenended)
-            should_grade_section = any(
-                descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
-            )
+            should_grade_section = is_volatile(section)
+            persist_section = persistent_grades and not should_grade_section
 
-            # If there are no problems that always have to be regraded, check to
-            # see if any of our locations are in the scores from the submissions
-            # API. If scores exist, we have to calculate grades for this section.
-            if not should_grade_section:
-                should_grade_section = any(
-                    descriptor.location.to_deprecated_string() in submissions_scores
-                    for descriptor in section['xmoduledescriptors']
-                )
-
-            if not should_grade_section:
-                with manual_transaction():
-                    should_grade_section = StudentModule.objects.filter(
-                        student=student,
-                        module_state_key__in=[
-                            descriptor.location for descriptor in section['xmoduledescriptors']
-                        ]
-                    ).exists()
+            persisted_subsection_grade = (
+                persisted_subsection_grades.get(section_descriptor.location) if persist_section else None
+            )
 
             # If we haven't seen a single problem in the section, we don't have
             # to grade it at all! We can assume 0%
-            if should_grade_section:
+            if persisted_subsection_grade is None and not should_grade_section:
+                locations = [descriptor.location for descriptor in section['xmoduledescriptors']]
+                if multi_user_cache is not None and all(
+                        multi_user_cache.is_prefetched(student, location) for location in locations
+                ):
+                    should_grade_section = multi_user_cache.has_state(student, locations)
+                else:
+                    with manual_transaction():
+                        should_grade_section = StudentModule.objects.filter(
+                            student=student,
+                            module_state_key__in=locations
+                        ).exists()
+
+            if persisted_subsection_grade is not None:
+                # None of the scores in this section changed since it was last graded
+                graded_total = Score(
+                    persisted_subsection_grade.earned, persisted_subsection_grade.possible, True, section_name, None
+                )
+                if keep_raw_scores:
+                    raw_scores += _scores_from_json(persisted_subsection_grade.scores)
+            elif should_grade_section:
                 scores = []
 
                 def create_module(descriptor):
@@ -206,13 +336,17 @@ def _grade(student, request, course, keep_raw_scores):
                     # TODO: We need the request to pass into here. If we could forego that, our arguments
                     # would be simpler
                     with manual_transaction():
-                        field_data_cache = FieldDataCache([descriptor], course.id, student)
+                        if multi_user_cache is not None:
+                            field_data_cache = multi_user_cache.field_data_cache([descriptor], student)
+                        else:
+                            field_data_cache = FieldDataCache([descriptor], course.id, student)
                     return get_module_for_descriptor(student, request, descriptor, field_data_cache, course.id)
 
                 for module_descriptor in yield_dynamic_descriptor_descendents(section_descriptor, create_module):
 
                     (correct, total) = get_score(
-                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores
+                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores,
+                        multi_user_cache=multi_user_cache
                     )
                     if correct is None and total is None:
                         continue
@@ -241,6 +375,23 @@ def _grade(student, request, course, keep_raw_scores):
                 _, graded_total = graders.aggregate_scores(scores, section_name)
                 if keep_raw_scores:
                     raw_scores += scores
+
+                if persist_section:
+                    with manual_transaction():
+                        SubsectionGradeProblem.record_problems(
+                            course.id,
+                            section_descriptor.location,
+                            [descriptor.location for descriptor in section['xmoduledescriptors']],
+                        )
+                        PersistentSubsectionGrade.save_grade(
+                            student,
+                            course.id,
+                            section_descriptor.location,
+                            course_version=course_version,
+                            earned=graded_total.earned,
+                            possible=graded_total.possible,
+                            scores=_scores_to_json(scores),
+                        )
             else:
                 graded_total = Score(0.0, 1.0, True, section_name, None)
 
@@ -266,6 +417,17 @@ def _grade(student, request, course, keep_raw_scores):
     letter_grade = grade_for_percentage(course.grade_cutoffs, grade_summary['percent'])
     grade_summary['grade'] = letter_grade
     grade_summary['totaled_scores'] = totaled_scores  	# make this available, eg for instructor download & debugging
+
+    if persistent_grades:
+        with manual_transaction():
+            PersistentCourseGrade.save_grade(
+                student,
+                course.id,
+                course_version=course_version,
+                grading_policy_hash=grading_policy_hash,
+                grade_summary=_grade_summary_to_json(grade_summary),
+            )
+
     if keep_raw_scores:
         # way to get all RAW scores out to instructor
         # so grader can be double-checked
@@ -407,7 +569,7 @@ def _progress_summary(student, request, course):
     return chapters
 
 
-def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None):
+def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None, multi_user_cache=None):
     """
     Return the score for a user on a problem, as a tuple (correct, total).
     e.g. (5,7) if you got 5 out of 7 points.
@@ -421,6 +583,8 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
            Can return None if user doesn't have access, or if something else went wrong.
     scores_cache: A dict of location names to (earned, possible) point tuples.
            If an entry is found in this cache, it takes precedence.
+    multi_user_cache: A MultiUserFieldDataCache to read the user's StudentModule from, if
+           it holds it.
     """
     scores_cache = scores_cache or {}
 
@@ -447,14 +611,17 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
         # These are not problems, and do not have a score
         return (None, None)
 
-    try:
-        student_module = StudentModule.objects.get(
-            student=user,
-            course_id=course_id,
-            module_state_key=problem_descriptor.location
-        )
-    except StudentModule.DoesNotExist:
-        student_module = None
+    if multi_user_cache is not None and multi_user_cache.is_prefetched(user, problem_descriptor.location):
+        student_module = multi_user_cache.get_student_module(user, problem_descriptor.location)
+    else:
+        try:
+            student_module = StudentModule.objects.get(
+                student=user,
+                course_id=course_id,
+                module_state_key=problem_descriptor.location
+            )
+        except StudentModule.DoesNotExist:
+            student_module = None
 
     if student_module is not None and student_module.max_grade is not None:
         correct = student_module.grade if student_module.grade is not None else 0
@@ -528,6 +695,25 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
     # grading that student.
     request = RequestFactory().get('/')
 
+    graded_locations = [descriptor.location for descriptor in course.grading_context['all_descriptors']]
+    students = iter(students)
+    for batch in iter(lambda: list(islice(students, GRADING_BATCH_SIZE)), []):
+        # Load the StudentModules of the whole batch up front, rather than
+        # querying them per student and per problem.
+        with manual_transaction():
+            multi_user_cache = MultiUserFieldDataCache(course.id, batch, graded_locations)
+        for student, gradeset, err_msg in _iterate_grades_for_batch(
+                course, batch, request, keep_raw_scores, multi_user_cache
+        ):
+            yield student, gradeset, err_msg
+
+
+def _iterate_grades_for_batch(course, students, request, keep_raw_scores, multi_user_cache):
+    """
+    Grades each of `students`, reading their StudentModules from `multi_user_cache`.
+
+    Yields the same tuples as iterate_grades_for.
+    """
     for student in students:
         with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
             try:
@@ -537,7 +723,9 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
                 # It's not pretty, but untangling that is currently beyond the
                 # scope of this feature.
                 request.session = {}
-                gradeset = grade(student, request, course, keep_raw_scores)
+                gradeset = grade(student, request, course, keep_raw_scores, multi_user_cache)
+                # The overrides resolved for this student won't be needed again
+                clear_override_cache()
                 yield student, gradeset, ""
             except Exception as exc:  # pylint: disable=broad-except
                 # Keep marching on even if this student couldn't be graded for
@@ -19,6 +19,10 @@ UserStateSummaryCache: A cache for Scope.user_state_summary
 PreferencesCache: A cache for Scope.preferences
 UserInfoCache: A cache for Scope.user_info
 DjangoOrmFieldCache: A base-class for single-row-per-field caches.
+
+:class:`MultiUserFieldDataCache`: A prefetch cache of the Scope.user_state of many users
+    in a course, used to build a :class:`FieldDataCache` for each of those users without
+    querying the database again.
 """
 
 import json
@@ -348,11 +352,12 @@ class UserStateCache(object):
     """
     Cache for Scope.user_state xblock field data.
     """
-    def __init__(self, user, course_id):
+    def __init__(self, user, course_id, multi_user_cache=None):
         self._cache = defaultdict(dict)
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
+        self._multi_user_cache = multi_user_cache
 
     def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
         """
@@ -364,9 +369,20 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
+        usage_keys = _all_usage_keys(xblocks, aside_types)
+        if self._multi_user_cache is not None:
+            for usage_key in list(usage_keys):
+                if self._multi_user_cache.is_prefetched(self.user, usage_key):
+                    field_state = self._multi_user_cache.get_state(self.user, usage_key)
+                    if field_state is not None:
+                        self._cache[usage_key] = field_state
+                    usage_keys.remove(usage_key)
+            if not usage_keys:
+                return
+
         block_field_state = self._client.get_many(
             self.user.username,
-            _all_usage_keys(xblocks, aside_types),
+            usage_keys,
         )
         for usage_key, field_state in block_field_state:
             self._cache[usage_key] = field_state
@@ -422,6 +438,8 @@ class UserStateCache(object):
             raise KeyValueMultiSaveError([])
         finally:
             self._cache.update(pending_updates)
+            if self._multi_user_cache is not None:
+                self._multi_user_cache.invalidate(self.user, pending_updates.keys())
 
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def get(self, kvs_key):
@@ -702,7 +720,7 @@ class FieldDataCache(object):
     A cache of django model objects needed to supply the data
     for a module and its descendants
     """
-    def __init__(self, descriptors, course_id, user, select_for_update=False, asides=None):
+    def __init__(self, descriptors, course_id, user, select_for_update=False, asides=None, multi_user_cache=None):
         """
         Find any courseware.models objects that are needed by any descriptor
         in descriptors. Attempts to minimize the number of queries to the database.
@@ -715,6 +733,8 @@ class FieldDataCache(object):
         user: The user for which to cache data
         select_for_update: Ignored
         asides: The list of aside types to load, or None to prefetch no asides.
+        multi_user_cache: A MultiUserFieldDataCache which already holds the Scope.user_state
+            of `user`, or None to load it from the database.
         """
         if asides is None:
             self.asides = []
@@ -729,6 +749,7 @@ class FieldDataCache(object):
             Scope.user_state: UserStateCache(
                 self.user,
                 self.course_id,
+                multi_user_cache,
             ),
             Scope.user_info: UserInfoCache(
                 self.user,
@@ -954,3 +975,97 @@ class FieldDataCache(object):
 
     def __len__(self):
         return sum(len(cache) for cache in self.cache.values())
+
+
+class MultiUserFieldDataCache(object):
+    """
+    A prefetch cache of the Scope.user_state of many users for a set of blocks in one course.
+
+    The StudentModules of every user and block are loaded with one query per chunk of
+    blocks, rather than with queries per user and per block. :meth:`field_data_cache`
+    then builds a :class:`FieldDataCache` for each of the users which reads its
+    Scope.user_state from this cache; the state of any block that was not prefetched
+    is still loaded from the database.
+    """
+    def __init__(self, course_id, users, usage_keys, chunk_size=500):
+        """
+        Arguments:
+            course_id (:class:`CourseKey`): The course to load state in.
+            users (list of :class:`User`): The users to load state for.
+            usage_keys (list of :class:`UsageKey`): The blocks to load state for.
+            chunk_size (int): The number of blocks to load state for per query.
+        """
+        assert isinstance(course_id, CourseKey)
+        self.course_id = course_id
+        self.usage_keys = set(usage_key.map_into_course(course_id) for usage_key in usage_keys)
+        self._user_ids = set(user.id for user in users)
+        self._student_modules = defaultdict(dict)
+        self._invalidated = defaultdict(set)
+
+        query = StudentModule.objects.chunked_filter(
+            'module_state_key__in',
+            self.usage_keys,
+            chunk_size=chunk_size,
+            student__id__in=self._user_ids,
+            course_id=course_id,
+        )
+        for student_module in query:
+            usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+            self._student_modules[student_module.student_id][usage_key] = student_module
+
+    def is_prefetched(self, user, usage_key):
+        """
+        Return whether this cache knows the state of `user` in the block `usage_key`.
+        """
+        return (
+            user.id in self._user_ids and
+            usage_key in self.usage_keys and
+            usage_key not in self._invalidated[user.id]
+        )
+
+    def get_student_module(self, user, usage_key):
+        """
+        Return the StudentModule of `user` for the block `usage_key`, or None if the
+        user has no state in it.
+
+        Raises: KeyError if the block was not prefetched for `user`.
+        """
+        if not self.is_prefetched(user, usage_key):
+            raise KeyError(usage_key)
+        return self._student_modules[user.id].get(usage_key)
+
+    def get_state(self, user, usage_key):
+        """
+        Return a dict of the stored Scope.user_state fields of `user` for the block `usage_key`,
+        or None if the user has no state in it.
+
+        Raises: KeyError if the block was not prefetched for `user`.
+        """
+        student_module = self.get_student_module(user, usage_key)
+        if student_module is None:
+            return None
+        if student_module.state is None:
+            return {}
+        return json.loads(student_module.state)
+
+    def has_state(self, user, usage_keys):
+        """
+        Return whether `user` has a StudentModule for any of the blocks in `usage_keys`.
+
+        Raises: KeyError if any of the blocks was not prefetched for `user`.
+        """
+        return any(self.get_student_module(user, usage_key) is not None for usage_key in usage_keys)
+
+    def invalidate(self, user, usage_keys):
+        """
+        Stop serving the prefetched state of `user` for the blocks `usage_keys`,
+        because it has been changed since it was loaded.
+        """
+        self._invalidated[user.id].update(usage_keys)
+
+    def field_data_cache(self, descriptors, user, asides=None):
+        """
+        Return a :class:`FieldDataCache` for `user` and `descriptors` which reads the
+        Scope.user_state of the prefetched blocks from this cache.
+        """
+        return FieldDataCache(descriptors, self.course_id, user, asides=asides, multi_user_cache=self)
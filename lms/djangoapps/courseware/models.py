@@ -18,10 +18,12 @@ import itertools
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver, Signal
 
 from model_utils.models import TimeStampedModel
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from student.models import user_by_anonymous_id
 from submissions.models import score_set, score_reset
 
@@ -298,6 +300,150 @@ class StudentFieldOverride(TimeStampedModel):
     value = models.TextField(default='null')
 
 
+class PersistentSubsectionGrade(TimeStampedModel):
+    """
+    The most recently computed grade of a student for a graded subsection.
+
+    This is used by `courseware.grades` so that subsections whose problems have
+    not been rescored since the grade was computed don't need every problem in
+    them to be loaded again. A row is deleted whenever the score of one of the
+    problems it contains changes, as recorded by `SubsectionGradeProblem`.
+    """
+    user = models.ForeignKey(User, db_index=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    usage_key = LocationKeyField(max_length=255)
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('user', 'course_id', 'usage_key'),)
+
+    # The version of the course content that this grade was computed against
+    course_version = models.CharField(max_length=255)
+
+    # The graded total of the subsection
+    earned = models.FloatField()
+    possible = models.FloatField()
+
+    # The scores of the individual problems in the subsection, stored as JSON
+    scores = models.TextField(default='[]')
+
+    @classmethod
+    def save_grade(cls, user, course_id, usage_key, **values):
+        """
+        Create or update the grade of `user` for the subsection `usage_key`.
+        """
+        grade, created = cls.objects.get_or_create(
+            user=user, course_id=course_id, usage_key=usage_key, defaults=values
+        )
+        if not created:
+            for name, value in values.iteritems():
+                setattr(grade, name, value)
+            grade.save()
+        return grade
+
+    def __unicode__(self):
+        return u"[PersistentSubsectionGrade] {}: {} {} = {}/{}".format(
+            self.user, self.course_id, self.usage_key, self.earned, self.possible
+        )
+
+
+class SubsectionGradeProblem(models.Model):
+    """
+    A problem which may be in a graded subsection, whether or not it was scored
+    for the student when the subsection was graded.
+
+    These are recorded when subsection grades are persisted, so that the grades
+    depending on the score of a problem can be found without loading the course.
+    """
+    course_id = CourseKeyField(max_length=255)
+    problem_key = LocationKeyField(max_length=255)
+    subsection_key = LocationKeyField(max_length=255)
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('course_id', 'problem_key', 'subsection_key'),)
+
+    @classmethod
+    def record_problems(cls, course_id, subsection_key, problem_keys):
+        """
+        Record that the problems `problem_keys` may be in the subsection `subsection_key`.
+        """
+        recorded_problem_keys = set(
+            problem.problem_key
+            for problem in cls.objects.filter(course_id=course_id, subsection_key=subsection_key)
+        )
+        for problem_key in problem_keys:
+            if problem_key not in recorded_problem_keys:
+                cls.objects.get_or_create(course_id=course_id, problem_key=problem_key, subsection_key=subsection_key)
+
+    def __unicode__(self):
+        return u"[SubsectionGradeProblem] {}: {} in {}".format(self.course_id, self.problem_key, self.subsection_key)
+
+
+class PersistentCourseGrade(TimeStampedModel):
+    """
+    The most recently computed grade summary of a student for a course.
+
+    The summary is only valid for the course version and grading policy it was
+    computed with. It is deleted whenever any of the student's scores in the
+    course change.
+    """
+    user = models.ForeignKey(User, db_index=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('user', 'course_id'),)
+
+    # The version of the course content that this grade was computed against
+    course_version = models.CharField(max_length=255)
+
+    # A hash of the grading policy and grade cutoffs this grade was computed with
+    grading_policy_hash = models.CharField(max_length=255)
+
+    # The grade summary returned by `courseware.grades.grade`, stored as JSON
+    grade_summary = models.TextField()
+
+    @classmethod
+    def save_grade(cls, user, course_id, **values):
+        """
+        Create or update the course grade of `user` for the course `course_id`.
+        """
+        grade, created = cls.objects.get_or_create(user=user, course_id=course_id, defaults=values)
+        if not created:
+            for name, value in values.iteritems():
+                setattr(grade, name, value)
+            grade.save()
+        return grade
+
+    def __unicode__(self):
+        return u"[PersistentCourseGrade] {}: {} ({})".format(self.user, self.course_id, self.course_version)
+
+
+def invalidate_persistent_grades(user_id, course_id, usage_key):
+    """
+    Delete the persisted grades of the user with id `user_id` which depend on the
+    score of the problem `usage_key` in the course `course_id`.
+    """
+    PersistentCourseGrade.objects.filter(user__id=user_id, course_id=course_id).delete()
+    subsection_keys = [
+        problem.subsection_key
+        for problem in SubsectionGradeProblem.objects.filter(course_id=course_id, problem_key=usage_key)
+    ]
+    if subsection_keys:
+        PersistentSubsectionGrade.objects.filter(
+            user__id=user_id, course_id=course_id, usage_key__in=subsection_keys
+        ).delete()
+
+
+@receiver(post_delete, sender=StudentModule)
+def student_module_deleted_handler(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Deleting a StudentModule (e.g. when resetting a student's attempts) removes
+    the student's score for it, so any grade depending on it is stale.
+    """
+    invalidate_persistent_grades(
+        instance.student_id, instance.course_id, instance.module_state_key.map_into_course(instance.course_id)
+    )
+
+
 # Signal that indicates that a user's score for a problem has been updated.
 # This signal is generated when a scoring event occurs either within the core
 # platform or in the Submissions module. Note that this signal will be triggered
@@ -394,3 +540,18 @@ def submissions_score_reset_handler(sender, **kwargs):  # pylint: disable=unused
             u"Failed to process score_reset signal from Submissions API. "
             "user: %s, course_id: %s, usage_id: %s", user, course_id, usage_id
         )
+
+
+@receiver(SCORE_CHANGED)
+def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Consume the SCORE_CHANGED signal to invalidate the persisted grades which
+    depend on the changed score.
+    """
+    try:
+        course_id = CourseKey.from_string(kwargs['course_id'])
+        usage_key = UsageKey.from_string(kwargs['usage_id']).map_into_course(course_id)
+    except (KeyError, InvalidKeyError):
+        log.exception(u"Failed to invalidate persistent grades for score change: %s", kwargs)
+        return
+    invalidate_persistent_grades(kwargs.get('user_id'), course_id, usage_key)
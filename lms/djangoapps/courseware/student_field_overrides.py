@@ -4,7 +4,7 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_override_cache
 from .models import StudentFieldOverride
 
 
@@ -65,6 +65,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    clear_override_cache()
 
 
 def clear_override_for_user(user, block, name):
@@ -80,5 +81,6 @@ def clear_override_for_user(user, block, name):
             student_id=user.id,
             location=block.location,
             field=name).delete()
+        clear_override_cache()
     except StudentFieldOverride.DoesNotExist:
         pass
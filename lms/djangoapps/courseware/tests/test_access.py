@@ -16,9 +16,12 @@ from xmodule.course_module import (
     CATALOG_VISIBILITY_CATALOG_AND_ABOUT, CATALOG_VISIBILITY_ABOUT,
     CATALOG_VISIBILITY_NONE
 )
+from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
 from util.milestones_helpers import (
     set_prerequisite_courses,
     fulfill_course_milestone,
@@ -297,7 +300,30 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
         self.assertTrue(access._has_access_course_desc(staff, 'see_in_catalog', course))
         self.assertTrue(access._has_access_course_desc(staff, 'see_about_page', course))
 
-    @patch.dict("django.conf.settings.FEATURES", {'ENABLE_PREREQUISITE_COURSES': True, 'MILESTONES_APP': True})
+    def test_access_on_course_overview(self):
+        """
+        Tests that CourseOverviews grant the same access as their CourseDescriptors
+        """
+        tomorrow = datetime.datetime.now(pytz.utc) + datetime.timedelta(days=1)
+        course = CourseFactory.create(start=tomorrow, catalog_visibility=CATALOG_VISIBILITY_ABOUT)
+        course_overview = CourseOverview.get_from_id(course.id)
+        staff = StaffFactory.create(course_key=course.id)
+
+        for user in (self.student, staff, self.global_staff):
+            for action in ('load', 'see_exists', 'see_in_catalog', 'see_about_page', 'enroll'):
+                self.assertEqual(
+                    bool(access.has_access(user, action, course_overview)),
+                    bool(access.has_access(user, action, course)),
+                    (user, action)
+                )
+
+        course.visible_to_staff_only = True
+        course.start = datetime.datetime(2014, 1, 1, tzinfo=pytz.utc)
+        self.store.update_item(course, ModuleStoreEnum.UserID.test)
+        course_overview = CourseOverview.get_from_id(course.id)
+        self.assertFalse(access.has_access(self.student, 'load', course_overview))
+        self.assertTrue(access.has_access(staff, 'load', course_overview))
+
     def test_access_on_course_with_pre_requisites(self):
         """
         Test course access when a course has pre-requisite course yet to be completed
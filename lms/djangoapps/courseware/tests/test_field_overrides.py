@@ -4,13 +4,18 @@ Tests for `field_overrides` module.
 import unittest
 from nose.plugins.attrib import attr
 
+from celery.signals import task_postrun
 from django.test import TestCase
 from django.test.utils import override_settings
+from mock import Mock
+from request_cache.middleware import RequestCache
 from xblock.field_data import DictFieldData
 
 from ..field_overrides import (
+    clear_override_cache,
     disable_overrides,
     FieldOverrideProvider,
+    get_override_stats,
     OverrideFieldData,
     resolve_dotted,
 )
@@ -30,6 +35,8 @@ class OverrideFieldDataTests(TestCase):
     def setUp(self):
         super(OverrideFieldDataTests, self).setUp()
         OverrideFieldData.provider_classes = None
+        RequestCache().clear_request_cache()
+        self.addCleanup(RequestCache().clear_request_cache)
 
     def tearDown(self):
         super(OverrideFieldDataTests, self).tearDown()
@@ -85,6 +92,38 @@ class OverrideFieldDataTests(TestCase):
         with disable_overrides():
             self.assertEqual(data.get('block', 'foo'), 'baz')
 
+    def test_overrides_cached(self):
+        data = self.make_one()
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        self.assertEqual(data.get('block', 'bees'), 'knees')
+        self.assertEqual(get_override_stats(), {'provider_calls': 2, 'cache_hits': 1})
+
+        clear_override_cache()
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        self.assertEqual(get_override_stats(), {'provider_calls': 1, 'cache_hits': 0})
+
+    def test_cache_cleared_by_celery_tasks(self):
+        data = self.make_one()
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        task_postrun.send(sender=None)
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        self.assertEqual(get_override_stats(), {'provider_calls': 1, 'cache_hits': 0})
+
+    def test_cache_kept_by_eager_celery_tasks(self):
+        data = self.make_one()
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        task_postrun.send(sender=None, task=Mock(request=Mock(is_eager=True)))
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        self.assertEqual(get_override_stats(), {'provider_calls': 1, 'cache_hits': 1})
+
+    def test_cache_bypassed_when_disabled(self):
+        data = self.make_one()
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        with disable_overrides():
+            self.assertEqual(data.get('block', 'foo'), 'bar')
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+
     @override_settings(FIELD_OVERRIDE_PROVIDERS=())
     def test_no_overrides_configured(self):
         data = self.make_one()
@@ -1,18 +1,25 @@
 """
 Test grade calculation.
 """
+from django.conf import settings
 from django.http import Http404
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
 from mock import patch
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
+from capa.tests.response_xml_factory import OptionResponseXMLFactory
 from courseware.grades import grade, iterate_grades_for
+from courseware.models import PersistentCourseGrade, PersistentSubsectionGrade, SubsectionGradeProblem, SCORE_CHANGED
+from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.factories import check_mongo_calls, CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
-def _grade_with_errors(student, request, course, keep_raw_scores=False):
+def _grade_with_errors(student, request, course, keep_raw_scores=False, multi_user_cache=None):
     """This fake grade method will throw exceptions for student3 and
     student4, but allow any other students to go through normal grading.
 
@@ -23,7 +30,7 @@ def _grade_with_errors(student, request, course, keep_raw_scores=False):
     if student.username in ['student3', 'student4']:
         raise Exception("I don't like {}".format(student.username))
 
-    return grade(student, request, course, keep_raw_scores=keep_raw_scores)
+    return grade(student, request, course, keep_raw_scores=keep_raw_scores, multi_user_cache=multi_user_cache)
 
 
 @attr('shard_1')
@@ -121,3 +128,170 @@ class TestGradeIteration(ModuleStoreTestCase):
                 students_to_errors[student] = err_msg
 
         return students_to_gradesets, students_to_errors
+
+
+@attr('shard_1')
+class TestBulkGrading(ModuleStoreTestCase):
+    """
+    Test that iterate_grades_for loads the StudentModules of many students at once.
+    """
+    def setUp(self):
+        super(TestBulkGrading, self).setUp()
+        course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+        section = ItemFactory.create(
+            parent_location=chapter.location,
+            category='sequential',
+            metadata={'graded': True, 'format': 'Homework'},
+        )
+        problem_xml = OptionResponseXMLFactory().build_xml(
+            question_text='The correct answer is Correct',
+            options=['Correct', 'Incorrect'],
+            correct_option='Correct',
+        )
+        self.problems = [
+            ItemFactory.create(parent_location=section.location, category='problem', data=problem_xml)
+            for __ in range(2)
+        ]
+        self.course = modulestore().get_course(course.id)
+        self.students = [UserFactory.create() for __ in range(3)]
+        # The first student answered both problems, the second one of them, and the third none
+        for student, answered in zip(self.students, (self.problems, self.problems[:1], [])):
+            for problem in answered:
+                StudentModuleFactory.create(
+                    student=student,
+                    course_id=self.course.id,
+                    module_state_key=problem.location,
+                    grade=1,
+                    max_grade=1,
+                )
+
+    def test_grades_match_single_student_grading(self):
+        request = RequestFactory().get('/')
+        request.session = {}
+        for student, gradeset, err_msg in iterate_grades_for(self.course, self.students):
+            self.assertEqual(err_msg, '')
+            request.user = student
+            self.assertEqual(gradeset['percent'], grade(student, request, self.course)['percent'])
+
+    def test_student_modules_are_not_queried_per_student(self):
+        with patch('courseware.grades.StudentModule') as mock_student_module:
+            percents = [gradeset['percent'] for __, gradeset, __ in iterate_grades_for(self.course, self.students)]
+        self.assertGreater(percents[0], percents[1])
+        self.assertGreater(percents[1], percents[2])
+        self.assertEqual(percents[2], 0.0)
+        self.assertFalse(mock_student_module.objects.get.called)
+        self.assertFalse(mock_student_module.objects.filter.called)
+
+
+PERSISTENT_GRADES_FEATURES = dict(settings.FEATURES, ENABLE_PERSISTENT_GRADES=True)
+
+
+@attr('shard_1')
+@override_settings(FEATURES=PERSISTENT_GRADES_FEATURES)
+class TestPersistentGrades(ModuleStoreTestCase):
+    """
+    Test that grades are persisted, reused, and invalidated when scores change.
+    """
+    def setUp(self):
+        super(TestPersistentGrades, self).setUp()
+        course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+        section = ItemFactory.create(
+            parent_location=chapter.location,
+            category='sequential',
+            metadata={'graded': True, 'format': 'Homework'},
+        )
+        self.problem = ItemFactory.create(
+            parent_location=section.location,
+            category='problem',
+            data=OptionResponseXMLFactory().build_xml(
+                question_text='The correct answer is Correct',
+                options=['Correct', 'Incorrect'],
+                correct_option='Correct',
+            ),
+        )
+        self.section = section
+        self.course = modulestore().get_course(course.id)
+        self.student = UserFactory.create()
+        self.request = RequestFactory().get('/')
+        self.request.user = self.student
+        self.request.session = {}
+        StudentModuleFactory.create(
+            student=self.student,
+            course_id=self.course.id,
+            module_state_key=self.problem.location,
+            grade=1,
+            max_grade=1,
+        )
+
+    def _grade(self, **kwargs):
+        """
+        Grade the student in the test course.
+        """
+        return grade(self.student, self.request, self.course, **kwargs)
+
+    def test_grades_are_persisted(self):
+        summary = self._grade()
+        self.assertEqual(summary['percent'], 1.0)
+
+        subsection_grade = PersistentSubsectionGrade.objects.get(user=self.student, course_id=self.course.id)
+        self.assertEqual(subsection_grade.usage_key, self.section.location)
+        self.assertEqual((subsection_grade.earned, subsection_grade.possible), (1, 1))
+        self.assertTrue(PersistentCourseGrade.objects.filter(user=self.student, course_id=self.course.id).exists())
+
+    def test_persisted_grade_is_reused(self):
+        summary = self._grade()
+        with patch('courseware.grades.get_score') as mock_get_score:
+            for persisted_summary in (self._grade(), self._grade(keep_raw_scores=True)):
+                self.assertEqual(persisted_summary['percent'], summary['percent'])
+                self.assertEqual(persisted_summary['grade'], summary['grade'])
+                self.assertEqual(persisted_summary['totaled_scores'], summary['totaled_scores'])
+        self.assertFalse(mock_get_score.called)
+
+    def test_score_change_invalidates(self):
+        self._grade()
+        with check_mongo_calls(0):
+            SCORE_CHANGED.send(
+                sender=None,
+                points_possible=1,
+                points_earned=0,
+                user_id=self.student.id,
+                course_id=unicode(self.course.id),
+                usage_id=unicode(self.problem.location),
+            )
+        self.assertFalse(PersistentSubsectionGrade.objects.filter(user=self.student).exists())
+        self.assertFalse(PersistentCourseGrade.objects.filter(user=self.student).exists())
+
+    def test_unscored_problem_score_change_invalidates(self):
+        # e.g. problems which weren't accessible yet, or in another content group
+        with patch('courseware.grades.get_score', return_value=(None, None)):
+            self._grade()
+        subsection_grade = PersistentSubsectionGrade.objects.get(user=self.student, course_id=self.course.id)
+        self.assertEqual(subsection_grade.scores, '[]')
+        self.assertTrue(SubsectionGradeProblem.objects.filter(
+            course_id=self.course.id, problem_key=self.problem.location, subsection_key=self.section.location
+        ).exists())
+
+        SCORE_CHANGED.send(
+            sender=None,
+            points_possible=1,
+            points_earned=1,
+            user_id=self.student.id,
+            course_id=unicode(self.course.id),
+            usage_id=unicode(self.problem.location),
+        )
+        self.assertFalse(PersistentSubsectionGrade.objects.filter(user=self.student).exists())
+
+    def test_grading_policy_change_recomputes(self):
+        self._grade()
+        self.course.grade_cutoffs = {'Pass': 0.9}
+        with patch('courseware.grades.PersistentCourseGrade.save_grade') as mock_save_grade:
+            self.assertEqual(self._grade()['grade'], 'Pass')
+        self.assertTrue(mock_save_grade.called)
+
+    @override_settings(FEATURES=dict(settings.FEATURES, ENABLE_PERSISTENT_GRADES=False))
+    def test_disabled(self):
+        self._grade()
+        self.assertFalse(PersistentSubsectionGrade.objects.exists())
+        self.assertFalse(PersistentCourseGrade.objects.exists())
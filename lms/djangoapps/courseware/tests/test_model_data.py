@@ -7,7 +7,7 @@ from nose.plugins.attrib import attr
 from functools import partial
 
 from courseware.model_data import DjangoKeyValueStore
-from courseware.model_data import InvalidScopeError, FieldDataCache
+from courseware.model_data import InvalidScopeError, FieldDataCache, MultiUserFieldDataCache
 from courseware.models import StudentModule
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
 
@@ -273,6 +273,58 @@ class TestMissingStudentModule(TestCase):
             self.assertFalse(self.kvs.has(user_state_key('a_field')))
 
 
+@attr('shard_1')
+class TestMultiUserFieldDataCache(TestCase):
+    """Tests for prefetching the user_state of several users at once"""
+    def setUp(self):
+        super(TestMultiUserFieldDataCache, self).setUp()
+        self.users = []
+        for value in ('value_1', 'value_2'):
+            student_module = StudentModuleFactory(state=json.dumps({'a_field': value}))
+            self.users.append(student_module.student)
+        self.users.append(UserFactory.create(username='no_state'))
+        self.descriptor = mock_descriptor([mock_field(Scope.user_state, 'a_field')])
+
+        # The state of every user is loaded with a single query
+        with self.assertNumQueries(1):
+            self.multi_user_cache = MultiUserFieldDataCache(course_id, self.users, [location('usage_id')])
+
+    def _kvs(self, user):
+        """Return a DjangoKeyValueStore for `user` backed by the multi-user cache"""
+        return DjangoKeyValueStore(self.multi_user_cache.field_data_cache([self.descriptor], user))
+
+    def test_get_prefetched_field(self):
+        with self.assertNumQueries(0):
+            for user, value in zip(self.users, ('value_1', 'value_2')):
+                key = DjangoKeyValueStore.Key(Scope.user_state, user.id, location('usage_id'), 'a_field')
+                self.assertEquals(value, self._kvs(user).get(key))
+
+    def test_missing_student_module(self):
+        user = self.users[2]
+        key = DjangoKeyValueStore.Key(Scope.user_state, user.id, location('usage_id'), 'a_field')
+        with self.assertNumQueries(0):
+            self.assertFalse(self._kvs(user).has(key))
+            self.assertFalse(self.multi_user_cache.has_state(user, [location('usage_id')]))
+        self.assertTrue(self.multi_user_cache.has_state(self.users[0], [location('usage_id')]))
+
+    def test_block_not_prefetched(self):
+        descriptor = mock_descriptor([mock_field(Scope.user_state, 'a_field')])
+        descriptor.scope_ids = ScopeIds('user1', 'mock_problem', location('def_id'), location('other_usage_id'))
+        self.assertFalse(self.multi_user_cache.is_prefetched(self.users[0], location('other_usage_id')))
+        with self.assertRaises(KeyError):
+            self.multi_user_cache.get_student_module(self.users[0], location('other_usage_id'))
+        # The state of blocks that weren't prefetched is loaded from the database
+        with self.assertNumQueries(1):
+            self.multi_user_cache.field_data_cache([descriptor], self.users[0])
+
+    def test_set_invalidates(self):
+        user = self.users[0]
+        key = DjangoKeyValueStore.Key(Scope.user_state, user.id, location('usage_id'), 'a_field')
+        self._kvs(user).set(key, 'new_value')
+        self.assertFalse(self.multi_user_cache.is_prefetched(user, location('usage_id')))
+        self.assertEquals('new_value', self._kvs(user).get(key))
+
+
 @attr('shard_1')
 class StorageTestBase(object):
     """
@@ -1,10 +1,11 @@
 """
 Module to define url helpers functions
 """
-from xmodule.modulestore.search import path_to_location, navigation_index
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.search import navigation_index
 from django.core.urlresolvers import reverse
 
+from openedx.core.djangoapps.content.course_structures.path_index import get_path_to_location
+
 
 def get_redirect_url(course_key, usage_key):
     """ Returns the redirect url back to courseware
@@ -20,7 +21,7 @@ def get_redirect_url(course_key, usage_key):
         Redirect url string
     """
 
-    (course_key, chapter, section, position) = path_to_location(modulestore(), usage_key)
+    (course_key, chapter, section, position) = get_path_to_location(course_key, usage_key)
 
     # choose the appropriate view (and provide the necessary args) based on the
     # args provided by the redirect.
@@ -35,6 +35,9 @@ AVAILABLE_FEATURES = STUDENT_FEATURES + PROFILE_FEATURES
 COURSE_REGISTRATION_FEATURES = ('code', 'course_id', 'created_by', 'created_at')
 COUPON_FEATURES = ('code', 'course_id', 'percentage_discount', 'description', 'expiration_date', 'is_active')
 
+# Number of students read from the database at a time by iter_enrolled_students_features
+STUDENT_FEATURES_BATCH_SIZE = 1000
+
 
 def sale_order_record_features(course_id, features):
     """
@@ -159,6 +162,16 @@ def enrolled_students_features(course_key, features):
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
     """
+    return list(iter_enrolled_students_features(course_key, features))
+
+
+def iter_enrolled_students_features(course_key, features, batch_size=STUDENT_FEATURES_BATCH_SIZE):
+    """
+    Generate the student features of `enrolled_students_features` one student at a time.
+
+    Students are read from the database in batches of `batch_size`, so that
+    the features of every student of a large course are never all in memory.
+    """
     include_cohort_column = 'cohort' in features
 
     students = User.objects.filter(
@@ -206,7 +219,15 @@ def enrolled_students_features(course_key, features):
             )
         return student_dict
 
-    return [extract_student(student, features) for student in students]
+    # Page through the students by username (which is unique), rather than by
+    # offset, so that every batch is an index range scan.
+    batch = list(students[:batch_size])
+    while batch:
+        for student in batch:
+            yield extract_student(student, features)
+        if len(batch) < batch_size:
+            break
+        batch = list(students.filter(username__gt=batch[-1].username)[:batch_size])
 
 
 def coupon_codes_features(features, coupons_list):
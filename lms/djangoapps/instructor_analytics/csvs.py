@@ -64,19 +64,25 @@ def format_dictlist(dictlist, features):
     }
     """
 
-    def dict_to_entry(dct):
-        """ Convert dictionary to a list for a csv row """
-        relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
-        ordered = sorted(relevant_items, key=lambda (k, v): header.index(k))
-        vals = [v for (_, v) in ordered]
-        return vals
-
     header = features
-    datarows = map(dict_to_entry, dictlist)
+    datarows = list(format_dictrows(dictlist, features))
 
     return header, datarows
 
 
+def format_dictrows(dictlist, features):
+    """
+    Generate the data rows of `format_dictlist` one at a time.
+
+    `dictlist` may be any iterable of dictionaries, so rows can be streamed
+    without building the whole table in memory.
+    """
+    for dct in dictlist:
+        relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
+        ordered = sorted(relevant_items, key=lambda (k, v): features.index(k))
+        yield [v for (_, v) in ordered]
+
+
 def format_instances(instances, features):
     """
     Convert a list of instances into a header list and datarows list.
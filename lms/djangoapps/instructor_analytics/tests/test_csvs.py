@@ -3,7 +3,7 @@
 from django.test import TestCase
 from nose.tools import raises
 
-from instructor_analytics.csvs import create_csv_response, format_dictlist, format_instances
+from instructor_analytics.csvs import create_csv_response, format_dictlist, format_dictrows, format_instances
 
 
 class TestAnalyticsCSVS(TestCase):
@@ -66,6 +66,11 @@ class TestAnalyticsFormatDictlist(TestCase):
         self.assertEqual(header, ideal_header)
         self.assertEqual(datarows, ideal_datarows)
 
+    def test_format_dictrows(self):
+        dictrows = format_dictrows(iter([{'label1': 'value-1,1', 'label2': 'value-1,2'}]), ['label2', 'label1'])
+        self.assertEqual(next(dictrows), ['value-1,2', 'value-1,1'])
+        self.assertEqual(list(dictrows), [])
+
     def test_format_dictlist_empty(self):
         header, datarows = format_dictlist([], [])
         self.assertEqual(header, [])
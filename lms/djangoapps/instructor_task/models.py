@@ -20,6 +20,7 @@ import json
 import hashlib
 import os.path
 import urllib
+import zlib
 
 from boto.s3.connection import S3Connection
 from boto.s3.key import Key
@@ -190,12 +191,15 @@ class InstructorTask(models.Model):
         return json.dumps({'message': 'Task revoked before running'})
 
 
+# suffix of the partial CSV files written by report subtasks before they are merged
+PARTIAL_REPORT_SUFFIX = '.part'
+
+
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Rows are streamed to storage as they are generated, so reports
+    can be written (and read back) without holding the whole dataset in memory.
     """
     @classmethod
     def from_config(cls):
@@ -211,13 +215,28 @@ class ReportStore(object):
 
     def _get_utf8_encoded_rows(self, rows):
         """
-        Given a list of `rows` containing unicode strings, return a
-        new list of rows with those strings encoded as utf-8 for CSV
-        compatibility.
+        Given an iterable of `rows` containing unicode strings, generate
+        the rows with those strings encoded as utf-8 for CSV compatibility.
         """
         for row in rows:
             yield [unicode(item).encode('utf-8') for item in row]
 
+    def _get_unicode_decoded_rows(self, csv_file):
+        """
+        Given a file-like object `csv_file` containing a utf-8 encoded CSV
+        file, return its rows with each item decoded to unicode.
+        """
+        for row in csv.reader(csv_file):
+            yield [item.decode('utf-8') for item in row]
+
+    @staticmethod
+    def is_report_file(filename):
+        """
+        Returns whether `filename` is a finished report, as opposed to a
+        partial file written by one chunk of a report generated in parallel.
+        """
+        return not filename.endswith(PARTIAL_REPORT_SUFFIX)
+
 
 class S3ReportStore(ReportStore):
     """
@@ -231,6 +250,9 @@ class S3ReportStore(ReportStore):
     conventions on where files are stored to know what to display. Clients using
     this class can name the final file whatever they want.
     """
+    # S3 requires every part of a multipart upload but the last to be at least 5MB
+    MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
     def __init__(self, bucket_name, root_path):
         self.root_path = root_path
 
@@ -308,19 +330,87 @@ class S3ReportStore(ReportStore):
     def store_rows(self, course_id, filename, rows):
         """
         Given a `course_id`, `filename`, and `rows` (each row is an iterable of
-        strings), create a buffer that is a gzip'd csv file, and then `store()`
-        that buffer.
+        strings), write the rows to a gzip'd csv file, and upload it to S3 using
+        a multipart upload.
+
+        `rows` may be any iterable, including a generator. Rows are compressed
+        and uploaded in parts of `MULTIPART_PART_SIZE` bytes as they are
+        generated, so the whole file is never held in memory. The file only
+        becomes visible once the last part has been uploaded.
 
         Even though we store it in gzip format, browsers will transparently
         download and decompress it. Filenames should end in `.csv`, not `.gz`.
         """
+        key = self.key_for(course_id, filename)
+        multipart_upload = self.bucket.initiate_multipart_upload(
+            key.key,
+            headers={
+                "Content-Encoding": "gzip",
+                "Content-Type": "text/csv",
+            }
+        )
+
         output_buffer = StringIO()
         gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
         csvwriter = csv.writer(gzip_file)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        gzip_file.close()
+        part_num = 0
+        try:
+            for row in self._get_utf8_encoded_rows(rows):
+                csvwriter.writerow(row)
+                if output_buffer.tell() >= self.MULTIPART_PART_SIZE:
+                    part_num += 1
+                    self._upload_part(multipart_upload, part_num, output_buffer)
+            gzip_file.close()
+            part_num += 1
+            self._upload_part(multipart_upload, part_num, output_buffer)
+            multipart_upload.complete_upload()
+        except Exception:
+            multipart_upload.cancel_upload()
+            raise
+
+    @staticmethod
+    def _upload_part(multipart_upload, part_num, output_buffer):
+        """
+        Upload the contents of `output_buffer` as part `part_num` of
+        `multipart_upload`, then empty the buffer.
+        """
+        output_buffer.seek(0)
+        multipart_upload.upload_part_from_file(output_buffer, part_num)
+        output_buffer.seek(0)
+        output_buffer.truncate()
+
+    def read_rows(self, course_id, filename):
+        """
+        Generate the rows of the gzip'd csv file `filename` previously stored
+        by `store_rows()`, with each item decoded to unicode. The file is
+        downloaded and decompressed incrementally.
+        """
+        # Iterating over a boto Key reads it in chunks of `Key.BufferSize` bytes
+        key = self.key_for(course_id, filename)
+        return self._get_unicode_decoded_rows(self._gunzip_lines(key))
 
-        self.store(course_id, filename, output_buffer)
+    @staticmethod
+    def _gunzip_lines(chunks):
+        """
+        Given an iterable of the `chunks` of a gzip'd file, generate the lines
+        of the decompressed file.
+        """
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        pending = ''
+        for chunk in chunks:
+            lines = (pending + decompressor.decompress(chunk)).split('\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line + '\n'
+        pending += decompressor.flush()
+        if pending:
+            yield pending
+
+    def delete(self, course_id, filename):
+        """
+        Delete the file `filename` stored for `course_id`.
+        """
+        self.key_for(course_id, filename).delete()
 
     def links_for(self, course_id):
         """
@@ -331,6 +421,7 @@ class S3ReportStore(ReportStore):
         return [
             (key.key.split("/")[-1], key.generate_url(expires_in=300))
             for key in sorted(self.bucket.list(prefix=course_dir.key), reverse=True, key=lambda k: k.last_modified)
+            if self.is_report_file(key.key)
         ]
 
 
@@ -371,6 +462,12 @@ class LocalFSReportStore(ReportStore):
         """Return the full path to a given file for a given course."""
         return os.path.join(self.root_path, urllib.quote(course_id.to_deprecated_string(), safe=''), filename)
 
+    def _make_course_dir(self, full_path):
+        """Create the course directory containing `full_path`, if needed."""
+        directory = os.path.dirname(full_path)
+        if not os.path.exists(directory):
+            os.mkdir(directory)
+
     def store(self, course_id, filename, buff):
         """
         Given the `course_id` and `filename`, store the contents of `buff` in
@@ -379,9 +476,7 @@ class LocalFSReportStore(ReportStore):
         to string using `.getvalue()`).
         """
         full_path = self.path_to(course_id, filename)
-        directory = os.path.dirname(full_path)
-        if not os.path.exists(directory):
-            os.mkdir(directory)
+        self._make_course_dir(full_path)
 
         with open(full_path, "wb") as f:
             f.write(buff.getvalue())
@@ -390,12 +485,37 @@ class LocalFSReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of strings),
         write this data out.
+
+        `rows` may be any iterable, including a generator. Rows are written to
+        a temporary file as they are generated, which replaces `filename` once
+        it is complete.
         """
-        output_buffer = StringIO()
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        full_path = self.path_to(course_id, filename)
+        self._make_course_dir(full_path)
+
+        temp_path = full_path + PARTIAL_REPORT_SUFFIX
+        try:
+            with open(temp_path, "wb") as f:
+                csv.writer(f).writerows(self._get_utf8_encoded_rows(rows))
+        except Exception:
+            os.remove(temp_path)
+            raise
+        os.rename(temp_path, full_path)
+
+    def read_rows(self, course_id, filename):
+        """
+        Generate the rows of the csv file `filename` previously stored by
+        `store_rows()`, with each item decoded to unicode.
+        """
+        with open(self.path_to(course_id, filename), "rb") as f:
+            for row in self._get_unicode_decoded_rows(f):
+                yield row
 
-        self.store(course_id, filename, output_buffer)
+    def delete(self, course_id, filename):
+        """
+        Delete the file `filename` stored for `course_id`.
+        """
+        os.remove(self.path_to(course_id, filename))
 
     def links_for(self, course_id):
         """
@@ -408,7 +528,11 @@ class LocalFSReportStore(ReportStore):
         course_dir = self.path_to(course_id, '')
         if not os.path.exists(course_dir):
             return []
-        files = [(filename, os.path.join(course_dir, filename)) for filename in os.listdir(course_dir)]
+        files = [
+            (filename, os.path.join(course_dir, filename))
+            for filename in os.listdir(course_dir)
+            if self.is_report_file(filename)
+        ]
         files.sort(key=lambda (filename, full_path): os.path.getmtime(full_path), reverse=True)
 
         return [
@@ -69,6 +69,27 @@ def track_memory_usage(metric, course_id):
         )
 
 
+def _iterate_by_pk(queryset, fields, items_per_query):
+    """
+    Yields the dicts of the values of `fields` (which must include 'pk') of the items of `queryset`, by increasing pk.
+
+    The items are read `items_per_query` at a time, each query resuming after the last pk read
+    by the previous one (keyset pagination).  Unlike OFFSET pagination, every query then costs the
+    same however far into the queryset it reads, and unlike reading the whole queryset at once,
+    the database client doesn't have to hold all the items in memory.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        page_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        page = list(page_queryset.values(*fields)[:items_per_query])
+        for item in page:
+            yield item
+        if len(page) < items_per_query:
+            return
+        last_pk = page[-1]['pk']
+
+
 def _generate_items_for_subtask(
     item_querysets,  # pylint: disable=bad-continuation
     item_fields,
@@ -76,6 +97,7 @@ def _generate_items_for_subtask(
     items_per_task,
     total_num_subtasks,
     course_id,
+    items_per_query=None,
 ):
     """
     Generates a chunk of "items" that should be passed into a subtask.
@@ -85,9 +107,10 @@ def _generate_items_for_subtask(
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
         `total_num_items` : the result of summing the count of each queryset in `item_querysets`.
-        `items_per_query` : size of chunks to break the query operation into.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `course_id` : course_id of the course. Only needed for the track_memory_usage context manager.
+        `items_per_query` : size of chunks to break the query operation into (see _iterate_by_pk).
+            Defaults to `items_per_task`.
 
     Returns:  yields a list of dicts, where each dict contains the fields in `item_fields`, plus the 'pk' field.
 
@@ -97,12 +120,13 @@ def _generate_items_for_subtask(
     all_item_fields = list(item_fields)
     all_item_fields.append('pk')
     num_subtasks = 0
+    items_per_query = items_per_query or items_per_task
 
     items_for_task = []
 
     with track_memory_usage('course_email.subtask_generation.memory', course_id):
         for queryset in item_querysets:
-            for item in queryset.values(*all_item_fields).iterator():
+            for item in _iterate_by_pk(queryset, all_item_fields, items_per_query):
                 if len(items_for_task) == items_per_task and num_subtasks < total_num_subtasks - 1:
                     yield items_for_task
                     num_items_queued += items_per_task
@@ -214,16 +238,16 @@ class SubtaskStatus(object):
         return unicode(repr(self))
 
 
-def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
+def initialize_subtask_info(entry, action_name, total_num, subtask_id_list, num_skipped=0):
     """
     Store initial subtask information to InstructorTask object.
 
     The InstructorTask's "task_output" field is initialized.  This is a JSON-serialized dict.
-    Counters for 'attempted', 'succeeded', 'failed', 'skipped' keys are initialized to zero,
-    as is the 'duration_ms' value.  A 'start_time' is stored for later duration calculations,
-    and the total number of "things to do" is set, so the user can be told how much needs to be
-    done overall.  The `action_name` is also stored, to help with constructing more readable
-    task_progress messages.
+    Counters for 'attempted', 'succeeded', 'failed' keys are initialized to zero, as is the
+    'duration_ms' value, and 'skipped' to the `num_skipped` things left out before any subtask
+    was created.  A 'start_time' is stored for later duration calculations, and the total number
+    of "things to do" is set, so the user can be told how much needs to be done overall.  The
+    `action_name` is also stored, to help with constructing more readable task_progress messages.
 
     The InstructorTask's "subtasks" field is also initialized.  This is also a JSON-serialized dict.
     Keys include 'total', 'succeeded', 'retried', 'failed', which are counters for the number of
@@ -248,7 +272,7 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
         'action_name': action_name,
         'attempted': 0,
         'failed': 0,
-        'skipped': 0,
+        'skipped': num_skipped,
         'succeeded': 0,
         'total': total_num,
         'duration_ms': int(0),
@@ -284,6 +308,8 @@ def queue_subtasks_for_query(
     item_fields,
     items_per_task,
     total_num_items,
+    num_skipped_items=0,
+    items_per_query=None,
 ):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
@@ -299,6 +325,9 @@ def queue_subtasks_for_query(
             These are in addition to the 'pk' field.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `total_num_items` : total amount of items that will be put into subtasks
+        `num_skipped_items` : amount of items which were left out of `item_querysets`, to be
+            counted as skipped in the task's progress (and in its total).
+        `items_per_query` : amount of items read from the database per query.  Defaults to `items_per_task`.
 
     Returns:  the task progress as stored in the InstructorTask object.
 
@@ -317,7 +346,9 @@ def queue_subtasks_for_query(
         total_num_subtasks,
         total_num_items,
     )  # pylint: disable=no-member
-    progress = initialize_subtask_info(entry, action_name, total_num_items, subtask_id_list)
+    progress = initialize_subtask_info(
+        entry, action_name, total_num_items + num_skipped_items, subtask_id_list, num_skipped_items
+    )
 
     # Construct a generator that will return the recipients to use for each subtask.
     # Pass in the desired fields to fetch for each recipient.
@@ -328,6 +359,7 @@ def queue_subtasks_for_query(
         items_per_task,
         total_num_subtasks,
         entry.course_id,
+        items_per_query,
     )
 
     # Now create the subtasks, and start them running.
@@ -460,7 +492,7 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
         raise DuplicateTaskException(msg)
 
 
-def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0):
+def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0, complete_task=True):
     """
     Update the status of the subtask in the parent InstructorTask object tracking its progress.
 
@@ -471,9 +503,14 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
     The subtask lock acquired in the call to check_subtask_is_valid() is released here, only when
     the attempting of retries has concluded.
+
+    If `complete_task` is False, the InstructorTask isn't marked as succeeded when its last
+    subtask completes, and it is up to the caller to set its final state.
+
+    Returns True if this update completed the last of the subtasks of the InstructorTask.
     """
     try:
-        _update_subtask_status(entry_id, current_task_id, new_subtask_status)
+        return _update_subtask_status(entry_id, current_task_id, new_subtask_status, complete_task)
     except DatabaseError:
         # If we fail, try again recursively.
         retry_count += 1
@@ -481,7 +518,7 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
             TASK_LOG.info("Retrying to update status for subtask %s of instructor task %d with status %s:  retry %d",
                           current_task_id, entry_id, new_subtask_status, retry_count)
             dog_stats_api.increment('instructor_task.subtask.retry_after_failed_update')
-            update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
+            return update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count, complete_task)
         else:
             TASK_LOG.info("Failed to update status after %d retries for subtask %s of instructor task %d with status %s",
                           retry_count, current_task_id, entry_id, new_subtask_status)
@@ -495,7 +532,7 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
 
 @transaction.commit_manually
-def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
+def _update_subtask_status(entry_id, current_task_id, new_subtask_status, complete_task=True):
     """
     Update the status of the subtask in the parent InstructorTask object tracking its progress.
 
@@ -515,12 +552,14 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     subtasks.  'Total' is expected to have been set at the time the subtasks were created.
     The other three counters are incremented depending on the value of `status`.  Once the counters
     for 'succeeded' and 'failed' match the 'total', the subtasks are done and the InstructorTask's
-    "status" is changed to SUCCESS.
+    "status" is changed to SUCCESS, unless `complete_task` is False.
 
     The "subtasks" field also contains a 'status' key, that contains a dict that stores status
     information for each subtask.  At the moment, the value for each subtask (keyed by its task_id)
     is the value of the SubtaskStatus.to_dict(), but could be expanded in future to store information
     about failure messages, progress made, etc.
+
+    Returns True if this update completed the last of the subtasks.
     """
     TASK_LOG.info("Preparing to update status for subtask %s for instructor task %d with status %s",
                   current_task_id, entry_id, new_subtask_status)
@@ -571,7 +610,7 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         # At present, we mark the task as having succeeded.  In future, we should see
         # if there was a catastrophic failure that occurred, and figure out how to
         # report that here.
-        if num_remaining <= 0:
+        if num_remaining <= 0 and complete_task:
             entry.task_state = SUCCESS
         entry.subtasks = json.dumps(subtask_dict)
         entry.task_output = InstructorTask.create_output_for_success(task_progress)
@@ -588,3 +627,4 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     else:
         TASK_LOG.debug("about to commit....")
         transaction.commit()
+        return num_remaining <= 0
@@ -26,7 +26,9 @@ from django.conf import settings
 from django.utils.translation import ugettext_noop
 
 from celery import task
+from celery.states import FAILURE
 from bulk_email.tasks import perform_delegate_email_batches
+from instructor_task.subtasks import SubtaskStatus, check_subtask_is_valid, update_subtask_status
 from instructor_task.tasks_helper import (
     run_main_task,
     BaseInstructorTask,
@@ -35,6 +37,8 @@ from instructor_task.tasks_helper import (
     reset_attempts_module_state,
     delete_problem_module_state,
     upload_grades_csv,
+    upload_grades_csv_chunk,
+    complete_grades_csv_report,
     upload_problem_grade_report,
     upload_students_csv,
     cohort_students_and_upload
@@ -156,6 +160,57 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_chunk(entry_id, student_ids, chunk_index, report_info, subtask_status_dict):
+    """
+    Grade one chunk of the students of a course whose grade report is generated in parallel.
+
+    Inputs are:
+      * `entry_id`: id of the InstructorTask object to which progress should be recorded.
+      * `student_ids`: ids of the students to grade.
+      * `chunk_index`: position of this chunk in the grade report.
+      * `report_info`: dict describing the grade report, with keys 'course_id', 'filename'
+        and 'err_filename'.
+      * `subtask_status_dict`: dict containing values representing current status,
+        as described in `send_course_email`.
+
+    The subtask which completes last merges the partial CSVs of every chunk into the final report,
+    and sets the final state of the InstructorTask.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    TASK_LOG.info(
+        u"Preparing to grade %d students as subtask %s for instructor task %d: status=%s",
+        len(student_ids), current_task_id, entry_id, subtask_status
+    )
+
+    # Check that the requested subtask is actually known to the current InstructorTask entry,
+    # and has not already been completed.  See `send_course_email` for the details.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    try:
+        new_subtask_status = upload_grades_csv_chunk(student_ids, chunk_index, report_info, subtask_status)
+    except Exception:
+        # Since we don't know how far the task got, we count all students as having failed.
+        # `subtask_status` may have been updated before the failure, so start again from a copy.
+        TASK_LOG.exception(
+            u"Grade report subtask %s for instructor task %d: failed unexpectedly!", current_task_id, entry_id
+        )
+        failed_subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+        failed_subtask_status.increment(failed=len(student_ids), state=FAILURE)
+        if update_subtask_status(entry_id, current_task_id, failed_subtask_status, complete_task=False):
+            complete_grades_csv_report(entry_id, report_info)
+        raise
+
+    TASK_LOG.info(u"Grade report subtask %s for instructor task %d: succeeded", current_task_id, entry_id)
+    if update_subtask_status(entry_id, current_task_id, new_subtask_status, complete_task=False):
+        TASK_LOG.info(u"Grade report subtask %s for instructor task %d: merging report", current_task_id, entry_id)
+        complete_grades_csv_report(entry_id, report_info)
+
+    # return status in a form that can be serialized by Celery into JSON:
+    return new_subtask_status.to_dict()
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
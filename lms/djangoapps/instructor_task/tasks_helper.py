@@ -7,13 +7,15 @@ import json
 from collections import OrderedDict
 from datetime import datetime
 from eventtracking import tracker
-from itertools import chain
+from itertools import chain, count, islice
 from time import time
+import traceback
 import unicodecsv
 import logging
 
 from celery import Task, current_task
 from celery.states import SUCCESS, FAILURE
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.files.storage import DefaultStorage
 from django.db import transaction, reset_queries
@@ -22,23 +24,24 @@ from pytz import UTC
 
 from track.views import task_track
 from util.file import course_filename_prefix_generator, UniversalNewlineIterator
+from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
 from xmodule.split_test_module import get_split_user_partitions
 
-from certificates.models import CertificateWhitelist, certificate_info_for_user
+from certificates.models import CertificateWhitelist, certificate_info_for_user, certificate_statuses_for_students
 from courseware.courses import get_course_by_id, get_problems_in_section
 from courseware.grades import iterate_grades_for
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
-from instructor_analytics.basic import enrolled_students_features
-from instructor_analytics.csvs import format_dictlist
-from instructor_task.models import ReportStore, InstructorTask, PROGRESS
-from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from instructor_analytics.basic import iter_enrolled_students_features
+from instructor_analytics.csvs import format_dictrows
+from instructor_task.models import ReportStore, InstructorTask, PROGRESS, PARTIAL_REPORT_SUFFIX
+from instructor_task.subtasks import DuplicateTaskException, queue_subtasks_for_query
+from openedx.core.djangoapps.course_groups.cohorts import get_cohorts_for_users
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
-from opaque_keys.edx.keys import UsageKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
 from student.models import CourseEnrollment
 from verify_student.models import SoftwareSecurePhotoVerification
@@ -58,6 +61,9 @@ UPDATE_STATUS_SKIPPED = 'skipped'
 # The setting name used for events when "settings" (account settings, preferences, profile information) change.
 REPORT_REQUESTED_EVENT_NAME = u'edx.instructor.report.requested'
 
+# Number of students whose grade report columns are looked up together
+GRADE_REPORT_BATCH_SIZE = 100
+
 
 class BaseInstructorTask(Task):
     """
@@ -532,6 +538,26 @@ def delete_problem_module_state(xmodule_instance_args, _module_descriptor, stude
     return UPDATE_STATUS_SUCCEEDED
 
 
+def _report_filename(csv_name, course_id, timestamp):
+    """
+    Return the name under which the `csv_name` report for `course_id` that was
+    requested at `timestamp` is stored in the ReportStore.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
+def _partial_report_filename(report_filename, chunk_index):
+    """
+    Return the name of the partial file written by the `chunk_index`-th chunk
+    of a report that is generated in parallel and stored as `report_filename`.
+    """
+    return u"{}.{:05d}{}".format(report_filename, chunk_index, PARTIAL_REPORT_SUFFIX)
+
+
 def upload_csv_to_report_store(rows, csv_name, course_id, timestamp):
     """
     Upload data as a CSV using ReportStore.
@@ -543,22 +569,151 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp):
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            Any iterable of rows may be used; a generator lets the rows be
+            streamed to the ReportStore as they are produced.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
     """
     report_store = ReportStore.from_config()
-    report_store.store_rows(
-        course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
-        rows
-    )
+    report_store.store_rows(course_id, _report_filename(csv_name, course_id, timestamp), rows)
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
 
 
+def _graded_section_labels(course):
+    """
+    Return the labels of the `section_breakdown` of the grades of `course`.
+
+    These are the same for every student, as long as every graded section has
+    a non-zero total possible score, so they can be computed up front from an
+    empty grade sheet instead of from the first student that is graded.
+    """
+    grade_sheet = {
+        section_format: [
+            Score(0.0, 1.0, True, section['section_descriptor'].display_name_with_default, None)
+            for section in sections
+        ]
+        for section_format, sections in course.grading_context['graded_sections'].iteritems()
+    }
+    return [section['label'] for section in course.grader.grade(grade_sheet)['section_breakdown']]
+
+
+class GradeReportRowBuilder(object):
+    """
+    Builds the header and the per-student rows of the grade report of a course.
+
+    The per-student columns other than grades (cohort, experiment groups,
+    enrollment track, verification and certificate status) are looked up in
+    bulk for a batch of students at a time by `prefetch()`.
+    """
+    def __init__(self, course):
+        self.course = course
+        self.course_is_cohorted = is_course_cohorted(course.id)
+        self.experiment_partitions = get_split_user_partitions(course.user_partitions)
+        certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course.id, whitelist=True)
+        self.whitelisted_user_ids = set(entry.user_id for entry in certificate_whitelist)
+        self.prefetch([])
+
+    def prefetch(self, student_ids):
+        """
+        Look up the report columns of the students with ids `student_ids`, which
+        are about to be passed to `row()`, with a handful of queries.
+        """
+        course_id = self.course.id
+        self.prefetched_student_ids = set(student_ids)
+        self.cohorts = get_cohorts_for_users(student_ids, course_id) if self.course_is_cohorted else {}
+        self.experiment_groups = {
+            partition.id: partition.scheme.get_groups_for_users(course_id, student_ids, partition)
+            for partition in self.experiment_partitions
+        }
+        self.enrollment_modes = {
+            student_id: mode for student_id, (mode, __) in
+            CourseEnrollment.enrollment_modes_for_users(student_ids, course_id).iteritems()
+        }
+        self.verification_statuses = SoftwareSecurePhotoVerification.verification_statuses_for_users(
+            student_ids, course_id, self.enrollment_modes
+        )
+        self.certificate_statuses = certificate_statuses_for_students(student_ids, course_id)
+
+    def header(self, section_labels):
+        """
+        Return the header row of the grade report, given the labels of the graded sections.
+        """
+        cohorts_header = ['Cohort Name'] if self.course_is_cohorted else []
+        group_configs_header = [
+            u'Experiment Group ({})'.format(partition.name) for partition in self.experiment_partitions
+        ]
+        certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
+        return (
+            ["id", "email", "username", "grade"] + section_labels + cohorts_header +
+            group_configs_header + ['Enrollment Track', 'Verification Status'] + certificate_info_header
+        )
+
+    def row(self, student, gradeset, section_labels):
+        """
+        Return the grade report row of `student`, whose grades are `gradeset`.
+        """
+        if student.id not in self.prefetched_student_ids:
+            self.prefetch([student.id])
+
+        percents = {
+            section['label']: section.get('percent', 0.0)
+            for section in gradeset[u'section_breakdown']
+            if 'label' in section
+        }
+
+        cohorts_group_name = []
+        if self.course_is_cohorted:
+            group = self.cohorts.get(student.id)
+            cohorts_group_name.append(group.name if group else '')
+
+        group_configs_group_names = []
+        for partition in self.experiment_partitions:
+            group = self.experiment_groups[partition.id].get(student.id)
+            group_configs_group_names.append(group.name if group else '')
+
+        enrollment_mode = self.enrollment_modes.get(student.id)
+        verification_status = self.verification_statuses[student.id]
+        certificate_info = certificate_info_for_user(
+            student,
+            self.course.id,
+            gradeset['grade'],
+            student.id in self.whitelisted_user_ids,
+            self.certificate_statuses[student.id]
+        )
+
+        # Not everybody has the same gradable items. If the item is not
+        # found in the user's gradeset, just assume it's a 0. The aggregated
+        # grades for their sections and overall course will be calculated
+        # without regard for the item they didn't have access to, so it's
+        # possible for a student to have a 0.0 show up in their row but
+        # still have 100% for the course.
+        row_percents = [percents.get(label, 0.0) for label in section_labels]
+        return (
+            [student.id, student.email, student.username, gradeset['percent']] +
+            row_percents + cohorts_group_name + group_configs_group_names +
+            [enrollment_mode] + [verification_status] + certificate_info
+        )
+
+
+def _iterate_grades_in_batches(course, students, row_builder):
+    """
+    Yield (student, gradeset, err_msg) for each of `students`, as
+    `iterate_grades_for` does, while having `row_builder` prefetch the report
+    columns of `GRADE_REPORT_BATCH_SIZE` students at a time.
+    """
+    students = iter(students)
+    while True:
+        batch = list(islice(students, GRADE_REPORT_BATCH_SIZE))
+        if not batch:
+            return
+        row_builder.prefetch([student.id for student in batch])
+        for student_grades in iterate_grades_for(course, batch):
+            yield student_grades
+
+
+GRADE_REPORT_ERR_HEADER = ["id", "username", "error_msg"]
+
+
 def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
     """
     For a given `course_id`, generate a grades CSV file for all students that
@@ -568,15 +723,17 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
     that are visible in ReportStore will be complete ones.
 
-    As we start to add more CSV downloads, it will probably be worthwhile to
-    make a more general CSVDoc class instead of building out the rows like we
-    do here.
+    Courses with more than `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK` enrolled
+    students are graded in parallel: the students are split into chunks, each
+    of which is graded by a subtask (see `upload_grades_csv_chunk`), and the
+    partial CSVs written by the subtasks are merged into the final report by
+    the last subtask to complete (see `complete_grades_csv_report`).
     """
     start_time = time()
     start_date = datetime.now(UTC)
     status_interval = 100
     enrolled_students = CourseEnrollment.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    total_enrolled_students = enrolled_students.count()
 
     fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
     task_info_string = fmt.format(
@@ -587,25 +744,54 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
+    students_per_task = settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK
+    if _entry_id is not None and students_per_task and total_enrolled_students > students_per_task:
+        return _delegate_grades_csv_chunks(
+            _entry_id, course_id, action_name, enrolled_students, total_enrolled_students, start_date
+        )
+
+    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
     course = get_course_by_id(course_id)
-    course_is_cohorted = is_course_cohorted(course.id)
-    cohorts_header = ['Cohort Name'] if course_is_cohorted else []
+    row_builder = GradeReportRowBuilder(course)
 
-    experiment_partitions = get_split_user_partitions(course.user_partitions)
-    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
+    # Loop over all our students, streaming their rows to the report store as
+    # they are graded. Only the (few) error rows are kept in memory.
+    err_rows = [GRADE_REPORT_ERR_HEADER]
+    current_step = {'step': 'Calculating Grades'}
 
-    certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
-    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
-    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
+    def grade_rows():
+        """
+        Generate the header and the rows of the grade report.
+        """
+        header = None
+        students = enrolled_students.select_related('profile').iterator()
+        for student, gradeset, err_msg in _iterate_grades_in_batches(course, students, row_builder):
+            # Periodically update task status (this is a cache write), and log
+            # the task's progress
+            if task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
+                TASK_LOG.info(
+                    u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
+                    task_info_string,
+                    action_name,
+                    current_step,
+                    task_progress.attempted,
+                    total_enrolled_students
+                )
+            task_progress.attempted += 1
 
-    # Loop over all our students and build our CSV lists in memory
-    header = None
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
-    current_step = {'step': 'Calculating Grades'}
+            if gradeset:
+                # We were able to successfully grade this student for this course.
+                task_progress.succeeded += 1
+                if not header:
+                    header = [section['label'] for section in gradeset[u'section_breakdown']]
+                    yield row_builder.header(header)
+                yield row_builder.row(student, gradeset, header)
+            else:
+                # An empty gradeset means we failed to grade a student.
+                task_progress.failed += 1
+                err_rows.append([student.id, student.username, err_msg])
 
-    total_enrolled_students = enrolled_students.count()
-    student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
         task_info_string,
@@ -613,97 +799,23 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         current_step,
         total_enrolled_students
     )
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
-
-        # Now add a log entry after each student is graded to get a sense
-        # of the task's progress
-        student_counter += 1
-        TASK_LOG.info(
-            u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
-            task_info_string,
-            action_name,
-            current_step,
-            student_counter,
-            total_enrolled_students
-        )
-
-        if gradeset:
-            # We were able to successfully grade this student for this course.
-            task_progress.succeeded += 1
-            if not header:
-                header = [section['label'] for section in gradeset[u'section_breakdown']]
-                rows.append(
-                    ["id", "email", "username", "grade"] + header + cohorts_header +
-                    group_configs_header + ['Enrollment Track', 'Verification Status'] + certificate_info_header
-                )
 
-            percents = {
-                section['label']: section.get('percent', 0.0)
-                for section in gradeset[u'section_breakdown']
-                if 'label' in section
-            }
-
-            cohorts_group_name = []
-            if course_is_cohorted:
-                group = get_cohort(student, course_id, assign=False)
-                cohorts_group_name.append(group.name if group else '')
-
-            group_configs_group_names = []
-            for partition in experiment_partitions:
-                group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
-                group_configs_group_names.append(group.name if group else '')
-
-            enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, course_id)[0]
-            verification_status = SoftwareSecurePhotoVerification.verification_status_for_user(
-                student,
-                course_id,
-                enrollment_mode
-            )
-            certificate_info = certificate_info_for_user(
-                student,
-                course_id,
-                gradeset['grade'],
-                student.id in whitelisted_user_ids
-            )
-
-            # Not everybody has the same gradable items. If the item is not
-            # found in the user's gradeset, just assume it's a 0. The aggregated
-            # grades for their sections and overall course will be calculated
-            # without regard for the item they didn't have access to, so it's
-            # possible for a student to have a 0.0 show up in their row but
-            # still have 100% for the course.
-            row_percents = [percents.get(label, 0.0) for label in header]
-            rows.append(
-                [student.id, student.email, student.username, gradeset['percent']] +
-                row_percents + cohorts_group_name + group_configs_group_names +
-                [enrollment_mode] + [verification_status] + certificate_info
-            )
-        else:
-            # An empty gradeset means we failed to grade a student.
-            task_progress.failed += 1
-            err_rows.append([student.id, student.username, err_msg])
+    # Perform the actual upload
+    upload_csv_to_report_store(grade_rows(), 'grade_report', course_id, start_date)
 
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
         task_info_string,
         action_name,
         current_step,
-        student_counter,
+        task_progress.attempted,
         total_enrolled_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
     current_step = {'step': 'Uploading CSVs'}
     task_progress.update_task_state(extra_meta=current_step)
     TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
-
     # If there are any error rows (don't count the header), write them out as well
     if len(err_rows) > 1:
         upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
@@ -713,6 +825,193 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _delegate_grades_csv_chunks(entry_id, course_id, action_name, enrolled_students, total_num_students, start_date):
+    """
+    Queue one `calculate_grades_csv_chunk` subtask per chunk of `enrolled_students`.
+
+    Returns the progress of the InstructorTask as stored after the subtasks are queued.
+    """
+    # Imported here, since the subtask itself is defined alongside the other celery tasks.
+    from instructor_task.tasks import calculate_grades_csv_chunk
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # Check to see if the subtasks have already been defined.  This can happen
+    # when the parent task is requeued by Celery; see `perform_delegate_email_batches`.
+    if len(entry.subtasks) > 0:
+        msg = u"Task {}: subtasks already queued for grading course {}".format(entry.task_id, course_id)
+        TASK_LOG.warning(msg)
+        raise DuplicateTaskException(msg)
+
+    report_info = {
+        'course_id': course_id.to_deprecated_string(),
+        'filename': _report_filename('grade_report', course_id, start_date),
+        'err_filename': _report_filename('grade_report_err', course_id, start_date),
+    }
+    chunk_indices = count()
+
+    def _create_grades_subtask(to_list, subtask_status):
+        """Creates a subtask to grade one chunk of `enrolled_students`."""
+        return calculate_grades_csv_chunk.subtask(
+            (
+                entry_id,
+                [student['pk'] for student in to_list],
+                next(chunk_indices),
+                report_info,
+                subtask_status.to_dict(),
+            ),
+            task_id=subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    TASK_LOG.info(
+        u"Task %s: grading %s students of course %s in chunks of %s",
+        entry.task_id,
+        total_num_students,
+        course_id,
+        settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK
+    )
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_grades_subtask,
+        [enrolled_students.order_by('id')],
+        [],
+        settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK,
+        total_num_students,
+    )
+
+
+def upload_grades_csv_chunk(student_ids, chunk_index, report_info, subtask_status):
+    """
+    Grade the students with ids `student_ids`, and store their rows of the
+    grade report described by `report_info` as partial CSVs in the ReportStore.
+
+    The partial CSVs have no header, since it is written once by
+    `merge_grades_csv_chunks`.  Returns the updated `subtask_status`.
+    """
+    course_id = CourseKey.from_string(report_info['course_id'])
+    course = get_course_by_id(course_id)
+    row_builder = GradeReportRowBuilder(course)
+    section_labels = _graded_section_labels(course)
+
+    rows = []
+    err_rows = []
+    students = User.objects.filter(id__in=student_ids).order_by('id').select_related('profile')
+    for student, gradeset, err_msg in _iterate_grades_in_batches(course, students, row_builder):
+        if gradeset:
+            subtask_status.increment(succeeded=1)
+            rows.append(row_builder.row(student, gradeset, section_labels))
+        else:
+            subtask_status.increment(failed=1)
+            err_rows.append([student.id, student.username, err_msg])
+
+    report_store = ReportStore.from_config()
+    report_store.store_rows(course_id, _partial_report_filename(report_info['filename'], chunk_index), rows)
+    report_store.store_rows(course_id, _partial_report_filename(report_info['err_filename'], chunk_index), err_rows)
+
+    subtask_status.increment(state=SUCCESS)
+    return subtask_status
+
+
+def merge_grades_csv_chunks(entry_id, report_info):
+    """
+    Concatenate the partial CSVs written by every chunk of the grade report
+    described by `report_info` into the final grade report (and error report,
+    if any student could not be graded).
+
+    The partial CSVs are streamed from the ReportStore straight into the final
+    reports. Any error reading them is raised, rather than publishing a report
+    lacking some students.
+    """
+    num_chunks = json.loads(InstructorTask.objects.get(pk=entry_id).subtasks)['total']
+    course_id = CourseKey.from_string(report_info['course_id'])
+    course = get_course_by_id(course_id)
+    report_store = ReportStore.from_config()
+
+    def merged_rows(filename):
+        """
+        Generate the rows of every partial CSV of `filename`, in chunk order.
+        """
+        for chunk_index in range(num_chunks):
+            for row in report_store.read_rows(course_id, _partial_report_filename(filename, chunk_index)):
+                yield row
+
+    header = GradeReportRowBuilder(course).header(_graded_section_labels(course))
+    report_store.store_rows(course_id, report_info['filename'], chain([header], merged_rows(report_info['filename'])))
+    tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": 'grade_report', })
+
+    # If there are any error rows, write them out as well
+    first_err_row, err_rows = _peek(merged_rows(report_info['err_filename']))
+    if first_err_row is not None:
+        report_store.store_rows(course_id, report_info['err_filename'], chain([GRADE_REPORT_ERR_HEADER], err_rows))
+        tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": 'grade_report_err', })
+
+
+def delete_grades_csv_chunks(entry_id, report_info):
+    """
+    Delete the partial CSVs written by the chunks of the grade report described
+    by `report_info`, skipping those which chunks failed before writing.
+    """
+    num_chunks = json.loads(InstructorTask.objects.get(pk=entry_id).subtasks)['total']
+    course_id = CourseKey.from_string(report_info['course_id'])
+    report_store = ReportStore.from_config()
+    for filename in (report_info['filename'], report_info['err_filename']):
+        for chunk_index in range(num_chunks):
+            try:
+                report_store.delete(course_id, _partial_report_filename(filename, chunk_index))
+            except OSError:
+                # The LocalFSReportStore raises when the file doesn't exist
+                pass
+
+
+def complete_grades_csv_report(entry_id, report_info):
+    """
+    Called once every chunk of the grade report described by `report_info` is
+    done: merge the partial CSVs into the final report, and set the final state
+    of the InstructorTask `entry_id`.
+
+    The task fails, without publishing a report, if any chunk failed, since the
+    report would silently lack the students of that chunk.  It also fails if
+    the merge raises.  The partial CSVs are deleted in any case.
+    """
+    subtask_dict = json.loads(InstructorTask.objects.get(pk=entry_id).subtasks)
+    try:
+        if subtask_dict['failed']:
+            raise ValueError(u"{} of the {} chunks of the grade report failed".format(
+                subtask_dict['failed'], subtask_dict['total']
+            ))
+        merge_grades_csv_chunks(entry_id, report_info)
+    except Exception as exc:  # pylint: disable=broad-except
+        TASK_LOG.exception(u"Unable to complete the grade report of instructor task %d", entry_id)
+        _set_task_state(entry_id, FAILURE, InstructorTask.create_output_for_failure(exc, traceback.format_exc()))
+    else:
+        _set_task_state(entry_id, SUCCESS)
+    finally:
+        delete_grades_csv_chunks(entry_id, report_info)
+
+
+def _set_task_state(entry_id, state, task_output=None):
+    """
+    Set the state, and optionally the output, of the InstructorTask `entry_id`.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    entry.task_state = state
+    if task_output is not None:
+        entry.task_output = task_output
+    entry.save()
+
+
+def _peek(rows):
+    """
+    Return the first of `rows` (or None if there are none), and an iterator
+    over all of `rows`, including the first.
+    """
+    rows = iter(rows)
+    first_row = next(rows, None)
+    return first_row, (rows if first_row is None else chain([first_row], rows))
+
+
 def _order_problems(blocks):
     """
     Sort the problems by the assignment type and assignment that it belongs to.
@@ -789,44 +1088,50 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
         )
 
     # Just generate the static fields for now.
-    rows = [list(header_row.values()) + ['Final Grade'] + list(chain.from_iterable(problems.values()))]
+    header = list(header_row.values()) + ['Final Grade'] + list(chain.from_iterable(problems.values()))
     error_rows = [list(header_row.values()) + ['error_msg']]
     current_step = {'step': 'Calculating Grades'}
 
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students, keep_raw_scores=True):
-        student_fields = [getattr(student, field_name) for field_name in header_row]
-        task_progress.attempted += 1
+    def problem_grade_rows():
+        """
+        Generate the rows of the students that were successfully graded.
+        """
+        for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students, keep_raw_scores=True):
+            student_fields = [getattr(student, field_name) for field_name in header_row]
+            task_progress.attempted += 1
 
-        if err_msg:
-            # There was an error grading this student.
-            error_rows.append(student_fields + [err_msg])
-            task_progress.failed += 1
-            continue
-
-        final_grade = gradeset['percent']
-        # Only consider graded problems
-        problem_scores = {unicode(score.module_id): score for score in gradeset['raw_scores'] if score.graded}
-        earned_possible_values = list()
-        for problem_id in problems:
-            try:
-                problem_score = problem_scores[problem_id]
-                earned_possible_values.append([problem_score.earned, problem_score.possible])
-            except KeyError:
-                # The student has not been graded on this problem.  For example,
-                # iterate_grades_for skips problems that students have never
-                # seen in order to speed up report generation.  It could also be
-                # the case that the student does not have access to it (e.g. A/B
-                # test or cohorted courseware).
-                earned_possible_values.append(['N/A', 'N/A'])
-        rows.append(student_fields + [final_grade] + list(chain.from_iterable(earned_possible_values)))
-
-        task_progress.succeeded += 1
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
+            if err_msg:
+                # There was an error grading this student.
+                error_rows.append(student_fields + [err_msg])
+                task_progress.failed += 1
+                continue
+
+            final_grade = gradeset['percent']
+            # Only consider graded problems
+            problem_scores = {unicode(score.module_id): score for score in gradeset['raw_scores'] if score.graded}
+            earned_possible_values = list()
+            for problem_id in problems:
+                try:
+                    problem_score = problem_scores[problem_id]
+                    earned_possible_values.append([problem_score.earned, problem_score.possible])
+                except KeyError:
+                    # The student has not been graded on this problem.  For example,
+                    # iterate_grades_for skips problems that students have never
+                    # seen in order to speed up report generation.  It could also be
+                    # the case that the student does not have access to it (e.g. A/B
+                    # test or cohorted courseware).
+                    earned_possible_values.append(['N/A', 'N/A'])
+            yield student_fields + [final_grade] + list(chain.from_iterable(earned_possible_values))
 
-    # Perform the upload if any students have been successfully graded
-    if len(rows) > 1:
-        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
+            task_progress.succeeded += 1
+            if task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
+
+    # Perform the upload if any students have been successfully graded,
+    # streaming the remaining rows as the students are graded
+    first_row, rows = _peek(problem_grade_rows())
+    if first_row is not None:
+        upload_csv_to_report_store(chain([header], rows), 'problem_grade_report', course_id, start_date)
     # If there are any error rows, write them out as well
     if len(error_rows) > 1:
         upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
@@ -846,22 +1151,26 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     current_step = {'step': 'Calculating Profile Info'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # compute the student features table and format it
+    # compute the student features table and format it, streaming the rows
+    # to the report store as they are read from the database
     query_features = task_input.get('features')
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
+    student_data = iter_enrolled_students_features(course_id, query_features)
 
-    current_step = {'step': 'Uploading CSV'}
-    task_progress.update_task_state(extra_meta=current_step)
+    def student_rows():
+        """
+        Generate the header and the rows of the student profile report.
+        """
+        yield query_features
+        for row in format_dictrows(student_data, query_features):
+            task_progress.attempted += 1
+            task_progress.succeeded += 1
+            yield row
 
     # Perform the upload
-    upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
+    upload_csv_to_report_store(student_rows(), 'student_profile_info', course_id, start_date)
+    task_progress.skipped = task_progress.total - task_progress.attempted
 
+    current_step = {'step': 'Uploading CSV'}
     return task_progress.update_task_state(extra_meta=current_step)
 
 
@@ -4,9 +4,11 @@ Tests for instructor_task/models.py.
 
 from cStringIO import StringIO
 import mock
+import os
 import time
 from datetime import datetime
 from unittest import TestCase
+from uuid import uuid4
 
 from instructor_task.models import LocalFSReportStore, S3ReportStore
 from instructor_task.tests.test_base import TestReportMixin
@@ -34,6 +36,7 @@ class MockBucket(object):
     """ Mocking a boto S3 Bucket object. """
     def __init__(self, _name):
         self.keys = []
+        self.multipart_upload = None
 
     def store_key(self, key):
         """ Not a Bucket method, created just to store the keys in the Bucket for testing purposes. """
@@ -43,6 +46,31 @@ class MockBucket(object):
         """ Expected method on a Bucket object. """
         return self.keys
 
+    def initiate_multipart_upload(self, key_name, headers):  # pylint: disable=unused-argument
+        """ Expected method on a Bucket object. """
+        self.multipart_upload = MockMultiPartUpload()
+        return self.multipart_upload
+
+
+class MockMultiPartUpload(object):
+    """ Mocking a boto S3 MultiPartUpload object. """
+    def __init__(self):
+        self.parts = []
+        self.completed = False
+        self.cancelled = False
+
+    def upload_part_from_file(self, fp, part_num):
+        """ Expected method on a MultiPartUpload object. """
+        self.parts.append((part_num, fp.read()))
+
+    def complete_upload(self):
+        """ Expected method on a MultiPartUpload object. """
+        self.completed = True
+
+    def cancel_upload(self):
+        """ Expected method on a MultiPartUpload object. """
+        self.cancelled = True
+
 
 class MockS3Connection(object):
     """ Mocking a boto S3 Connection """
@@ -93,6 +121,42 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase
         """ Create and return a LocalFSReportStore. """
         return LocalFSReportStore.from_config()
 
+    def test_read_and_delete_rows(self):
+        """
+        Test that rows stored by ReportStore.store_rows() can be read back and deleted.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', [[u'id', u'name'], [1, u'ni\xf1o']])
+        self.assertEqual(
+            list(report_store.read_rows(self.course_id, 'report.csv')),
+            [[u'id', u'name'], [u'1', u'ni\xf1o']]
+        )
+        report_store.delete(self.course_id, 'report.csv')
+        self.assertEqual(report_store.links_for(self.course_id), [])
+
+    def test_store_rows_failure(self):
+        """
+        Test that no file is left behind when generating the rows fails.
+        """
+        def failing_rows():
+            """ Generate a row, then fail. """
+            yield [u'id']
+            raise ValueError
+
+        report_store = self.create_report_store()
+        with self.assertRaises(ValueError):
+            report_store.store_rows(self.course_id, 'report.csv', failing_rows())
+        self.assertEqual(os.listdir(report_store.path_to(self.course_id, '')), [])
+
+    def test_links_for_excludes_partial_reports(self):
+        """
+        Test that the partial files of reports generated in parallel are not linked.
+        """
+        report_store = self.create_report_store()
+        report_store.store(self.course_id, 'report.csv', StringIO())
+        report_store.store(self.course_id, 'report.csv.00000.part', StringIO())
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+
 
 @mock.patch('instructor_task.models.S3Connection', new=MockS3Connection)
 @mock.patch('instructor_task.models.Key', new=MockKey)
@@ -105,3 +169,41 @@ class S3ReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     def create_report_store(self):
         """ Create and return a S3ReportStore. """
         return S3ReportStore.from_config()
+
+    def test_store_rows_in_parts(self):
+        """
+        Test that rows are gzip'd and uploaded in parts as they are generated.
+        """
+        report_store = self.create_report_store()
+        # Use hard to compress data, so that the gzip'd rows span several parts
+        rows = [[u'id', u'name']] + [[index, u'ni\xf1o {}'.format(uuid4().hex)] for index in xrange(10000)]
+        with mock.patch.object(S3ReportStore, 'MULTIPART_PART_SIZE', 1024):
+            report_store.store_rows(self.course_id, 'report.csv', iter(rows))
+
+        multipart_upload = report_store.bucket.multipart_upload
+        self.assertTrue(multipart_upload.completed)
+        self.assertGreater(len(multipart_upload.parts), 1)
+        self.assertEqual(
+            [part_num for part_num, __ in multipart_upload.parts], range(1, len(multipart_upload.parts) + 1)
+        )
+
+        # Reading back the concatenated parts gives back the rows
+        chunks = [data for __, data in multipart_upload.parts]
+        rows_read = report_store._get_unicode_decoded_rows(  # pylint: disable=protected-access
+            S3ReportStore._gunzip_lines(chunks)  # pylint: disable=protected-access
+        )
+        self.assertEqual(list(rows_read), [[unicode(item) for item in row] for row in rows])
+
+    def test_store_rows_failure(self):
+        """
+        Test that the upload is cancelled when generating the rows fails.
+        """
+        def failing_rows():
+            """ Generate a row, then fail. """
+            yield [u'id']
+            raise ValueError
+
+        report_store = self.create_report_store()
+        with self.assertRaises(ValueError):
+            report_store.store_rows(self.course_id, 'report.csv', failing_rows())
+        self.assertTrue(report_store.bucket.multipart_upload.cancelled)
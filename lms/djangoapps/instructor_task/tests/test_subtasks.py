@@ -26,7 +26,7 @@ class TestSubtasks(InstructorTaskCourseTestCase):
             random_id = uuid4().hex[:8]
             self.create_student(username='student{0}'.format(random_id))
 
-    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count):
+    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count, items_per_query=None):
         """Queue subtasks while enrolling more students into course in the middle of the process."""
 
         task_id = str(uuid4())
@@ -55,6 +55,7 @@ class TestSubtasks(InstructorTaskCourseTestCase):
                 item_fields=[],
                 items_per_task=items_per_task,
                 total_num_items=initial_count,
+                items_per_query=items_per_query,
             )
 
     def test_queue_subtasks_for_query1(self):
@@ -80,3 +81,16 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+
+    def test_queue_subtasks_for_query_in_pages(self):
+        """Test queue_subtasks_for_query() when items are read fewer at a time than they are queued."""
+
+        mock_create_subtask_fcn = Mock()
+        self._queue_subtasks(mock_create_subtask_fcn, 4, 9, 0, items_per_query=2)
+
+        # Check that every item is queued once, in order
+        mock_create_subtask_fcn_args = mock_create_subtask_fcn.call_args_list
+        self.assertEqual([len(args[0][0]) for args in mock_create_subtask_fcn_args], [4, 4, 1])
+        item_ids = [item['pk'] for args in mock_create_subtask_fcn_args for item in args[0][0]]
+        self.assertEqual(item_ids, sorted(set(item_ids)))
+        self.assertEqual(len(item_ids), 9)
@@ -7,9 +7,15 @@ Tests that CSV grade report generation works with unicode emails.
 
 """
 import ddt
+import json
 from mock import Mock, patch
+import os
 import tempfile
 import unicodecsv
+from uuid import uuid4
+
+from celery.states import SUCCESS, FAILURE
+from django.test.utils import override_settings
 
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
 from certificates.tests.factories import GeneratedCertificateFactory, CertificateWhitelistFactory
@@ -24,9 +30,15 @@ from student.models import CourseEnrollment
 from verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from instructor_task.models import ReportStore
+from instructor_task.models import InstructorTask, LocalFSReportStore, ReportStore
+from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tasks_helper import (
-    cohort_students_and_upload, upload_grades_csv, upload_problem_grade_report, upload_students_csv
+    GradeReportRowBuilder,
+    cohort_students_and_upload,
+    upload_grades_csv,
+    upload_grades_csv_chunk,
+    upload_problem_grade_report,
+    upload_students_csv,
 )
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase, TestConditionalContent
 
@@ -73,6 +85,18 @@ class TestInstructorGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
         report_store = ReportStore.from_config()
         self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
 
+    @ddt.data(1, 5)
+    def test_prefetch_query_count(self, num_students):
+        """
+        Test that the report columns of a batch of students are looked up with a
+        constant number of queries.
+        """
+        students = [self.create_student('student{}'.format(i), mode='verified') for i in xrange(num_students)]
+        row_builder = GradeReportRowBuilder(self.course)
+        # enrollment modes, initial verifications, reverification windows and certificates
+        with self.assertNumQueries(4):
+            row_builder.prefetch([student.id for student in students])
+
     def _verify_cell_data_for_user(self, username, course_id, column_header, expected_cell_content):
         """
         Verify cell data in the grades CSV for a particular user.
@@ -264,6 +288,118 @@ class TestInstructorGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
         self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
 
 
+class TestParallelGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
+    """
+    Tests that grade reports of large courses are generated in chunks by subtasks.
+    """
+    def setUp(self):
+        super(TestParallelGradeReport, self).setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student('student{}'.format(i)) for i in xrange(5)]
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type='grade_course',
+            task_id=str(uuid4()),
+        )
+
+    def _upload_grades_csv(self):
+        """
+        Run the grade report in chunks of two students; subtasks run eagerly in tests.
+        """
+        with override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2):
+            with patch('instructor_task.tasks_helper._get_current_task'):
+                upload_grades_csv(None, self.entry.id, self.course.id, None, 'graded')
+        return InstructorTask.objects.get(id=self.entry.id)
+
+    def test_chunks_are_merged(self):
+        entry = self._upload_grades_csv()
+
+        subtasks = json.loads(entry.subtasks)
+        self.assertEqual(subtasks['total'], 3)
+        self.assertEqual(subtasks['succeeded'], 3)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output))
+
+        # Only the merged report is visible, and no partial files are left behind
+        report_store = ReportStore.from_config()
+        self.assertEqual(len(report_store.links_for(self.course.id)), 1)
+        self.assertEqual(len(os.listdir(report_store.path_to(self.course.id, ''))), 1)
+        self.verify_rows_in_csv(
+            [{'id': unicode(student.id), 'username': student.username} for student in self.students],
+            ignore_other_columns=True,
+        )
+
+    @patch('instructor_task.tasks_helper.iterate_grades_for')
+    def test_grading_failure(self, mock_iterate_grades_for):
+        mock_iterate_grades_for.side_effect = lambda _course, students: [
+            (student, {}, 'Cannot grade student') for student in students
+        ]
+        entry = self._upload_grades_csv()
+
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 0, 'failed': 5}, json.loads(entry.task_output))
+        report_store = ReportStore.from_config()
+        self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
+
+    def test_chunk_failure(self):
+        def upload_chunk(student_ids, chunk_index, report_info, subtask_status):
+            """
+            Fail the second chunk, after it counted its first student as graded.
+            """
+            if chunk_index == 1:
+                subtask_status.increment(succeeded=1)
+                raise Exception('Chunk failed')
+            return upload_grades_csv_chunk(student_ids, chunk_index, report_info, subtask_status)
+
+        with patch('instructor_task.tasks.upload_grades_csv_chunk', side_effect=upload_chunk):
+            entry = self._upload_grades_csv()
+
+        subtasks = json.loads(entry.subtasks)
+        self.assertEqual((subtasks['succeeded'], subtasks['failed']), (2, 1))
+        # The students of the failed chunk are only counted once, as failed
+        chunk_statuses = subtasks['status'].values()
+        self.assertEqual(sum(status['failed'] for status in chunk_statuses), 2)
+        self.assertEqual(sum(status['succeeded'] for status in chunk_statuses), 3)
+        self.assertEqual(entry.task_state, FAILURE)
+        # No report lacking the students of the failed chunk is published, and the
+        # partial files of the other chunks are deleted
+        report_store = ReportStore.from_config()
+        self.assertEqual(report_store.links_for(self.course.id), [])
+        self.assertEqual(os.listdir(report_store.path_to(self.course.id, '')), [])
+
+    @patch('instructor_task.tasks_helper.merge_grades_csv_chunks', side_effect=Exception('Merge failed'))
+    def test_merge_failure(self, _mock_merge):
+        entry = self._upload_grades_csv()
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['message'], 'Merge failed')
+
+    def test_read_failure(self):
+        def read_rows(_course_id, _filename):
+            """
+            Fail after reading the first row of a partial CSV.
+            """
+            yield [u'first row']
+            raise IOError('Read failed')
+
+        with patch.object(LocalFSReportStore, 'read_rows', side_effect=read_rows):
+            entry = self._upload_grades_csv()
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['message'], 'Read failed')
+        report_store = ReportStore.from_config()
+        self.assertEqual(os.listdir(report_store.path_to(self.course.id, '')), [])
+
+    def test_header_matches_serial_report(self):
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            upload_grades_csv(None, None, self.course.id, None, 'graded')
+        report_store = ReportStore.from_config()
+        serial_report = report_store.links_for(self.course.id)[0][0]
+        serial_header = next(report_store.read_rows(self.course.id, serial_report))
+        report_store.delete(self.course.id, serial_report)
+
+        self._upload_grades_csv()
+        parallel_report = report_store.links_for(self.course.id)[0][0]
+        self.assertEqual(next(report_store.read_rows(self.course.id, parallel_report)), serial_header)
+
+
 class TestProblemGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
     """
     Test that the problem CSV generation works.
@@ -600,6 +600,39 @@ class TestMidcourseReverification(ModuleStoreTestCase):
         # should now return True because all windows have approved verifications
         self.assertTrue(SoftwareSecurePhotoVerification.user_is_reverified_for_all(self.course.id, self.user))
 
+    def test_verification_statuses_for_users(self):
+        window = MidcourseReverificationWindowFactory(
+            course_id=self.course.id,
+            start_date=datetime.now(pytz.UTC) - timedelta(days=15),
+            end_date=datetime.now(pytz.UTC) - timedelta(days=13),
+        )
+        reverified_user, expired_user, unverified_user, honor_user = [UserFactory.create() for __ in range(4)]
+        for user in (reverified_user, expired_user, honor_user):
+            SoftwareSecurePhotoVerification.objects.create(status="approved", user=user)
+        SoftwareSecurePhotoVerification.objects.create(status="approved", user=reverified_user, window=window)
+        SoftwareSecurePhotoVerification.objects.create(status="approved", user=expired_user, window=window)
+        SoftwareSecurePhotoVerification.objects.create(status="must_retry", user=expired_user, window=window)
+
+        users = [reverified_user, expired_user, unverified_user, honor_user]
+        enrollment_modes = {user.id: 'verified' for user in users}
+        enrollment_modes[honor_user.id] = 'honor'
+        statuses = SoftwareSecurePhotoVerification.verification_statuses_for_users(
+            [user.id for user in users], self.course.id, enrollment_modes
+        )
+        self.assertEqual(statuses, {
+            reverified_user.id: 'ID Verified',
+            expired_user.id: 'ID Verification Expired',
+            unverified_user.id: 'Not ID Verified',
+            honor_user.id: 'N/A',
+        })
+        for user in users:
+            self.assertEqual(
+                statuses[user.id],
+                SoftwareSecurePhotoVerification.verification_status_for_user(
+                    user, self.course.id, enrollment_modes[user.id]
+                )
+            )
+
     def test_original_verification(self):
         orig_attempt = SoftwareSecurePhotoVerification(user=self.user)
         orig_attempt.save()
@@ -201,11 +201,13 @@ PAYMENT_REPORT_GENERATOR_GROUP = ENV_TOKENS.get('PAYMENT_REPORT_GENERATOR_GROUP'
 # Bulk Email overrides
 BULK_EMAIL_DEFAULT_FROM_EMAIL = ENV_TOKENS.get('BULK_EMAIL_DEFAULT_FROM_EMAIL', BULK_EMAIL_DEFAULT_FROM_EMAIL)
 BULK_EMAIL_EMAILS_PER_TASK = ENV_TOKENS.get('BULK_EMAIL_EMAILS_PER_TASK', BULK_EMAIL_EMAILS_PER_TASK)
+BULK_EMAIL_EMAILS_PER_QUERY = ENV_TOKENS.get('BULK_EMAIL_EMAILS_PER_QUERY', BULK_EMAIL_EMAILS_PER_QUERY)
 BULK_EMAIL_DEFAULT_RETRY_DELAY = ENV_TOKENS.get('BULK_EMAIL_DEFAULT_RETRY_DELAY', BULK_EMAIL_DEFAULT_RETRY_DELAY)
 BULK_EMAIL_MAX_RETRIES = ENV_TOKENS.get('BULK_EMAIL_MAX_RETRIES', BULK_EMAIL_MAX_RETRIES)
 BULK_EMAIL_INFINITE_RETRY_CAP = ENV_TOKENS.get('BULK_EMAIL_INFINITE_RETRY_CAP', BULK_EMAIL_INFINITE_RETRY_CAP)
 BULK_EMAIL_LOG_SENT_EMAILS = ENV_TOKENS.get('BULK_EMAIL_LOG_SENT_EMAILS', BULK_EMAIL_LOG_SENT_EMAILS)
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get('BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS', BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+BULK_EMAIL_CONNECTION_MAX_IDLE = ENV_TOKENS.get('BULK_EMAIL_CONNECTION_MAX_IDLE', BULK_EMAIL_CONNECTION_MAX_IDLE)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -257,6 +259,9 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_POOL_MAXSIZE = ENV_TOKENS.get("COMMENTS_SERVICE_POOL_MAXSIZE", 10)
+COMMENTS_SERVICE_CONCURRENCY = ENV_TOKENS.get("COMMENTS_SERVICE_CONCURRENCY", 4)
+COMMENTS_SERVICE_CACHE_TIMEOUT = ENV_TOKENS.get("COMMENTS_SERVICE_CACHE_TIMEOUT", 0)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 ZENDESK_URL = ENV_TOKENS.get("ZENDESK_URL")
 FEEDBACK_SUBMISSION_EMAIL = ENV_TOKENS.get("FEEDBACK_SUBMISSION_EMAIL")
@@ -403,6 +408,9 @@ XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
+SPLIT_STRUCTURE_CACHE_SIZE = ENV_TOKENS.get('SPLIT_STRUCTURE_CACHE_SIZE', SPLIT_STRUCTURE_CACHE_SIZE)
+STATIC_CONTENT_DISK_CACHE_DIR = ENV_TOKENS.get('STATIC_CONTENT_DISK_CACHE_DIR', STATIC_CONTENT_DISK_CACHE_DIR)
+STATIC_CONTENT_DISK_CACHE_SIZE = ENV_TOKENS.get('STATIC_CONTENT_DISK_CACHE_SIZE', STATIC_CONTENT_DISK_CACHE_SIZE)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
 
 OPEN_ENDED_GRADING_INTERFACE = AUTH_TOKENS.get('OPEN_ENDED_GRADING_INTERFACE',
@@ -477,6 +485,9 @@ VERIFY_STUDENT = AUTH_TOKENS.get("VERIFY_STUDENT", VERIFY_STUDENT)
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = ENV_TOKENS.get(
+    "GRADES_DOWNLOAD_STUDENTS_PER_TASK", GRADES_DOWNLOAD_STUDENTS_PER_TASK
+)
 
 ##### ORA2 ######
 # Prefix for uploads of example-based assessment AI classifiers
@@ -395,6 +395,10 @@ FEATURES = {
 
     # Teams feature
     'ENABLE_TEAMS': False,
+
+    # Store computed subsection and course grades, and only recompute the
+    # parts of a student's grade whose scores have changed since.
+    'ENABLE_PERSISTENT_GRADES': False,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -742,6 +746,16 @@ MODULESTORE = {
     }
 }
 
+# Maximum size in bytes of the process-wide cache of split modulestore structures. Structures
+# are immutable, so this cache never needs invalidating. Set to 0 to disable it.
+SPLIT_STRUCTURE_CACHE_SIZE = 100 * 1024 * 1024
+
+# Directory in which the StaticContentServer caches assets too big for memcached (1MB and over),
+# so that they aren't read out of GridFS on every request, and the maximum total size in bytes of
+# the cached files. Set the directory to None to disable this cache.
+STATIC_CONTENT_DISK_CACHE_DIR = None
+STATIC_CONTENT_DISK_CACHE_SIZE = 5 * 1024 * 1024 * 1024
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -1550,6 +1564,9 @@ BULK_EMAIL_DEFAULT_FROM_EMAIL = 'no-reply@example.com'
 # Parameters for breaking down course enrollment into subtasks.
 BULK_EMAIL_EMAILS_PER_TASK = 100
 
+# Number of recipients read from the database per query, when queuing subtasks.
+BULK_EMAIL_EMAILS_PER_QUERY = 1000
+
 # Initial delay used for retrying tasks.  Additional retries use
 # longer delays.  Value is in seconds.
 BULK_EMAIL_DEFAULT_RETRY_DELAY = 30
@@ -1585,6 +1602,11 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of seconds a worker keeps its email connection open between bulk email
+# subtasks, so that the next subtask can reuse it rather than connect again.
+# Set to 0 to open a new connection for every subtask.
+BULK_EMAIL_CONNECTION_MAX_IDLE = 30
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -1752,6 +1774,7 @@ INSTALLED_APPS = (
     'lms.djangoapps.lms_xblock',
 
     'openedx.core.djangoapps.content.course_structures',
+    'openedx.core.djangoapps.content.course_overviews',
     'course_structure_api',
 
     # Mailchimp Syncing
@@ -1952,6 +1975,10 @@ CERT_NAME_LONG = "Certificate of Achievement"
 ###################### Grade Downloads ######################
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Grade reports of courses with more enrolled students than this are generated
+# in parallel, by subtasks which each grade this many students.
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = 1000
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
@@ -159,6 +159,12 @@ update_module_store_settings(
     },
 )
 
+# Keep mongo call counts in tests deterministic across test cases
+SPLIT_STRUCTURE_CACHE_SIZE = 0
+
+# Don't let a test case send bulk email over the connection (or mock) left by another
+BULK_EMAIL_CONNECTION_MAX_IDLE = 0
+
 CONTENTSTORE = {
     'ENGINE': 'xmodule.contentstore.mongo.MongoContentStore',
     'DOC_STORE_CONFIG': {
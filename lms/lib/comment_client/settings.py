@@ -6,3 +6,9 @@ else:
     SERVICE_HOST = 'http://localhost:4567'
 
 PREFIX = SERVICE_HOST + '/api/v1'
+
+# The number of connections to the comments service kept alive by each process
+POOL_MAXSIZE = getattr(settings, "COMMENTS_SERVICE_POOL_MAXSIZE", 10)
+
+# The number of threads of each process making the calls of `perform_concurrently`
+CONCURRENCY = getattr(settings, "COMMENTS_SERVICE_CONCURRENCY", 4)
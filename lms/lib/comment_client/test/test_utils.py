@@ -0,0 +1,157 @@
+"""
+Tests of the requests made to the comments service.
+"""
+from functools import partial
+from multiprocessing.pool import ThreadPool
+import threading
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import translation
+import mock
+
+from lms.lib.comment_client.utils import (
+    CommentClient500Error, CommentClientRequestError, perform_concurrently, perform_request
+)
+
+
+class PerformRequestTestCase(TestCase):
+    """
+    Tests of the requests made through the shared session.
+    """
+    @mock.patch('lms.lib.comment_client.utils.SESSION.request')
+    def test_session_used(self, mock_request):
+        mock_request.return_value = mock.Mock(status_code=200, json=lambda: {'id': 'dummy'})
+        self.assertEqual(perform_request('get', 'http://localhost:4567/api/v1/threads/dummy'), {'id': 'dummy'})
+        self.assertEqual(perform_request('get', 'http://localhost:4567/api/v1/threads/dummy'), {'id': 'dummy'})
+        self.assertEqual(mock_request.call_count, 2)
+
+
+class PerformConcurrentlyTestCase(TestCase):
+    """
+    Tests of `perform_concurrently`.
+    """
+    def test_results_in_order(self):
+        def call(value):
+            """
+            Return the value and the thread which made the call.
+            """
+            return value, threading.current_thread()
+
+        results = perform_concurrently(*[partial(call, value) for value in range(3)])
+        self.assertEqual([value for value, __ in results], range(3))
+        self.assertTrue(all(thread is not threading.current_thread() for __, thread in results))
+
+    def test_pool_shared(self):
+        with mock.patch('lms.lib.comment_client.utils.ThreadPool', wraps=ThreadPool) as mock_pool:
+            with mock.patch('lms.lib.comment_client.utils._POOL', None):
+                perform_concurrently(threading.current_thread, threading.current_thread)
+                perform_concurrently(threading.current_thread, threading.current_thread)
+        self.assertEqual(mock_pool.call_count, 1)
+
+    def test_single_call(self):
+        self.assertEqual(perform_concurrently(threading.current_thread), [threading.current_thread()])
+
+    def test_request_language(self):
+        with translation.override('eo'):
+            self.assertEqual(perform_concurrently(translation.get_language, translation.get_language), ['eo', 'eo'])
+
+    def test_errors_raised(self):
+        calls = []
+
+        def fail():
+            """
+            Fail like a request to the comments service.
+            """
+            raise CommentClientRequestError('Not found', 404)
+
+        with self.assertRaises(CommentClientRequestError):
+            perform_concurrently(fail, partial(calls.append, 'other'))
+        # The other calls are still made
+        self.assertEqual(calls, ['other'])
+
+
+@override_settings(COMMENTS_SERVICE_CACHE_TIMEOUT=60)
+@mock.patch('lms.lib.comment_client.utils.SESSION.request')
+class ResponseCacheTestCase(TestCase):
+    """
+    Tests of the cache of the comments service responses.
+    """
+    THREADS_URL = 'http://localhost:4567/api/v1/threads'
+    THREAD_URL = THREADS_URL + '/dummy'
+
+    def setUp(self):
+        super(ResponseCacheTestCase, self).setUp()
+        cache.clear()
+
+    def _set_response(self, mock_request, status_code=200, data=None):
+        """
+        Make the comments service respond with the given status code and data.
+        """
+        mock_request.return_value = mock.Mock(status_code=status_code, text='error', json=lambda: data)
+
+    def test_responses_cached(self, mock_request):
+        self._set_response(mock_request, data={'id': 'dummy', 'title': 'Cached'})
+        self.assertEqual(perform_request('get', self.THREAD_URL, {'user_id': 1})['title'], 'Cached')
+        self._set_response(mock_request, data={'id': 'dummy', 'title': 'Changed'})
+        self.assertEqual(perform_request('get', self.THREAD_URL, {'user_id': 1})['title'], 'Cached')
+        self.assertEqual(mock_request.call_count, 1)
+
+        # Different parameters
+        self.assertEqual(perform_request('get', self.THREAD_URL, {'user_id': 2})['title'], 'Changed')
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_writes_invalidate_responses(self, mock_request):
+        self._set_response(mock_request, data={'id': 'dummy', 'pinned': False})
+        perform_request('get', self.THREAD_URL)
+        self._set_response(mock_request, data={'id': 'dummy', 'pinned': True})
+        perform_request('put', self.THREAD_URL + '/pin', {'user_id': 1})
+        self.assertTrue(perform_request('get', self.THREAD_URL)['pinned'])
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_writes_invalidate_course_responses(self, mock_request):
+        self._set_response(mock_request, data={'collection': []})
+        perform_request('get', self.THREADS_URL, {'course_id': 'org/course/run'})
+        perform_request('get', self.THREADS_URL, {'course_id': 'org/other_course/run'})
+        perform_request('get', self.THREAD_URL)
+        perform_request('post', self.THREADS_URL, {'course_id': 'org/course/run', 'body': 'dummy'})
+        self.assertEqual(mock_request.call_count, 4)
+
+        # The responses for the course and those not for any course are
+        # invalidated, but not those for other courses
+        perform_request('get', self.THREADS_URL, {'course_id': 'org/course/run'})
+        perform_request('get', self.THREAD_URL)
+        self.assertEqual(mock_request.call_count, 6)
+        perform_request('get', self.THREADS_URL, {'course_id': 'org/other_course/run'})
+        self.assertEqual(mock_request.call_count, 6)
+
+    def test_writes_not_for_a_course_invalidate_all_responses(self, mock_request):
+        self._set_response(mock_request, data={'collection': []})
+        perform_request('get', self.THREADS_URL, {'course_id': 'org/course/run'})
+        perform_request('delete', self.THREAD_URL)
+        perform_request('get', self.THREADS_URL, {'course_id': 'org/course/run'})
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_failed_writes_invalidate_responses(self, mock_request):
+        self._set_response(mock_request, data={'id': 'dummy'})
+        perform_request('get', self.THREAD_URL)
+        self._set_response(mock_request, status_code=500)
+        with self.assertRaises(CommentClient500Error):
+            perform_request('delete', self.THREAD_URL)
+        with self.assertRaises(CommentClient500Error):
+            perform_request('get', self.THREAD_URL)
+
+    def test_errors_not_cached(self, mock_request):
+        self._set_response(mock_request, status_code=404)
+        with self.assertRaises(CommentClientRequestError):
+            perform_request('get', self.THREAD_URL)
+        self._set_response(mock_request, data={'id': 'dummy'})
+        self.assertEqual(perform_request('get', self.THREAD_URL), {'id': 'dummy'})
+
+    @override_settings(COMMENTS_SERVICE_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self, mock_request):
+        self._set_response(mock_request, data={'id': 'dummy'})
+        perform_request('get', self.THREAD_URL)
+        perform_request('get', self.THREAD_URL)
+        self.assertEqual(mock_request.call_count, 2)
@@ -1,15 +1,52 @@
 from contextlib import contextmanager
+from cookielib import DefaultCookiePolicy
 import dogstats_wrapper as dog_stats_api
+import hashlib
 import logging
+from multiprocessing.pool import ThreadPool
+import os
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
+from django.core.cache import cache
+from threading import Lock
 from time import time
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
 
+from . import settings as cc_settings
+
 log = logging.getLogger(__name__)
 
 
+class _NoCookiesPolicy(DefaultCookiePolicy):
+    """
+    Cookie policy rejecting all cookies, since the session is shared by the
+    requests made on behalf of every user.
+    """
+    def set_ok(self, cookie, request):
+        return False
+
+
+def _create_session():
+    """
+    Returns a requests session keeping up to `COMMENTS_SERVICE_POOL_MAXSIZE`
+    connections to the comments service alive, for reuse by later requests.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(_NoCookiesPolicy())
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=cc_settings.POOL_MAXSIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# The connections are only opened when requests are made, so processes forked
+# after this module is imported each get their own.
+SESSION = _create_session()
+
+
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
 
@@ -52,7 +89,120 @@ def request_timer(request_id, method, url, tags=None):
 
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
+    """
+    Makes a request to the comments service, and returns its response: the
+    response text if `raw` is True, otherwise the JSON-decoded response.
+
+    When `COMMENTS_SERVICE_CACHE_TIMEOUT` is set, the responses of GET requests
+    are cached for that many seconds, keyed by the url and the parameters of
+    the request. Any other request invalidates the cached responses it may
+    change: those for its course, and those not for any course, when it is
+    for a course; all of them otherwise.
+    """
+    cache_timeout = getattr(settings, "COMMENTS_SERVICE_CACHE_TIMEOUT", 0)
+    if not cache_timeout:
+        return _perform_request(method, url, data_or_params, raw, metric_action, metric_tags, paged_results)
+
+    course_id = _request_course_id(data_or_params)
+    if method != 'get':
+        try:
+            return _perform_request(method, url, data_or_params, raw, metric_action, metric_tags, paged_results)
+        finally:
+            _invalidate_cached_responses(course_id)
+
+    cache_key = _response_cache_key(url, data_or_params, raw, course_id)
+    response = cache.get(cache_key)
+    tags = [u'action:{}'.format(metric_action)] if metric_action else []
+    if response is not None:
+        dog_stats_api.increment('comment_client.cache', tags=tags + [u'result:hit'])
+        return response
+
+    dog_stats_api.increment('comment_client.cache', tags=tags + [u'result:miss'])
+    response = _perform_request(method, url, data_or_params, raw, metric_action, metric_tags, paged_results)
+    cache.set(cache_key, response, cache_timeout)
+    return response
+
+
+# The cache keys of the current generations of cached responses, which are
+# changed to invalidate them. The responses to requests for a course belong to
+# the generation of the course, and the others to the generation of requests
+# not for any course. All of them also belong to the global generation.
+RESPONSE_CACHE_GENERATION_KEY = 'comment_client.response_cache_generation'
+COURSE_RESPONSE_CACHE_GENERATION_KEY = u'comment_client.response_cache_generation.course.{}'
+NO_COURSE_RESPONSE_CACHE_GENERATION_KEY = 'comment_client.response_cache_generation.no_course'
+
+
+def _request_course_id(data_or_params):
+    """
+    Returns the id of the course the request is for, or None if it doesn't
+    name one.
+    """
+    course_id = (data_or_params or {}).get('course_id')
+    return unicode(course_id) if course_id else None
+
+
+def _generation_keys(course_id):
+    """
+    Returns the cache keys of the generations of the responses to requests for
+    the course, or to requests not for any course if `course_id` is None.
+    """
+    if course_id is None:
+        return [RESPONSE_CACHE_GENERATION_KEY, NO_COURSE_RESPONSE_CACHE_GENERATION_KEY]
+    return [RESPONSE_CACHE_GENERATION_KEY, COURSE_RESPONSE_CACHE_GENERATION_KEY.format(course_id)]
+
+
+def _response_cache_key(url, data_or_params, raw, course_id):
+    """
+    Returns the key of the cached response to the GET request, in the current
+    generations of cached responses.
+    """
+    generation_keys = _generation_keys(course_id)
+    generations = cache.get_many(generation_keys)
+    for generation_key in generation_keys:
+        if generations.get(generation_key) is None:
+            generations[generation_key] = _start_generation(generation_key)
 
+    request_hash = hashlib.md5()
+    request_hash.update(repr((url, sorted((data_or_params or {}).items()), raw, get_language())))
+    return u'comment_client.response.{}.{}'.format(
+        '.'.join(unicode(generations[generation_key]) for generation_key in generation_keys),
+        request_hash.hexdigest()
+    )
+
+
+def _invalidate_cached_responses(course_id):
+    """
+    Starts new generations of the cached responses which a request for the
+    course may change: the responses for the course and those not for any
+    course. A request not for any course starts a new global generation, since
+    it may change any response.
+    """
+    if course_id is None:
+        _start_generation(RESPONSE_CACHE_GENERATION_KEY)
+    else:
+        _start_generation(COURSE_RESPONSE_CACHE_GENERATION_KEY.format(course_id))
+        _start_generation(NO_COURSE_RESPONSE_CACHE_GENERATION_KEY)
+
+
+def _start_generation(generation_key):
+    """
+    Starts a new generation of cached responses, and returns it.
+    """
+    try:
+        return cache.incr(generation_key)
+    except ValueError:
+        # The generation isn't cached: start from the current time rather than
+        # from a constant, so that responses cached in earlier generations are
+        # never used again.
+        generation = int(time() * 1000)
+        cache.set(generation_key, generation)
+        return generation
+
+
+def _perform_request(method, url, data_or_params, raw, metric_action, metric_tags, paged_results):
+    """
+    Makes a request to the comments service, see `perform_request`.
+    """
     if metric_tags is None:
         metric_tags = []
 
@@ -76,7 +226,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = SESSION.request(
             method,
             url,
             data=data,
@@ -132,6 +282,59 @@ def perform_request(method, url, data_or_params=None, raw=False,
             return data
 
 
+# The thread pool making the calls of `perform_concurrently`, and the process
+# it was created in: the threads of a pool aren't copied into forked processes,
+# so each process creates its own pool on first use.
+_POOL = None
+_POOL_PID = None
+_POOL_LOCK = Lock()
+
+
+def _get_pool():
+    """
+    Returns the thread pool of the current process.
+    """
+    global _POOL, _POOL_PID  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != os.getpid():
+            _POOL = ThreadPool(cc_settings.CONCURRENCY)
+            _POOL_PID = os.getpid()
+        return _POOL
+
+
+def perform_concurrently(*calls):
+    """
+    Makes independent calls to the comments service at the same time, and
+    returns their results in order. The calls of all the requests handled by
+    the process share a pool of `COMMENTS_SERVICE_CONCURRENCY` threads.
+
+    Each call is a function taking no argument, such as a `functools.partial`
+    of `perform_request` or of a model's method, which is made in the language
+    of the current request. Any exception raised by a call is raised again
+    once all the calls are done. Since the calls are made from other threads,
+    they must not use the database or the modulestore, nor call
+    `perform_concurrently` themselves.
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+
+    language = get_language()
+
+    def make_call(call):
+        """
+        Make the call in the language of the request.
+        """
+        with translation.override(language):
+            return call()
+
+    pool = _get_pool()
+    results = [pool.apply_async(make_call, (call,)) for call in calls]
+    # Wait for all the calls before raising any exception
+    for result in results:
+        result.wait()
+    return [result.get() for result in results]
+
+
 class CommentClientError(Exception):
     def __init__(self, msg):
         self.message = msg
@@ -0,0 +1,4 @@
+"""
+A SQL table of the course information shown in course catalogs, dashboards and listings,
+so that rendering them doesn't require loading courses from the modulestore.
+"""
@@ -0,0 +1,55 @@
+"""
+Command to create the overviews of one or more courses.
+"""
+import logging
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.keys import CourseKey
+from xmodule.modulestore.django import modulestore
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Creates the CourseOverviews of courses which don't have an up to date one yet.
+
+    The overviews of all the existing courses are created by a data migration when the
+    course_overviews app is deployed; run it with --all to create any which failed then.
+    """
+    args = '<course_id course_id ...>'
+    help = 'Generates and stores course overviews for one or more courses.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--all',
+                    action='store_true',
+                    default=False,
+                    help='Generate overviews for all courses.'),
+    )
+
+    def handle(self, *args, **options):
+
+        if options['all']:
+            course_keys = [course.id for course in modulestore().get_courses()]
+        else:
+            course_keys = [CourseKey.from_string(arg) for arg in args]
+
+        if not course_keys:
+            log.fatal('No courses specified.')
+            return
+
+        log.info('Generating course overviews for %d courses.', len(course_keys))
+
+        for course_key in course_keys:
+            try:
+                if CourseOverview.get_from_id(course_key) is None:
+                    log.warning(u'Course %s does not exist or fails to load.', unicode(course_key))
+            except Exception as ex:  # pylint: disable=broad-except
+                log.exception(u'An error occurred while generating course overview for %s: %s',
+                              unicode(course_key), ex.message)
+
+        log.info('Finished generating course overviews.')
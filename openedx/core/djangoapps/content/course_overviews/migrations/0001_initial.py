@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'CourseOverview'
+        db.create_table('course_overviews_courseoverview', (
+            ('created', self.gf('model_utils.fields.AutoCreatedField')(default=datetime.datetime.now)),
+            ('modified', self.gf('model_utils.fields.AutoLastModifiedField')(default=datetime.datetime.now)),
+            ('version', self.gf('django.db.models.fields.IntegerField')()),
+            ('id', self.gf('xmodule_django.models.CourseKeyField')(max_length=255, primary_key=True, db_index=True)),
+            ('display_name', self.gf('django.db.models.fields.TextField')(null=True)),
+            ('display_number_with_default', self.gf('django.db.models.fields.TextField')()),
+            ('display_org_with_default', self.gf('django.db.models.fields.TextField')()),
+            ('start', self.gf('django.db.models.fields.DateTimeField')(null=True)),
+            ('end', self.gf('django.db.models.fields.DateTimeField')(null=True)),
+            ('advertised_start', self.gf('django.db.models.fields.TextField')(null=True)),
+            ('announcement', self.gf('django.db.models.fields.DateTimeField')(null=True)),
+            ('course_image_url', self.gf('django.db.models.fields.TextField')()),
+            ('social_sharing_url', self.gf('django.db.models.fields.TextField')(null=True)),
+            ('end_of_course_survey_url', self.gf('django.db.models.fields.TextField')(null=True)),
+            ('certificates_display_behavior', self.gf('django.db.models.fields.TextField')(null=True)),
+            ('certificates_show_before_end', self.gf('django.db.models.fields.BooleanField')(default=False)),
+            ('cert_name_short', self.gf('django.db.models.fields.TextField')()),
+            ('cert_name_long', self.gf('django.db.models.fields.TextField')()),
+            ('days_early_for_beta', self.gf('django.db.models.fields.FloatField')(null=True)),
+            ('mobile_available', self.gf('django.db.models.fields.BooleanField')(default=False)),
+            ('visible_to_staff_only', self.gf('django.db.models.fields.BooleanField')(default=False)),
+            ('_pre_requisite_courses_json', self.gf('django.db.models.fields.TextField')()),
+            ('enrollment_start', self.gf('django.db.models.fields.DateTimeField')(null=True)),
+            ('enrollment_end', self.gf('django.db.models.fields.DateTimeField')(null=True)),
+            ('enrollment_domain', self.gf('django.db.models.fields.TextField')(null=True)),
+            ('invitation_only', self.gf('django.db.models.fields.BooleanField')(default=False)),
+            ('catalog_visibility', self.gf('django.db.models.fields.TextField')(null=True)),
+        ))
+        db.send_create_signal('course_overviews', ['CourseOverview'])
+
+
+    def backwards(self, orm):
+        # Deleting model 'CourseOverview'
+        db.delete_table('course_overviews_courseoverview')
+
+
+    models = {
+        'course_overviews.courseoverview': {
+            'Meta': {'object_name': 'CourseOverview'},
+            '_pre_requisite_courses_json': ('django.db.models.fields.TextField', [], {}),
+            'advertised_start': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'announcement': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'catalog_visibility': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'cert_name_long': ('django.db.models.fields.TextField', [], {}),
+            'cert_name_short': ('django.db.models.fields.TextField', [], {}),
+            'certificates_display_behavior': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'certificates_show_before_end': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'course_image_url': ('django.db.models.fields.TextField', [], {}),
+            'created': ('model_utils.fields.AutoCreatedField', [], {'default': 'datetime.datetime.now'}),
+            'days_early_for_beta': ('django.db.models.fields.FloatField', [], {'null': 'True'}),
+            'display_name': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'display_number_with_default': ('django.db.models.fields.TextField', [], {}),
+            'display_org_with_default': ('django.db.models.fields.TextField', [], {}),
+            'end': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'end_of_course_survey_url': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'enrollment_domain': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'enrollment_end': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'enrollment_start': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'id': ('xmodule_django.models.CourseKeyField', [], {'max_length': '255', 'primary_key': 'True', 'db_index': 'True'}),
+            'invitation_only': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'mobile_available': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'modified': ('model_utils.fields.AutoLastModifiedField', [], {'default': 'datetime.datetime.now'}),
+            'social_sharing_url': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'start': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'version': ('django.db.models.fields.IntegerField', [], {}),
+            'visible_to_staff_only': ('django.db.models.fields.BooleanField', [], {'default': 'False'})
+        }
+    }
+
+    complete_apps = ['course_overviews']
@@ -0,0 +1,341 @@
+"""
+Declaration of CourseOverview model
+"""
+import json
+from datetime import datetime
+from math import exp
+
+import dateutil.parser
+from django.db import models, IntegrityError
+from django.utils.translation import ugettext
+from model_utils.models import TimeStampedModel
+from pytz import UTC
+
+from util.date_utils import strftime_localized
+from xmodule.course_module import CourseDescriptor, CourseFields
+from xmodule.fields import Date
+from xmodule.modulestore.django import modulestore
+from xmodule_django.models import CourseKeyField
+
+from openedx.core.lib.courses import course_image_url
+
+
+class CourseOverview(TimeStampedModel):
+    """
+    Model for storing and caching the basic information about a course.
+
+    Course catalog, dashboard and course listing pages read these instead of loading
+    the whole CourseDescriptor from the modulestore. Overviews are updated whenever
+    their course is published and deleted along with their course (see signals.py);
+    get_from_id creates any which are missing from the modulestore.
+
+    A CourseOverview implements the parts of the CourseDescriptor interface used by
+    those pages, so it can be used in their place.
+    """
+    # The version of the overview data: bump it whenever a field is added or
+    # computed differently, so that outdated overviews get recreated (and add a
+    # data migration running generate_course_overview, since outdated overviews
+    # aren't listed by get_all_courses).
+    VERSION = 2
+
+    version = models.IntegerField()
+
+    # Course identification
+    id = CourseKeyField(db_index=True, primary_key=True, max_length=255)  # pylint: disable=invalid-name
+    org = models.CharField(max_length=255, db_index=True)
+    display_name = models.TextField(null=True)
+    display_number_with_default = models.TextField()
+    display_org_with_default = models.TextField()
+
+    # Start/end dates
+    start = models.DateTimeField(null=True)
+    end = models.DateTimeField(null=True)
+    advertised_start = models.TextField(null=True)
+    announcement = models.DateTimeField(null=True)
+
+    # URLs
+    course_image_url = models.TextField()
+    social_sharing_url = models.TextField(null=True)
+    end_of_course_survey_url = models.TextField(null=True)
+
+    # Certification data
+    certificates_display_behavior = models.TextField(null=True)
+    certificates_show_before_end = models.BooleanField()
+    cert_name_short = models.TextField()
+    cert_name_long = models.TextField()
+    lowest_passing_grade = models.FloatField(null=True)
+
+    # Access parameters
+    days_early_for_beta = models.FloatField(null=True)
+    ispublic = models.NullBooleanField()
+    mobile_available = models.BooleanField()
+    visible_to_staff_only = models.BooleanField()
+    _pre_requisite_courses_json = models.TextField()  # JSON representation of list of CourseKey strings
+
+    # Enrollment parameters
+    enrollment_start = models.DateTimeField(null=True)
+    enrollment_end = models.DateTimeField(null=True)
+    enrollment_domain = models.TextField(null=True)
+    invitation_only = models.BooleanField()
+
+    # Catalog parameters
+    catalog_visibility = models.TextField(null=True)
+
+    @classmethod
+    def _create_from_course(cls, course):
+        """
+        Return a (not yet saved) CourseOverview of the CourseDescriptor `course`.
+        """
+        return cls(
+            version=cls.VERSION,
+            id=course.id,
+            org=course.id.org,
+            display_name=course.display_name,
+            display_number_with_default=course.display_number_with_default,
+            display_org_with_default=course.display_org_with_default,
+
+            start=course.start,
+            end=course.end,
+            advertised_start=course.advertised_start,
+            announcement=course.announcement,
+
+            course_image_url=course_image_url(course),
+            social_sharing_url=course.social_sharing_url,
+            end_of_course_survey_url=course.end_of_course_survey_url,
+
+            certificates_display_behavior=course.certificates_display_behavior,
+            certificates_show_before_end=course.certificates_show_before_end,
+            cert_name_short=course.cert_name_short,
+            cert_name_long=course.cert_name_long,
+            lowest_passing_grade=course.lowest_passing_grade,
+
+            days_early_for_beta=course.days_early_for_beta,
+            ispublic=course.ispublic,
+            mobile_available=course.mobile_available,
+            visible_to_staff_only=course.visible_to_staff_only,
+            _pre_requisite_courses_json=json.dumps(course.pre_requisite_courses),
+
+            enrollment_start=course.enrollment_start,
+            enrollment_end=course.enrollment_end,
+            enrollment_domain=course.enrollment_domain,
+            invitation_only=course.invitation_only,
+
+            catalog_visibility=course.catalog_visibility,
+        )
+
+    @classmethod
+    def load_from_module_store(cls, course_id):
+        """
+        Create the CourseOverview of the course `course_id` from the modulestore, replacing
+        any existing one, and return it.
+
+        Returns None if the course doesn't exist or fails to load.
+        """
+        store = modulestore()
+        with store.bulk_operations(course_id):
+            course = store.get_course(course_id)
+        if not isinstance(course, CourseDescriptor):
+            # the course doesn't exist, or it's an ErrorDescriptor
+            return None
+
+        course_overview = cls._create_from_course(course)
+        try:
+            # updates the existing row if there's one
+            course_overview.save()
+        except IntegrityError:
+            # another process just created it: this one's just as good
+            pass
+        return course_overview
+
+    @classmethod
+    def get_from_id(cls, course_id):
+        """
+        Return the CourseOverview of the course `course_id`, creating it from the
+        modulestore if there isn't an up to date one yet.
+
+        Returns None if the course doesn't exist or fails to load.
+        """
+        try:
+            course_overview = cls.objects.get(id=course_id)
+            if course_overview.version >= cls.VERSION:
+                return course_overview
+        except cls.DoesNotExist:
+            pass
+
+        return cls.load_from_module_store(course_id)
+
+    @classmethod
+    def get_all_courses(cls, org=None):
+        """
+        Return the CourseOverviews of all the courses, or only of the courses in the
+        organization `org` if it's given.
+
+        Only the courses which have an up to date overview are returned: one is updated
+        whenever a course is published (see signals.py), and the overviews of the courses
+        which existed before were created by a data migration (or the generate_course_overview
+        command).
+        """
+        course_overviews = cls.objects.filter(version__gte=cls.VERSION)
+        if org:
+            course_overviews = course_overviews.filter(org=org)
+        return list(course_overviews)
+
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Return a dict mapping each course id in `course_ids` to its CourseOverview,
+        creating those which don't exist yet (see get_from_id).
+
+        Courses which don't exist or fail to load are left out.
+        """
+        course_overviews = {
+            course_overview.id: course_overview
+            for course_overview in cls.objects.filter(id__in=course_ids)
+            if course_overview.version >= cls.VERSION
+        }
+        for course_id in course_ids:
+            if course_id not in course_overviews:
+                course_overview = cls.get_from_id(course_id)
+                if course_overview is not None:
+                    course_overviews[course_id] = course_overview
+        return course_overviews
+
+    @property
+    def location(self):
+        """
+        Returns the usage key of the course block.
+        """
+        # Old Mongo and XML courses are named after their run, Split ones are all named 'course'
+        return self.id.make_usage_key('course', self.id.run if self.id.deprecated else 'course')
+
+    @property
+    def number(self):
+        """
+        Returns the course's number.
+        """
+        return self.id.course
+
+    @property
+    def url_name(self):
+        """
+        Returns the url name of the course block.
+        """
+        return self.location.name
+
+    @property
+    def display_name_with_default(self):
+        """
+        Return the course's display name, or its url name if it doesn't have one.
+        """
+        name = self.display_name
+        if name is None:
+            name = self.url_name.replace('_', ' ')
+        return name.replace('<', '&lt;').replace('>', '&gt;')
+
+    @property
+    def pre_requisite_courses(self):
+        """
+        Returns a list of the course ids of the prerequisite courses of this course.
+        """
+        return json.loads(self._pre_requisite_courses_json)
+
+    def has_ended(self):
+        """
+        Returns True if the current time is after the specified course end date.
+        Returns False if there is no end date specified.
+        """
+        if self.end is None:
+            return False
+        return datetime.now(UTC) > self.end
+
+    def has_started(self):
+        """
+        Returns True if the current time is after the course start date.
+        """
+        return datetime.now(UTC) > self.start
+
+    def may_certify(self):
+        """
+        Return True if it is acceptable to show the student a certificate download link
+        """
+        show_early = (
+            self.certificates_display_behavior in ('early_with_info', 'early_no_info') or
+            self.certificates_show_before_end
+        )
+        return show_early or self.has_ended()
+
+    @property
+    def start_date_is_still_default(self):
+        """
+        Checks if the start date set for the course is still default, i.e. .start has not been modified,
+        and .advertised_start has not been set.
+        """
+        return self.advertised_start is None and self.start == CourseFields.start.default
+
+    def start_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the desired text corresponding the course's start date and time in UTC.  Prefers .advertised_start,
+        then falls back to .start
+        """
+        if self.advertised_start is not None:
+            try:
+                result = Date().from_json(self.advertised_start)
+            except ValueError:
+                result = None
+            if result is None:
+                return self.advertised_start.title()
+            return self._format_datetime(result, format_string)
+        elif self.start_date_is_still_default:
+            # Translators: TBD stands for 'To Be Determined' and is used when a course
+            # does not yet have an announced start date.
+            return ugettext('TBD')
+        return self._format_datetime(self.start, format_string)
+
+    def end_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the end date or date_time for the course formatted as a string.
+
+        If the course does not have an end date set (course.end is None), an empty string will be returned.
+        """
+        if self.end is None:
+            return ''
+        return self._format_datetime(self.end, format_string)
+
+    @staticmethod
+    def _format_datetime(date_time, format_string):
+        """
+        Formats `date_time` like the CourseDescriptor does, adding 'UTC' to date and time texts.
+        """
+        result = strftime_localized(date_time, format_string)
+        return result + u" UTC" if format_string == "DATE_TIME" else result
+
+    @property
+    def sorting_score(self):
+        """
+        Returns a tuple that can be used to sort the courses according
+        the how "new" they are. See CourseDescriptor.sorting_score.
+        """
+        now = datetime.now(UTC)
+        try:
+            start = dateutil.parser.parse(self.advertised_start)
+            if start.tzinfo is None:
+                start = start.replace(tzinfo=UTC)
+        except (ValueError, AttributeError):
+            start = self.start
+
+        scale = 300.0  # about a year
+        if self.announcement:
+            days = (now - self.announcement).days
+            score = -exp(-days / scale)
+        else:
+            days = (now - start).days
+            score = exp(days / scale)
+        return score
+
+    def __unicode__(self):
+        return unicode(self.id)
+
+
+# Signals must be imported in a file that is automatically loaded at app startup (e.g. models.py). We import them
+# at the end of this file to avoid circular dependencies.
+import signals  # pylint: disable=unused-import
@@ -0,0 +1,29 @@
+"""
+Signal handlers keeping the CourseOverviews in sync with their courses.
+"""
+from django.dispatch.dispatcher import receiver
+
+from xmodule.modulestore.django import SignalHandler
+
+
+@receiver(SignalHandler.course_published)
+def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Updates the overview of the published course.
+    """
+    # Import here to avoid a circular import.
+    from .tasks import update_course_overview
+
+    # The overview is updated in place, so that the course stays listed in the
+    # catalog until (and even if the task fails before) it's updated
+    update_course_overview.apply_async([unicode(course_key)], countdown=0)
+
+
+@receiver(SignalHandler.course_deleted)
+def listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Deletes the overview of the deleted course.
+    """
+    from .models import CourseOverview
+
+    CourseOverview.objects.filter(id=course_key).delete()
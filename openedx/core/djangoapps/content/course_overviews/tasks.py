@@ -0,0 +1,27 @@
+"""
+Asynchronous tasks for the course_overviews app.
+"""
+import logging
+
+from celery.task import task
+from opaque_keys.edx.keys import CourseKey
+
+
+log = logging.getLogger('edx.celery.task')
+
+
+@task(name=u'openedx.core.djangoapps.content.course_overviews.tasks.update_course_overview')
+def update_course_overview(course_key):
+    """
+    Creates or updates the overview of the specified course (in the database).
+    """
+    # Import here to avoid circular import.
+    from .models import CourseOverview
+
+    # CourseLocators aren't JSON-serializable, so callers pass the course key as a Unicode string.
+    if not isinstance(course_key, basestring):
+        raise ValueError('course_key must be a string. {} is not acceptable.'.format(type(course_key)))
+
+    course_key = CourseKey.from_string(course_key)
+    if CourseOverview.load_from_module_store(course_key) is None:
+        log.warning(u'Could not create the overview of course %s, which does not exist or fails to load', course_key)
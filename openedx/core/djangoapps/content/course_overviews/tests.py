@@ -0,0 +1,104 @@
+"""
+Tests for course_overviews app.
+"""
+import datetime
+
+from mock import patch
+from pytz import UTC
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.lib.courses import course_image_url
+
+
+class CourseOverviewTestCase(ModuleStoreTestCase):
+    """
+    Tests for CourseOverviews.
+    """
+    def setUp(self):
+        super(CourseOverviewTestCase, self).setUp()
+        self.course = CourseFactory.create(
+            org='TestOrg',
+            number='TestCourse',
+            run='TestRun',
+            display_name='Test Course',
+            start=datetime.datetime(2014, 1, 1, tzinfo=UTC),
+            end=datetime.datetime(2015, 1, 1, tzinfo=UTC),
+            metadata={'certificates_display_behavior': 'early_no_info', 'days_early_for_beta': 5},
+        )
+
+    def test_fields_copied_from_course(self):
+        course_overview = CourseOverview.get_from_id(self.course.id)
+        for attribute in (
+                'id', 'location', 'number', 'org', 'url_name', 'display_name', 'display_name_with_default',
+                'display_number_with_default', 'display_org_with_default', 'start', 'end', 'advertised_start',
+                'social_sharing_url', 'certificates_display_behavior', 'cert_name_short', 'cert_name_long',
+                'lowest_passing_grade', 'days_early_for_beta', 'ispublic', 'mobile_available',
+                'visible_to_staff_only', 'pre_requisite_courses',
+                'enrollment_start', 'enrollment_end', 'invitation_only', 'catalog_visibility',
+                'start_date_is_still_default',
+        ):
+            self.assertEqual(getattr(course_overview, attribute), getattr(self.course, attribute), attribute)
+        for method in ('has_started', 'has_ended', 'may_certify', 'start_datetime_text', 'end_datetime_text'):
+            self.assertEqual(getattr(course_overview, method)(), getattr(self.course, method)(), method)
+        self.assertEqual(course_overview.course_image_url, course_image_url(self.course))
+        self.assertEqual(course_overview.sorting_score, self.course.sorting_score)
+
+    def test_created_on_publish(self):
+        course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        self.assertTrue(CourseOverview.objects.filter(id=course.id).exists())
+
+    def test_updated_on_publish(self):
+        CourseOverview.get_from_id(self.course.id)
+        self.course.display_name = 'Updated Name'
+        self.store.update_item(self.course, ModuleStoreEnum.UserID.test)
+        self.assertEqual(CourseOverview.get_from_id(self.course.id).display_name, 'Updated Name')
+
+    def test_listed_while_updated_on_publish(self):
+        CourseOverview.get_from_id(self.course.id)
+        self.course.display_name = 'Updated Name'
+        with patch(
+            'openedx.core.djangoapps.content.course_overviews.models.CourseOverview.load_from_module_store',
+            return_value=None,
+        ) as mock_load:
+            # the task fails to update the overview
+            self.store.update_item(self.course, ModuleStoreEnum.UserID.test)
+        self.assertTrue(mock_load.called)
+        self.assertEqual([overview.id for overview in CourseOverview.get_all_courses()], [self.course.id])
+
+    def test_deleted_with_course(self):
+        CourseOverview.get_from_id(self.course.id)
+        modulestore().delete_course(self.course.id, ModuleStoreEnum.UserID.test)
+        self.assertFalse(CourseOverview.objects.filter(id=self.course.id).exists())
+        self.assertIsNone(CourseOverview.get_from_id(self.course.id))
+
+    def test_outdated_version_recreated(self):
+        CourseOverview.objects.filter(id=self.course.id).update(version=0, display_name='Stale Name')
+        course_overview = CourseOverview.get_from_id(self.course.id)
+        self.assertEqual(course_overview.version, CourseOverview.VERSION)
+        self.assertEqual(course_overview.display_name, self.course.display_name)
+
+    def test_get_from_ids(self):
+        other_course = CourseFactory.create(org='OtherOrg')
+        missing_course_key = other_course.id.replace(course='MissingCourse')
+        CourseOverview.objects.all().delete()
+
+        course_overviews = CourseOverview.get_from_ids([self.course.id, other_course.id, missing_course_key])
+        self.assertEqual(set(course_overviews), {self.course.id, other_course.id})
+
+    def test_get_all_courses(self):
+        CourseFactory.create(org='OtherOrg')
+        self.assertEqual(len(CourseOverview.get_all_courses()), 2)
+        self.assertEqual(
+            [course_overview.id for course_overview in CourseOverview.get_all_courses(org='TestOrg')],
+            [self.course.id]
+        )
+
+    def test_get_all_courses_skips_outdated(self):
+        CourseOverview.get_from_id(self.course.id)
+        CourseOverview.objects.filter(id=self.course.id).update(version=0)
+        self.assertEqual(CourseOverview.get_all_courses(), [])
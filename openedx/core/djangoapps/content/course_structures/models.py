@@ -32,9 +32,10 @@ class CourseStructure(TimeStampedModel):
         """
         Return the blocks in the order with which they're seen in the courseware. Parents are ordered before children.
         """
-        if self.structure:
+        structure = self.structure
+        if structure:
             ordered_blocks = OrderedDict()
-            self._traverse_tree(self.structure['root'], self.structure['blocks'], ordered_blocks)
+            self._traverse_tree(structure['root'], structure['blocks'], ordered_blocks)
             return ordered_blocks
 
     def _traverse_tree(self, block, unordered_structure, ordered_blocks, parent=None):
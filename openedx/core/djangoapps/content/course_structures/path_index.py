@@ -0,0 +1,162 @@
+"""
+A cache of where every block of a course is in the courseware, so that
+`jump_to` links don't have to walk up the course tree from the block.
+
+The path index of a course is rebuilt by a celery task whenever the course is
+published, or when it's found missing from the cache.  It's cached in shards,
+since the index of a large course doesn't fit in a single memcached value.
+"""
+import cPickle
+import logging
+import zlib
+
+from django.core.cache import cache
+
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.search import build_path_index, path_index_key, path_to_location
+
+
+log = logging.getLogger(__name__)
+
+# The index is rebuilt on publish: the timeout only bounds how long an index
+# built by a process not sharing the cache with the publishing one can be used.
+PATH_INDEX_CACHE_TIMEOUT = 60 * 60
+
+# How long to wait for the index to be rebuilt before queueing another rebuild
+PATH_INDEX_REBUILD_TIMEOUT = 5 * 60
+
+# The approximate size of each shard of the cached index: half of memcached's
+# default item size limit, to leave room for keys hashing unevenly.
+PATH_INDEX_SHARD_SIZE = 512 * 1024
+
+
+def get_path_to_location(course_key, usage_key):
+    """
+    Returns the same (course_key, chapter, section, position) tuple as
+    `xmodule.modulestore.search.path_to_location` for the block `usage_key`
+    in the course `course_key`, with a single lookup in the course's path
+    index.  If the index isn't cached, its rebuild is queued and the block is
+    looked up in the modulestore meanwhile.
+
+    Raises:
+        ItemNotFoundError if the block doesn't exist.
+        NoPathToItem if the block exists, but isn't accessible via a
+            chapter/section path in the course.
+    """
+    key = path_index_key(usage_key)
+    num_shards = cache.get(_cache_key(course_key))
+    path = None
+    # If num_shards is 0, the index of the course is too large to be cached
+    if num_shards != 0:
+        path_index = None
+        if num_shards is not None:
+            path_index = cache.get(_shard_cache_key(course_key, _shard_number(key, num_shards), num_shards))
+        if path_index is None:
+            _queue_path_index_rebuild(course_key)
+        else:
+            path = path_index.get(key)
+
+    if path is None:
+        # The block isn't in the course tree as it was when the index was
+        # built, or the index isn't cached: let the modulestore find
+        # where it is, or raise the appropriate error.
+        return path_to_location(modulestore(), usage_key)
+
+    chapter, section, position = path
+    return (course_key, chapter, section, position)
+
+
+def get_path_index(course_key):
+    """
+    Returns the path index of the course, building it if it isn't cached.
+    """
+    num_shards = cache.get(_cache_key(course_key))
+    if num_shards:
+        shard_keys = [_shard_cache_key(course_key, number, num_shards) for number in xrange(num_shards)]
+        shards = cache.get_many(shard_keys)
+        if len(shards) == num_shards:
+            path_index = {}
+            for shard in shards.itervalues():
+                path_index.update(shard)
+            return path_index
+    return update_path_index(course_key)
+
+
+def update_path_index(course_key):
+    """
+    Builds the path index of the course, caches it and returns it.
+
+    The cache key of the course holds the number of shards the index is split
+    into, or 0 if they couldn't all be cached, in which case the blocks are
+    looked up in the modulestore rather than rebuilding the index every time.
+    """
+    path_index = build_path_index(modulestore(), course_key)
+    num_shards = len(cPickle.dumps(path_index, cPickle.HIGHEST_PROTOCOL)) // PATH_INDEX_SHARD_SIZE + 1
+    shards = [{} for __ in xrange(num_shards)]
+    for key, path in path_index.iteritems():
+        shards[_shard_number(key, num_shards)][key] = path
+
+    shard_keys = [_shard_cache_key(course_key, number, num_shards) for number in xrange(num_shards)]
+    cache.set_many(dict(zip(shard_keys, shards)), PATH_INDEX_CACHE_TIMEOUT)
+    # Memcached silently drops values which are too large
+    if len(cache.get_many(shard_keys)) < num_shards:
+        log.warning(u'The path index of %s could not be cached in %d shards', course_key, num_shards)
+        num_shards = 0
+    cache.set(_cache_key(course_key), num_shards, PATH_INDEX_CACHE_TIMEOUT)
+    cache.delete(_rebuild_cache_key(course_key))
+    return path_index
+
+
+def clear_path_index(course_key):
+    """
+    Forgets about the cached path index of the course, and about any queued
+    rebuild of it.  Its shards are left to expire, since they can't be found
+    without the number of shards.
+    """
+    cache.delete_many([_cache_key(course_key), _rebuild_cache_key(course_key)])
+
+
+def _queue_path_index_rebuild(course_key):
+    """
+    Queues the rebuild of the path index of the course, unless one was queued
+    recently, so that the requests finding it missing don't all queue one.
+    """
+    # Import here to avoid circular import.
+    from .tasks import update_course_path_index
+
+    if cache.add(_rebuild_cache_key(course_key), True, PATH_INDEX_REBUILD_TIMEOUT):
+        update_course_path_index.apply_async([unicode(course_key)], countdown=0)
+
+
+def _cache_key(course_key):
+    """
+    Returns the cache key of the number of shards of the path index of the
+    course.
+    """
+    return u'course_structures.path_index.{}'.format(course_key.for_branch(None).version_agnostic())
+
+
+def _rebuild_cache_key(course_key):
+    """
+    Returns the cache key marking that a rebuild of the path index of the
+    course was queued.
+    """
+    return u'{}.rebuilding'.format(_cache_key(course_key))
+
+
+def _shard_cache_key(course_key, number, num_shards):
+    """
+    Returns the cache key of a shard of the path index of the course.  The
+    number of shards is part of the key, so that a shard of an index split
+    differently can't be mistaken for it.
+    """
+    return u'{}.{}/{}'.format(_cache_key(course_key), number, num_shards)
+
+
+def _shard_number(key, num_shards):
+    """
+    Returns the number of the shard of the path index holding the block with
+    the `path_index_key` `key`.  This must be the same in every process, so
+    the key's hash() can't be used.
+    """
+    return zlib.crc32(key.encode('utf-8')) % num_shards
@@ -8,6 +8,20 @@ from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger('edx.celery.task')
 
+# The version of the course structure format, which is increased whenever the
+# data collected for the blocks changes, so that outdated structures can be told apart.
+STRUCTURE_VERSION = 2
+
+# The fields collected for the blocks used in navigation, access checks and
+# grading, with the value used for blocks which don't have the field.
+COLLECTED_FIELDS = (
+    ('start', None),
+    ('due', None),
+    ('visible_to_staff_only', False),
+    ('group_access', {}),
+    ('weight', None),
+)
+
 
 def _generate_course_structure(course_key):
     """
@@ -36,13 +50,19 @@ def _generate_course_structure(course_key):
                 log.warning('Failed to retrieve %s attribute of block %s. Defaulting to %s.', attr, key, default)
                 block[attr] = default
 
+        for field_name, default in COLLECTED_FIELDS:
+            field = curr_block.fields.get(field_name)
+            block[field_name] = field.to_json(field.read_from(curr_block)) if field else default
+        block['has_score'] = bool(getattr(curr_block, 'has_score', False))
+
         blocks_dict[key] = block
 
         # Add this blocks children to the stack so that we can traverse them as well.
         blocks_stack.extend(children)
     return {
         "root": unicode(course.scope_ids.usage_id),
-        "blocks": blocks_dict
+        "blocks": blocks_dict,
+        "version": STRUCTURE_VERSION,
     }
 
 
@@ -77,3 +97,23 @@ def update_course_structure(course_key):
     if not created:
         cs.structure_json = structure_json
         cs.save()
+
+
+@task(name=u'openedx.core.djangoapps.content.course_structures.tasks.update_course_path_index')
+def update_course_path_index(course_key):
+    """
+    Rebuilds and caches the path index of the specified course.
+    """
+    # Import here to avoid circular import.
+    from .path_index import update_path_index
+
+    if not isinstance(course_key, basestring):
+        raise ValueError('course_key must be a string. {} is not acceptable.'.format(type(course_key)))
+
+    course_key = CourseKey.from_string(course_key)
+
+    try:
+        update_path_index(course_key)
+    except Exception as ex:
+        log.exception('An error occurred while generating course path index: %s', ex.message)
+        raise
@@ -1,11 +1,25 @@
+from datetime import datetime
 import json
 
+from django.core.cache import cache
+from mock import patch
+from pytz import UTC
+
+from xmodule.fields import Date
+from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import SignalHandler
+from xmodule.modulestore.exceptions import ItemNotFoundError, NoPathToItem
+from xmodule.modulestore.search import path_index_key, path_to_location
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
+from openedx.core.djangoapps.content.course_structures.path_index import (
+    _cache_key, clear_path_index, get_path_index, get_path_to_location, update_path_index
+)
 from openedx.core.djangoapps.content.course_structures.signals import listen_for_course_publish
-from openedx.core.djangoapps.content.course_structures.tasks import _generate_course_structure, update_course_structure
+from openedx.core.djangoapps.content.course_structures.tasks import (
+    STRUCTURE_VERSION, _generate_course_structure, update_course_structure
+)
 
 
 class SignalDisconnectTestMixin(object):
@@ -37,7 +51,13 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
                 "display_name": block.display_name,
                 "graded": block.graded,
                 "format": block.format,
-                "children": [unicode(child.location) for child in children]
+                "children": [unicode(child.location) for child in children],
+                "start": block.fields['start'].to_json(block.start),
+                "due": block.fields['due'].to_json(block.due),
+                "visible_to_staff_only": block.visible_to_staff_only,
+                "group_access": block.group_access,
+                "weight": None,
+                "has_score": False,
             }
 
             for child in children:
@@ -47,7 +67,8 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
 
         expected = {
             'root': unicode(self.course.location),
-            'blocks': blocks
+            'blocks': blocks,
+            'version': STRUCTURE_VERSION,
         }
 
         self.maxDiff = None
@@ -145,7 +166,13 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
             "display_name": display_name,
             "graded": False,
             "format": None,
-            "children": []
+            "children": [],
+            "start": module.fields['start'].to_json(module.start),
+            "due": None,
+            "visible_to_staff_only": False,
+            "group_access": {},
+            "weight": None,
+            "has_score": module.has_score,
         }
         self.assertEqual(actual, expected)
 
@@ -163,3 +190,151 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
         cs = CourseStructure.objects.get(course_id=course_id)
         self.assertEqual(cs.course_id, course_id)
         self.assertEqual(cs.structure, structure)
+
+
+class PathIndexTests(ModuleStoreTestCase):
+    """
+    Tests for the course path index.
+    """
+    def setUp(self):
+        super(PathIndexTests, self).setUp()
+        self.course = CourseFactory.create()
+        self.chapter = ItemFactory.create(parent=self.course, category='chapter')
+        self.sequential = ItemFactory.create(parent=self.chapter, category='sequential')
+        self.verticals = [ItemFactory.create(parent=self.sequential, category='vertical') for __ in xrange(2)]
+        self.problem = ItemFactory.create(parent=self.verticals[1], category='problem')
+        clear_path_index(self.course.id)
+
+    def test_get_path_to_location(self):
+        for block in [self.course, self.chapter, self.sequential, self.verticals[1], self.problem]:
+            self.assertEqual(
+                get_path_to_location(self.course.id, block.location),
+                path_to_location(self.store, block.location)
+            )
+        self.assertEqual(
+            get_path_to_location(self.course.id, self.problem.location),
+            (self.course.id, self.chapter.location.name, self.sequential.location.name, '2')
+        )
+
+    def test_path_index_cached(self):
+        get_path_index(self.course.id)
+        with patch('openedx.core.djangoapps.content.course_structures.path_index.build_path_index') as build:
+            with patch('openedx.core.djangoapps.content.course_structures.path_index.path_to_location') as path:
+                get_path_to_location(self.course.id, self.problem.location)
+        self.assertFalse(build.called)
+        self.assertFalse(path.called)
+
+    def test_missing_path_index_rebuilt_by_task(self):
+        with patch('openedx.core.djangoapps.content.course_structures.path_index.build_path_index') as build:
+            with patch(
+                'openedx.core.djangoapps.content.course_structures.tasks.update_course_path_index.apply_async'
+            ) as mock_apply_async:
+                for __ in xrange(2):
+                    self.assertEqual(
+                        get_path_to_location(self.course.id, self.problem.location),
+                        (self.course.id, self.chapter.location.name, self.sequential.location.name, '2')
+                    )
+        self.assertFalse(build.called)
+        mock_apply_async.assert_called_once_with([unicode(self.course.id)], countdown=0)
+
+    def test_draft_blocks_not_indexed(self):
+        with self.store.default_store(ModuleStoreEnum.Type.split):
+            course = CourseFactory.create()
+            chapter = ItemFactory.create(parent=course, category='chapter')
+            sequential = ItemFactory.create(parent=chapter, category='sequential')
+            vertical = ItemFactory.create(parent=sequential, category='vertical')
+            draft_vertical = ItemFactory.create(parent=sequential, category='vertical', publish_item=False)
+            with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, course.id):
+                path_index = update_path_index(course.id)
+        self.assertIn(path_index_key(vertical.location), path_index)
+        self.assertNotIn(path_index_key(draft_vertical.location), path_index)
+
+    @patch('openedx.core.djangoapps.content.course_structures.path_index.PATH_INDEX_SHARD_SIZE', 100)
+    def test_path_index_sharded(self):
+        path_index = get_path_index(self.course.id)
+        self.assertGreater(cache.get(_cache_key(self.course.id)), 1)
+        self.assertEqual(get_path_index(self.course.id), path_index)
+        with patch('openedx.core.djangoapps.content.course_structures.path_index.build_path_index') as build:
+            with patch('openedx.core.djangoapps.content.course_structures.path_index.path_to_location') as path:
+                for block in [self.course, self.chapter, self.sequential, self.verticals[1], self.problem]:
+                    self.assertEqual(
+                        get_path_to_location(self.course.id, block.location),
+                        path_to_location(self.store, block.location)
+                    )
+        self.assertFalse(build.called)
+        self.assertFalse(path.called)
+
+    def test_path_index_too_large_to_cache(self):
+        # Memcached ignores values over its item size limit
+        with patch.object(cache, 'set_many'):
+            get_path_index(self.course.id)
+        self.assertEqual(cache.get(_cache_key(self.course.id)), 0)
+        with patch('openedx.core.djangoapps.content.course_structures.path_index.build_path_index') as build:
+            self.assertEqual(
+                get_path_to_location(self.course.id, self.problem.location),
+                (self.course.id, self.chapter.location.name, self.sequential.location.name, '2')
+            )
+        self.assertFalse(build.called)
+
+    def test_path_index_rebuilt_on_publish(self):
+        get_path_index(self.course.id)
+        problem = ItemFactory.create(parent=self.verticals[0], category='problem')
+        with patch('openedx.core.djangoapps.content.course_structures.path_index.build_path_index') as build:
+            self.assertEqual(
+                get_path_to_location(self.course.id, problem.location),
+                (self.course.id, self.chapter.location.name, self.sequential.location.name, '1')
+            )
+        self.assertFalse(build.called)
+
+    def test_block_without_path(self):
+        get_path_index(self.course.id)
+        orphan = self.store.create_item(ModuleStoreEnum.UserID.test, self.course.id, 'chapter', block_id='orphan')
+        with self.assertRaises(NoPathToItem):
+            get_path_to_location(self.course.id, orphan.location)
+        with self.assertRaises(ItemNotFoundError):
+            get_path_to_location(self.course.id, self.course.id.make_usage_key('problem', 'missing'))
+
+
+class CollectedFieldsTests(ModuleStoreTestCase):
+    """
+    Tests for the block fields collected into course structures.
+    """
+    def setUp(self):
+        super(CollectedFieldsTests, self).setUp()
+        self.course = CourseFactory.create()
+        self.chapter = ItemFactory.create(
+            parent=self.course, category='chapter', start=datetime(2015, 1, 1, tzinfo=UTC),
+            visible_to_staff_only=True,
+        )
+        self.sequential = ItemFactory.create(
+            parent=self.chapter, category='sequential', graded=True, format='Homework',
+            due=datetime(2015, 2, 1, tzinfo=UTC),
+        )
+        self.problem = ItemFactory.create(
+            parent=self.sequential, category='problem', metadata={'weight': 2.0},
+        )
+        update_course_structure(unicode(self.course.id))
+
+    def test_collected_fields(self):
+        course_structure = CourseStructure.objects.get(course_id=self.course.id)
+        self.assertEqual(course_structure.structure['version'], STRUCTURE_VERSION)
+        blocks = course_structure.ordered_blocks
+        self.assertEqual(
+            blocks.keys(),
+            [unicode(block.location) for block in [self.course, self.chapter, self.sequential, self.problem]]
+        )
+
+        chapter = blocks[unicode(self.chapter.location)]
+        self.assertEqual(Date().from_json(chapter['start']), datetime(2015, 1, 1, tzinfo=UTC))
+        self.assertTrue(chapter['visible_to_staff_only'])
+
+        sequential = blocks[unicode(self.sequential.location)]
+        self.assertEqual(Date().from_json(sequential['due']), datetime(2015, 2, 1, tzinfo=UTC))
+        self.assertEqual(sequential['group_access'], {})
+        self.assertFalse(sequential['has_score'])
+
+        problem = blocks[unicode(self.problem.location)]
+        self.assertTrue(problem['has_score'])
+        self.assertEqual(problem['weight'], 2.0)
+        # Inherited from the sequential
+        self.assertEqual(Date().from_json(problem['due']), datetime(2015, 2, 1, tzinfo=UTC))
@@ -240,6 +240,31 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
     return request_cache.data.setdefault(cache_key, cohort)
 
 
+def get_cohorts_for_users(user_ids, course_key):
+    """Returns the cohorts of the users with the specified ids in the specified course.
+
+    This is the bulk equivalent of `get_cohort(user, course_key, assign=False)`,
+    and takes a constant number of queries however many users are given.
+
+    Arguments:
+        user_ids: a list of User ids.
+        course_key: CourseKey
+
+    Returns:
+        A dict mapping the id of each of the users who has a cohort to their
+        CourseUserGroup. It is empty if the course is not cohorted.
+    """
+    if not get_course_cohort_settings(course_key).is_cohorted:
+        return {}
+
+    memberships = CourseUserGroup.users.through.objects.filter(
+        courseusergroup__course_id=course_key,
+        courseusergroup__group_type=CourseUserGroup.COHORT,
+        user__id__in=user_ids,
+    ).select_related('courseusergroup')
+    return {membership.user_id: membership.courseusergroup for membership in memberships}
+
+
 def migrate_cohort_settings(course):
     """
     Migrate all the cohort settings associated with this course from modulestore to mysql.
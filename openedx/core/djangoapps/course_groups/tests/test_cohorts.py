@@ -253,6 +253,28 @@ class TestCohorts(ModuleStoreTestCase):
             "other_user should be assigned to the default cohort"
         )
 
+    def test_get_cohorts_for_users(self):
+        """
+        Make sure cohorts.get_cohorts_for_users() returns the same cohorts as cohorts.get_cohort()
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        user = UserFactory(username="test", email="a@b.com")
+        other_user = UserFactory(username="test2", email="a2@b.com")
+        uncohorted_user = UserFactory(username="test3", email="a3@b.com")
+        cohort = CohortFactory(course_id=course.id, name="TestCohort")
+        cohort.users.add(user)
+        other_cohort = CohortFactory(course_id=course.id, name="OtherCohort")
+        other_cohort.users.add(other_user)
+        user_ids = [user.id, other_user.id, uncohorted_user.id]
+
+        self.assertEqual(cohorts.get_cohorts_for_users(user_ids, course.id), {}, "Course isn't cohorted")
+
+        config_course_cohorts(course, is_cohorted=True)
+        self.assertEqual(
+            cohorts.get_cohorts_for_users(user_ids, course.id),
+            {user.id: cohort, other_user.id: other_cohort}
+        )
+
     @ddt.data(
         (True, 2),
         (False, 6),
@@ -39,6 +39,27 @@ def get_course_tag(user, course_id, key):
         return None
 
 
+def get_course_tags_for_users(user_ids, course_id, key):
+    """
+    Gets the values of the course tag for the specified key in the specified
+    course_id, for each of the specified users, in a single query.
+
+    Args:
+        user_ids: list of User ids
+        course_id: course identifier (string)
+        key: arbitrary (<=255 char string)
+
+    Returns:
+        dict mapping the id of each user that has a value saved to that value
+    """
+    records = UserCourseTag.objects.filter(
+        user__id__in=user_ids,
+        course_id=course_id,
+        key=key).values_list('user_id', 'value')
+
+    return dict(records)
+
+
 def set_course_tag(user, course_id, key, value):
     """
     Sets the value of the user's course tag for the specified key in the specified
@@ -34,3 +34,16 @@ class TestCourseTagAPI(TestCase):
         course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, test_value)
         tag = course_tag_api.get_course_tag(self.user, self.course_id, self.test_key)
         self.assertEqual(tag, test_value)
+
+    def test_get_course_tags_for_users(self):
+        other_user = UserFactory.create()
+        untagged_user = UserFactory.create()
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        course_tag_api.set_course_tag(other_user, self.course_id, self.test_key, 'other value')
+        course_tag_api.set_course_tag(untagged_user, self.course_id, 'other_key', 'value')
+
+        with self.assertNumQueries(1):
+            tags = course_tag_api.get_course_tags_for_users(
+                [self.user.id, other_user.id, untagged_user.id], self.course_id, self.test_key
+            )
+        self.assertEqual(tags, {self.user.id: 'value', other_user.id: 'other value'})
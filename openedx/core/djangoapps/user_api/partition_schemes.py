@@ -71,6 +71,32 @@ class RandomUserPartitionScheme(object):
 
         return group
 
+    @classmethod
+    def get_groups_for_users(cls, course_key, user_ids, user_partition):
+        """
+        Returns a dict mapping the id of each of the specified users who is already
+        assigned to a group of the specified user partition to that group.
+
+        This is the bulk equivalent of `get_group_for_user` with assign=False.
+        """
+        partition_key = cls.key_for_partition(user_partition)
+        group_ids = course_tag_api.get_course_tags_for_users(user_ids, course_key, partition_key)
+
+        groups = {}
+        for user_id, group_id in group_ids.iteritems():
+            try:
+                groups[user_id] = user_partition.get_group(int(group_id))
+            except NoSuchUserPartitionGroupError:
+                log.warn(
+                    "group not found in RandomUserPartitionScheme: %r",
+                    {
+                        "requested_partition_id": user_partition.id,
+                        "requested_group_id": group_id,
+                    },
+                    exc_info=True
+                )
+        return groups
+
     @classmethod
     def key_for_partition(cls, user_partition):
         """
@@ -18,13 +18,20 @@ class MemoryCourseTagAPI(object):
     def __init__(self):
         self._tags = defaultdict(dict)
 
-    def get_course_tag(self, __, course_id, key):
-        """Sets the value of ``key`` to ``value``"""
-        return self._tags[course_id].get(key)
-
-    def set_course_tag(self, __, course_id, key, value):
+    def get_course_tag(self, user, course_id, key):
         """Gets the value of ``key``"""
-        self._tags[course_id][key] = value
+        return self._tags[course_id].get((user.id, key))
+
+    def get_course_tags_for_users(self, user_ids, course_id, key):
+        """Gets the values of ``key`` for each of ``user_ids``"""
+        return {
+            user_id: self._tags[course_id][(user_id, key)]
+            for user_id in user_ids if (user_id, key) in self._tags[course_id]
+        }
+
+    def set_course_tag(self, user, course_id, key, value):
+        """Sets the value of ``key`` to ``value``"""
+        self._tags[course_id][(user.id, key)] = value
 
 
 class TestRandomUserPartitionScheme(PartitionTestCase):
@@ -74,6 +81,27 @@ class TestRandomUserPartitionScheme(PartitionTestCase):
 
         self.assertIsNotNone(group)
 
+    def test_get_groups_for_users(self):
+        other_user = UserFactory.create()
+        unassigned_user = UserFactory.create()
+        group = RandomUserPartitionScheme.get_group_for_user(self.MOCK_COURSE_ID, self.user, self.user_partition)
+        other_group = RandomUserPartitionScheme.get_group_for_user(self.MOCK_COURSE_ID, other_user, self.user_partition)
+
+        groups = RandomUserPartitionScheme.get_groups_for_users(
+            self.MOCK_COURSE_ID, [self.user.id, other_user.id, unassigned_user.id], self.user_partition
+        )
+        self.assertEqual(groups, {self.user.id: group, other_user.id: other_group})
+
+    def test_get_groups_for_users_in_deleted_group(self):
+        RandomUserPartitionScheme.get_group_for_user(self.MOCK_COURSE_ID, self.user, self.user_partition)
+
+        groups = [Group(3, 'Group 3'), Group(4, 'Group 4')]
+        user_partition = UserPartition(self.TEST_ID, 'Test Partition', 'for testing purposes', groups)
+        self.assertEqual(
+            RandomUserPartitionScheme.get_groups_for_users(self.MOCK_COURSE_ID, [self.user.id], user_partition),
+            {}
+        )
+
     def test_empty_partition(self):
         empty_partition = UserPartition(
             self.TEST_ID,
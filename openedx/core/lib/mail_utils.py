@@ -14,9 +14,10 @@ def wrap_message(message, width=MAX_LINE_LENGTH):
     a line. To ensure that messages look consistent this helper function wraps long lines to a conservative length.
     """
     lines = message.split('\n')
+    # textwrap leaves lines which already fit unchanged, so only hand it the long ones
     wrapped_lines = [textwrap.fill(
         line, width, expand_tabs=False, replace_whitespace=False, drop_whitespace=False, break_on_hyphens=False
-    ) for line in lines]
+    ) if len(line) > width else line for line in lines]
     wrapped_message = '\n'.join(wrapped_lines)
 
     return wrapped_message